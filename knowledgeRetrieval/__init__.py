@@ -3,6 +3,7 @@ Knowledge Retrieval Module - RAG with OpenSearch Vector Search
 """
 from .vector_search import VectorSearchEngine
 from .embeddings_client import EmbeddingsClient
+from .embedding_cache import CachedEmbeddingsClient
 from .knowledge_indexer import KnowledgeIndexer
 
-__all__ = ['VectorSearchEngine', 'EmbeddingsClient', 'KnowledgeIndexer']
+__all__ = ['VectorSearchEngine', 'EmbeddingsClient', 'CachedEmbeddingsClient', 'KnowledgeIndexer']
@@ -0,0 +1,181 @@
+"""
+Embedding cache with an in-process LRU tier and a persistent SQLite tier
+"""
+import hashlib
+import os
+import sqlite3
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from .embeddings_client import EmbeddingsClient
+
+
+DEFAULT_CACHE_CAPACITY = 10000
+
+
+class CachedEmbeddingsClient:
+    """
+    Caching decorator around EmbeddingsClient
+
+    Keys are SHA-256(model_id || text), so switching models never returns
+    vectors produced by a different model. Failed embedding calls are never
+    cached. The SQLite tier is only opened when ``cache_path`` (or the
+    EMBEDDING_CACHE_PATH environment variable) is set.
+
+    Vectors are held as tuples and every caller gets its own list, so
+    normalizing or otherwise mutating a returned embedding in place never
+    changes what the cache serves next.
+    """
+
+    def __init__(
+        self,
+        client: Optional[EmbeddingsClient] = None,
+        capacity: Optional[int] = None,
+        cache_path: Optional[str] = None
+    ):
+        self.client = client or EmbeddingsClient()
+        self.model_id = self.client.model_id
+        if capacity is None:
+            capacity = int(os.environ.get("EMBEDDING_CACHE_CAPACITY", DEFAULT_CACHE_CAPACITY))
+        self.capacity = capacity
+        if cache_path is None:
+            cache_path = os.environ.get("EMBEDDING_CACHE_PATH")
+
+        self._memory: "OrderedDict[bytes, Tuple[float, ...]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+        self._store = self._open_store(cache_path) if cache_path else None
+        self._warm_from_store()
+
+    async def get_embedding(self, text: str) -> List[float]:
+        """Return cached embedding for text, computing it on a miss"""
+        key = self._cache_key(text)
+        cached = self._lookup(key)
+        if cached is not None:
+            self._hits += 1
+            return list(cached)
+
+        self._misses += 1
+        embedding = await self.client.get_embedding(text)
+        self._insert(key, embedding)
+        self._commit()
+        return embedding
+
+    async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Return embeddings for texts, sending only cache misses to the client"""
+        keys = [self._cache_key(text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+
+        for i, key in enumerate(keys):
+            if key in pending:
+                # Duplicate within the batch: served by the pending computation
+                self._hits += 1
+                pending[key].append(i)
+                continue
+            cached = self._lookup(key)
+            if cached is not None:
+                self._hits += 1
+                embeddings[i] = list(cached)
+            else:
+                self._misses += 1
+                pending[key] = [i]
+
+        if pending:
+            miss_keys = list(pending)
+            miss_texts = [texts[pending[key][0]] for key in miss_keys]
+            computed = await self.client.get_embeddings_batch(miss_texts)
+            for key, embedding in zip(miss_keys, computed):
+                self._insert(key, embedding)
+                for i in pending[key]:
+                    embeddings[i] = list(embedding)
+            self._commit()
+
+        return embeddings
+
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Return hit/miss counters for the cache"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "size": len(self._memory),
+            "capacity": self.capacity
+        }
+
+    def _cache_key(self, text: str) -> bytes:
+        """Build deterministic, model-aware cache key"""
+        return hashlib.sha256(f"{self.model_id}\x00{text}".encode("utf-8")).digest()
+
+    def _lookup(self, key: bytes) -> Optional[Tuple[float, ...]]:
+        """Check memory tier, then persistent tier"""
+        embedding = self._memory.get(key)
+        if embedding is not None:
+            self._memory.move_to_end(key)
+            return embedding
+
+        if self._store is None:
+            return None
+
+        row = self._store.execute(
+            "SELECT vec FROM embeddings WHERE key = ? AND model = ?",
+            (key, self.model_id)
+        ).fetchone()
+        if row is None:
+            return None
+
+        embedding = self._decode_vector(row[0])
+        self._remember(key, embedding)
+        return embedding
+
+    def _insert(self, key: bytes, embedding: List[float]):
+        """Write embedding to both cache tiers"""
+        self._remember(key, embedding)
+        if self._store is not None:
+            self._store.execute(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vec) VALUES (?, ?, ?, ?)",
+                (key, self.model_id, len(embedding), array("f", embedding).tobytes())
+            )
+
+    def _remember(self, key: bytes, embedding: Sequence[float]):
+        """Insert into memory tier, evicting least recently used entries"""
+        self._memory[key] = tuple(embedding)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _commit(self):
+        if self._store is not None:
+            self._store.commit()
+
+    def _open_store(self, cache_path: str) -> sqlite3.Connection:
+        """Open (and create if needed) the persistent cache database"""
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        store = sqlite3.connect(cache_path)
+        store.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, model TEXT NOT NULL, dim INT NOT NULL, vec BLOB NOT NULL)"
+        )
+        store.commit()
+        return store
+
+    def _warm_from_store(self):
+        """Preload persisted vectors for the current model into memory"""
+        if self._store is None or self.capacity <= 0:
+            return
+
+        rows = self._store.execute(
+            "SELECT key, vec FROM embeddings WHERE model = ? LIMIT ?",
+            (self.model_id, self.capacity)
+        )
+        for key, vec in rows:
+            self._memory[key] = self._decode_vector(vec)
+
+    @staticmethod
+    def _decode_vector(blob: bytes) -> Tuple[float, ...]:
+        vec = array("f")
+        vec.frombytes(blob)
+        return tuple(vec)
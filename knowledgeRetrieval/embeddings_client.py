@@ -1,75 +1,200 @@
 """
 Embeddings Client using Bedrock Titan for vector generation
 """
-from typing import List
+from typing import Any, Callable, List, Optional, Tuple
+import asyncio
 import hashlib
-import struct
+import numpy as np
+import orjson
+from .rate_limiter import TokenBucket, backoff_delay, is_throttling_error, is_validation_error
+
+
+# Number of texts sent per Bedrock batch request
+EMBEDDING_BATCH_SIZE = 64
+
+# Maximum in-flight single-text requests when native batching is unavailable
+EMBEDDING_MAX_PARALLEL = 8
+
+# Bedrock Titan quotas used to pace calls; account quotas vary by region
+BEDROCK_TITAN_RPM = 2000
+BEDROCK_TITAN_TPM = 300000
+
+# Retries for a throttled Bedrock call before the error is raised
+EMBEDDING_MAX_RETRIES = 5
+
+
+def quantize_int8(vector) -> Tuple[np.ndarray, float]:
+    """
+    Symmetrically quantize a vector to int8
+    
+    Returns (values, scale) with ``values * scale`` approximating the input.
+    An all-zero vector gets a scale of 0.0.
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.abs(vector).max()) if vector.size else 0.0
+    if max_abs == 0.0:
+        return np.zeros(vector.shape, dtype=np.int8), 0.0
+    
+    values = np.round(vector * (127.0 / max_abs)).astype(np.int8)
+    return values, max_abs / 127.0
 
 
 class EmbeddingsClient:
     """Client for generating embeddings using Bedrock Titan"""
     
-    def __init__(self, model_id: str = "amazon.titan-embed-text-v1"):
+    def __init__(
+        self,
+        model_id: str = "amazon.titan-embed-text-v1",
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_parallel: int = EMBEDDING_MAX_PARALLEL,
+        rate_limiter: Optional[TokenBucket] = None,
+        bedrock_client: Any = None
+    ):
         self.model_id = model_id
-        # TODO: Initialize Bedrock client
-        self.bedrock_client = None
+        self.batch_size = batch_size
+        self.max_parallel = max_parallel
+        self.rate_limiter = rate_limiter or TokenBucket(BEDROCK_TITAN_RPM, BEDROCK_TITAN_TPM)
+        # boto3 "bedrock-runtime" client; mock embeddings are used without one
+        self.bedrock_client = bedrock_client
+        # Cleared once the model rejects list input, so later batches go
+        # straight to single requests instead of paying for a doomed call
+        self._batch_supported = True
     
     async def get_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for text using Bedrock Titan
         
-        TODO: Implement actual Bedrock Titan embedding:
-        1. Call Bedrock with text input
-        2. Return 1536-dimensional vector
-        3. Handle rate limiting and retries
-        4. Cache embeddings for performance
+        Falls back to a hash-based mock embedding when no Bedrock client
+        is configured.
         """
+        if self.bedrock_client is None:
+            return self._generate_mock_embedding(text)
         
-        # PLACEHOLDER: Simple hash-based embedding for now
-        return self._generate_mock_embedding(text)
+        return await self._invoke_bedrock_titan(text)
     
     async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts in batch
         
-        TODO: Implement batch processing for efficiency:
-        1. Batch multiple texts in single Bedrock call
-        2. Handle batch size limits
-        3. Parallel processing for large batches
+        Texts are sent in slices of ``batch_size``. Each slice is tried as a
+        single batch request first; if the provider returns no ``embeddings``
+        array, the slice falls back to concurrent single-text requests bounded
+        by ``max_parallel``, and so do all later slices. Results are returned
+        in input order.
         """
-        embeddings = []
-        for text in texts:
-            embedding = await self.get_embedding(text)
-            embeddings.append(embedding)
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        
+        async def embed_one(index: int) -> None:
+            async with semaphore:
+                embeddings[index] = await self.get_embedding(texts[index])
+        
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            
+            batch_embeddings = await self._invoke_bedrock_titan_batch(batch)
+            if batch_embeddings is not None and len(batch_embeddings) == len(batch):
+                embeddings[start:start + len(batch)] = batch_embeddings
+                continue
+            
+            # Fallback: overlap single-text roundtrips instead of awaiting each in turn
+            await asyncio.gather(*(embed_one(i) for i in range(start, start + len(batch))))
+        
         return embeddings
     
     def _generate_mock_embedding(self, text: str, dimensions: int = 1536) -> List[float]:
         """Generate mock embedding using hash for development/testing"""
-        hash_obj = hashlib.md5(text.encode())
-        hash_bytes = hash_obj.digest()
-        
-        embedding = []
-        for i in range(0, len(hash_bytes), 4):
-            chunk = hash_bytes[i:i+4]
-            if len(chunk) == 4:
-                val = struct.unpack('f', chunk)[0]
-                embedding.append(float(val))
+        hash_obj = hashlib.sha256(text.encode())
         
-        # Pad or truncate to desired dimensions
-        while len(embedding) < dimensions:
-            embedding.append(0.0)
+        # Map each 32-bit digest word into [-1, 1) and zero-pad to dimensions.
+        # Reinterpreting raw digest bytes as floats can yield NaN/inf values.
+        words = np.frombuffer(hash_obj.digest(), dtype=np.uint32)[:dimensions]
+        embedding = np.zeros(dimensions, dtype=np.float32)
+        embedding[:words.size] = words / 2.0 ** 31 - 1.0
         
-        return embedding[:dimensions]
+        return embedding.tolist()
     
-    async def _invoke_bedrock_titan(self, text: str) -> List[float]:
+    def _generate_mock_embedding_i8(self, text: str, dimensions: int = 1536) -> Tuple[np.ndarray, float]:
+        """Generate int8-quantized mock embedding and its dequantization scale"""
+        return quantize_int8(self._generate_mock_embedding(text, dimensions))
+    
+    async def _invoke_bedrock_titan(self, text: str) -> Optional[List[float]]:
         """
         Call Bedrock Titan Embeddings API
         
-        TODO: Implement actual Bedrock API call:
+        Request body:
         {
             "inputText": text,
             "dimensions": 1536,
             "normalize": true
         }
         """
-        pass
+        if self.bedrock_client is None:
+            return None
+        
+        def call():
+            response = self.bedrock_client.invoke_model(
+                modelId=self.model_id,
+                contentType="application/json",
+                accept="application/json",
+                body=orjson.dumps({"inputText": text, "dimensions": 1536, "normalize": True})
+            )
+            return orjson.loads(response['body'].read())['embedding']
+        
+        return await self._call_with_rate_limit(len(text) // 4, call)
+    
+    async def _invoke_bedrock_titan_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Call Bedrock Titan Embeddings API with a batch of texts
+        
+        Returns None when the model rejects the batch request
+        (ValidationException) or the response carries no ``embeddings``
+        array, so the caller can fall back to single requests. Either outcome
+        disables batching for this client.
+        
+        Request body:
+        {
+            "inputText": texts,
+            "dimensions": 1536,
+            "normalize": true
+        }
+        """
+        if self.bedrock_client is None or not self._batch_supported:
+            return None
+        
+        def call():
+            response = self.bedrock_client.invoke_model(
+                modelId=self.model_id,
+                contentType="application/json",
+                accept="application/json",
+                body=orjson.dumps({"inputText": texts, "dimensions": 1536, "normalize": True})
+            )
+            return orjson.loads(response['body'].read()).get('embeddings')
+        
+        try:
+            embeddings = await self._call_with_rate_limit(sum(len(text) for text in texts) // 4, call)
+        except Exception as e:
+            # Models without list input (e.g. Titan v1) reject the body
+            if not is_validation_error(e):
+                raise
+            embeddings = None
+        
+        if embeddings is None:
+            self._batch_supported = False
+        return embeddings
+    
+    async def _call_with_rate_limit(self, est_tokens: int, call: Callable[[], Any]) -> Any:
+        """
+        Run a blocking Bedrock call under the token bucket
+        
+        Throttled calls (ThrottlingException / HTTP 429) are retried with
+        backoff up to EMBEDDING_MAX_RETRIES times; other errors propagate.
+        """
+        for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+            await self.rate_limiter.acquire(est_tokens)
+            try:
+                return await asyncio.to_thread(call)
+            except Exception as e:
+                if not is_throttling_error(e) or attempt == EMBEDDING_MAX_RETRIES:
+                    raise
+                await asyncio.sleep(backoff_delay(e, attempt))
@@ -1,10 +1,41 @@
 """
 Knowledge Indexer for processing and indexing runbooks and API specs
 """
+import asyncio
+import mmap
 import os
 import re
-from typing import List, Dict, Any
-from pathlib import Path
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+
+# Chunk sizing in words: sections above the soft limit are split into their
+# subsections, leaves above the hard limit are split at blank lines, and
+# chunks below the minimum are dropped as too small to embed usefully.
+CHUNK_SOFT_LIMIT = 300
+CHUNK_HARD_LIMIT = 500
+CHUNK_MIN_WORDS = 20
+
+_HEADER_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t]*$', re.MULTILINE)
+_FENCE_RE = re.compile(r'^(?:```|~~~)', re.MULTILINE)
+
+# Byte-mode twins for scanning memory-mapped files without decoding them
+_HEADER_RE_BYTES = re.compile(rb'^(#{1,6})[ \t]+(.+?)[ \t]*$', re.MULTILINE)
+_FENCE_RE_BYTES = re.compile(rb'^(?:```|~~~)', re.MULTILINE)
+
+# Markdown source: decoded text, or a bytes-like buffer such as an mmap
+Markdown = Union[str, bytes, mmap.mmap]
+
+# Filename fragment -> task ID, matched in a single pass over the filename
+_TASK_FILENAME_PATTERNS = {
+    "cancel-case": "CANCEL_CASE",
+    "change-case-status": "CHANGE_CASE_STATUS",
+    "reconcile-case": "RECONCILE_CASE_DATA"
+}
+_TASK_FILENAME_RE = re.compile("|".join(map(re.escape, _TASK_FILENAME_PATTERNS)))
+
+# Upper bound on concurrent file reads while indexing
+_MAX_IO_WORKERS = 32
 
 
 class KnowledgeChunk:
@@ -15,6 +46,16 @@ class KnowledgeChunk:
         self.source_uri = source_uri
 
 
+class _HeaderNode:
+    """Markdown section spanning content[start:end], including subsections"""
+    def __init__(self, level: int, title: str, start: int):
+        self.level = level
+        self.title = title
+        self.start = start
+        self.end = start
+        self.children: List["_HeaderNode"] = []
+
+
 class KnowledgeIndexer:
     """Processes knowledge files and creates searchable chunks"""
     
@@ -32,25 +73,71 @@ class KnowledgeIndexer:
         4. Add metadata (task_id, section, environment)
         5. Handle different file formats
         """
-        chunks = []
+        file_paths = self._collect_file_paths()
+        if not file_paths:
+            return []
         
-        # Process runbooks
-        runbooks_dir = Path(self.knowledge_dir) / "runbooks"
-        if runbooks_dir.exists():
-            for file_path in runbooks_dir.glob("*.md"):
-                file_chunks = self._process_runbook(file_path)
-                chunks.extend(file_chunks)
-        
-        # Process API specs
-        api_specs_dir = Path(self.knowledge_dir) / "api-specs"
-        if api_specs_dir.exists():
-            for file_path in api_specs_dir.glob("*.md"):
-                file_chunks = self._process_api_spec(file_path)
+        # File reads release the GIL, so a thread pool overlaps open/read stalls
+        chunks = []
+        with ThreadPoolExecutor(max_workers=min(_MAX_IO_WORKERS, len(file_paths))) as executor:
+            for file_chunks in executor.map(self._process_file, file_paths):
                 chunks.extend(file_chunks)
         
         return chunks
     
-    def _process_runbook(self, file_path: Path) -> List[KnowledgeChunk]:
+    async def aprocess_knowledge_base(self, executor: Optional[Executor] = None) -> List[KnowledgeChunk]:
+        """
+        Process all knowledge files without blocking the event loop
+        
+        Each file is parsed in ``executor``, so large markdown parses do not
+        stall coroutines co-scheduled on the running loop. Without one, a
+        process pool is created for this call and shut down before it
+        returns; the caller owns any executor it passes in.
+        """
+        file_paths = self._collect_file_paths()
+        if not file_paths:
+            return []
+        
+        owned = executor is None
+        if owned:
+            executor = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(file_paths)))
+        
+        try:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, self._process_file, file_path)
+                for file_path in file_paths
+            ))
+        finally:
+            if owned:
+                executor.shutdown()
+        return [chunk for file_chunks in results for chunk in file_chunks]
+    
+    def _collect_file_paths(self) -> List[str]:
+        """List runbook and API spec files in inode order"""
+        entries = []
+        for subdir in ("runbooks", "api-specs"):
+            try:
+                with os.scandir(os.path.join(self.knowledge_dir, subdir)) as it:
+                    entries.extend(
+                        entry for entry in it
+                        if entry.name.endswith(".md") and entry.is_file()
+                    )
+            except FileNotFoundError:
+                continue
+        
+        # Inode order roughly follows on-disk layout, keeping reads sequential.
+        # DirEntry carries the inode from readdir, so no extra stat calls.
+        entries.sort(key=lambda entry: entry.inode())
+        return [entry.path for entry in entries]
+    
+    def _process_file(self, file_path: str) -> List[KnowledgeChunk]:
+        """Dispatch a knowledge file to its parser based on its directory"""
+        if os.path.basename(os.path.dirname(file_path)) == "api-specs":
+            return self._process_api_spec(file_path)
+        return self._process_runbook(file_path)
+    
+    def _process_runbook(self, file_path: str) -> List[KnowledgeChunk]:
         """
         Process a runbook file and extract chunks
         
@@ -63,35 +150,33 @@ class KnowledgeIndexer:
         chunks = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Extract task_id from filename
-            task_id = self._extract_task_id_from_filename(file_path.name)
+            file_name = os.path.basename(file_path)
+            task_id = self._extract_task_id_from_filename(file_name)
             
             # Simple chunking by sections for now
-            sections = self._split_by_headers(content)
+            sections = self._split_file_by_headers(file_path)
             
-            for i, section in enumerate(sections):
-                if section.strip():
-                    chunk = KnowledgeChunk(
-                        content=section.strip(),
-                        metadata={
-                            "task_id": task_id,
-                            "file_type": "runbook",
-                            "section_index": i,
-                            "source_file": file_path.name
-                        },
-                        source_uri=str(file_path)
-                    )
-                    chunks.append(chunk)
+            for i, (parent_headers, section) in enumerate(sections):
+                chunk = KnowledgeChunk(
+                    content=self._with_breadcrumb(parent_headers, section),
+                    metadata={
+                        "task_id": task_id,
+                        "file_type": "runbook",
+                        "section_index": i,
+                        "parent_headers": parent_headers,
+                        "source_file": file_name
+                    },
+                    source_uri=file_path
+                )
+                chunks.append(chunk)
         
         except Exception as e:
             print(f"Error processing runbook {file_path}: {e}")
         
         return chunks
     
-    def _process_api_spec(self, file_path: Path) -> List[KnowledgeChunk]:
+    def _process_api_spec(self, file_path: str) -> List[KnowledgeChunk]:
         """
         Process an API specification file
         
@@ -104,24 +189,21 @@ class KnowledgeIndexer:
         chunks = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Simple chunking for API specs
-            sections = self._split_by_headers(content)
+            sections = self._split_file_by_headers(file_path)
             
-            for i, section in enumerate(sections):
-                if section.strip():
-                    chunk = KnowledgeChunk(
-                        content=section.strip(),
-                        metadata={
-                            "file_type": "api_spec",
-                            "section_index": i,
-                            "source_file": file_path.name
-                        },
-                        source_uri=str(file_path)
-                    )
-                    chunks.append(chunk)
+            for i, (parent_headers, section) in enumerate(sections):
+                chunk = KnowledgeChunk(
+                    content=self._with_breadcrumb(parent_headers, section),
+                    metadata={
+                        "file_type": "api_spec",
+                        "section_index": i,
+                        "parent_headers": parent_headers,
+                        "source_file": os.path.basename(file_path)
+                    },
+                    source_uri=file_path
+                )
+                chunks.append(chunk)
         
         except Exception as e:
             print(f"Error processing API spec {file_path}: {e}")
@@ -130,24 +212,169 @@ class KnowledgeIndexer:
     
     def _extract_task_id_from_filename(self, filename: str) -> str:
         """Extract task ID from filename"""
-        if "cancel-case" in filename.lower():
-            return "CANCEL_CASE"
-        elif "change-case-status" in filename.lower():
-            return "CHANGE_CASE_STATUS"
-        elif "reconcile-case" in filename.lower():
-            return "RECONCILE_CASE_DATA"
-        return "UNKNOWN"
-    
-    def _split_by_headers(self, content: str) -> List[str]:
+        match = _TASK_FILENAME_RE.search(filename.lower())
+        return _TASK_FILENAME_PATTERNS[match.group(0)] if match else "UNKNOWN"
+    
+    def _split_file_by_headers(self, file_path: str) -> List[Tuple[List[str], str]]:
         """
-        Split content by markdown headers
+        Split a markdown file along its header tree without reading it whole
         
-        TODO: Implement smart content splitting:
-        1. Respect markdown structure
-        2. Maintain context between sections
-        3. Handle code blocks and tables
-        4. Optimize chunk sizes for embeddings
+        The file is memory-mapped and scanned as bytes, so only the pages
+        touched are faulted in and UTF-8 decoding happens per emitted chunk.
+        """
+        with open(file_path, 'rb') as f:
+            # mmap rejects zero-length files
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self._split_by_headers(mm)
+    
+    def _split_by_headers(self, content: Markdown) -> List[Tuple[List[str], str]]:
         """
-        # Simple split by ## headers for now
-        sections = re.split(r'\n## ', content)
-        return sections
+        Split content into chunks along the markdown header tree
+        
+        Returns (parent_headers, text) pairs. A section that fits within
+        CHUNK_SOFT_LIMIT words is kept whole; larger sections emit their own
+        body and recurse into subsections. Leaves over CHUNK_HARD_LIMIT are
+        split at blank lines without breaking fenced code blocks. Chunks under
+        CHUNK_MIN_WORDS (e.g. a document preamble or a section intro) are
+        folded into the next chunk in the same subtree, which may be a
+        sibling or the section's first subsection; otherwise they are
+        appended to a preceding sibling or kept as their own chunk, so no
+        text is dropped.
+        """
+        sections: List[Tuple[List[str], str]] = []
+        self._emit_section(content, self._build_header_tree(content), [], sections)
+        
+        chunks: List[Tuple[List[str], str]] = []
+        carry = None
+        for parent_headers, text in sections:
+            if not text:
+                continue
+            if carry is not None:
+                if parent_headers[:len(carry[0])] == carry[0]:
+                    text = f"{carry[1]}\n\n{text}"
+                else:
+                    self._place_short_chunk(chunks, carry)
+                carry = None
+            
+            if len(text.split()) < CHUNK_MIN_WORDS:
+                carry = (parent_headers, text)
+            else:
+                chunks.append((parent_headers, text))
+        
+        if carry is not None:
+            self._place_short_chunk(chunks, carry)
+        
+        return chunks
+    
+    @staticmethod
+    def _place_short_chunk(chunks: List[Tuple[List[str], str]], short: Tuple[List[str], str]):
+        """Append a short chunk to the preceding sibling, or keep it on its own"""
+        if chunks and chunks[-1][0] == short[0]:
+            chunks[-1] = (short[0], f"{chunks[-1][1]}\n\n{short[1]}")
+        else:
+            chunks.append(short)
+    
+    def _build_header_tree(self, content: Markdown) -> _HeaderNode:
+        """Build a tree of header sections, ignoring headers inside code fences"""
+        if isinstance(content, str):
+            header_re, fence_re = _HEADER_RE, _FENCE_RE
+        else:
+            header_re, fence_re = _HEADER_RE_BYTES, _FENCE_RE_BYTES
+        
+        fences = [match.start() for match in fence_re.finditer(content)]
+        fenced = list(zip(fences[::2], fences[1::2] + [len(content)]))
+        
+        root = _HeaderNode(0, "", 0)
+        root.end = len(content)
+        stack = [root]
+        
+        for match in header_re.finditer(content):
+            if any(open_at < match.start() < close_at for open_at, close_at in fenced):
+                continue
+            
+            node = _HeaderNode(len(match.group(1)), self._decode(match.group(2)), match.start())
+            while stack[-1].level >= node.level:
+                stack.pop().end = node.start
+            stack[-1].children.append(node)
+            stack.append(node)
+        
+        for node in stack[1:]:
+            node.end = len(content)
+        
+        return root
+    
+    def _emit_section(
+        self,
+        content: Markdown,
+        node: _HeaderNode,
+        parent_headers: List[str],
+        sections: List[Tuple[List[str], str]]
+    ):
+        """Append chunks for a section, recursing while it exceeds the soft limit"""
+        text = content[node.start:node.end].strip()
+        if not node.children or len(text.split()) <= CHUNK_SOFT_LIMIT:
+            self._emit_leaf(self._decode(text), node, parent_headers, sections)
+            return
+        
+        own_text = content[node.start:node.children[0].start].strip()
+        self._emit_leaf(self._decode(own_text), node, parent_headers, sections)
+        
+        child_headers = parent_headers + [node.title] if node.title else parent_headers
+        for child in node.children:
+            self._emit_section(content, child, child_headers, sections)
+    
+    def _emit_leaf(
+        self,
+        text: str,
+        node: _HeaderNode,
+        parent_headers: List[str],
+        sections: List[Tuple[List[str], str]]
+    ):
+        """Append a leaf section, splitting it at blank lines past the hard limit"""
+        if len(text.split()) <= CHUNK_HARD_LIMIT:
+            sections.append((parent_headers, text))
+            return
+        
+        # Continuation pieces lose the section header, so carry it in the breadcrumb
+        continued_headers = parent_headers + [node.title] if node.title else parent_headers
+        for i, piece in enumerate(self._split_oversized(text)):
+            sections.append((parent_headers if i == 0 else continued_headers, piece))
+    
+    def _split_oversized(self, text: str) -> List[str]:
+        """Pack blank-line separated blocks into pieces of at most CHUNK_HARD_LIMIT words"""
+        blocks: List[str] = []
+        in_fence = False
+        for block in text.split("\n\n"):
+            if in_fence:
+                blocks[-1] += "\n\n" + block
+            else:
+                blocks.append(block)
+            if len(_FENCE_RE.findall(block)) % 2:
+                in_fence = not in_fence
+        
+        pieces: List[str] = []
+        current: List[str] = []
+        current_words = 0
+        for block in blocks:
+            block_words = len(block.split())
+            if current and current_words + block_words > CHUNK_HARD_LIMIT:
+                pieces.append("\n\n".join(current).strip())
+                current, current_words = [], 0
+            current.append(block)
+            current_words += block_words
+        if current:
+            pieces.append("\n\n".join(current).strip())
+        
+        return pieces
+    
+    @staticmethod
+    def _decode(text: Union[str, bytes]) -> str:
+        return text if isinstance(text, str) else text.decode('utf-8')
+    
+    def _with_breadcrumb(self, parent_headers: List[str], text: str) -> str:
+        """Prefix chunk text with its parent header path"""
+        if not parent_headers:
+            return text
+        return f"{' > '.join(parent_headers)}\n\n{text}"
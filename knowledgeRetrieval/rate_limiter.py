@@ -0,0 +1,107 @@
+"""
+Token-bucket rate limiting and throttling backoff for Bedrock calls
+"""
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import random
+import time
+
+
+# Upper bound on a single backoff sleep, in seconds
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class TokenBucket:
+    """
+    Paces calls to stay within requests-per-minute and tokens-per-minute quotas
+
+    Both buckets start full and refill continuously at rpm/60 and tpm/60 per
+    second, capped at one minute of quota. ``acquire`` sleeps by whichever
+    deficit (requests or tokens) takes longer to refill, then consumes.
+    ``clock`` and ``sleep`` can be replaced to drive the bucket in tests.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._request_tokens = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = clock()
+
+    async def acquire(self, est_tokens: int = 0):
+        """Wait until one request and ``est_tokens`` tokens are available"""
+        # A request larger than the whole minute quota could never fit
+        est_tokens = min(est_tokens, self.tpm)
+
+        while True:
+            self._refill()
+            # Check and consume happen without an await in between, so
+            # concurrent callers on one loop cannot overdraw the buckets
+            if self._request_tokens >= 1 and self._tokens >= est_tokens:
+                self._request_tokens -= 1
+                self._tokens -= est_tokens
+                return
+
+            request_wait = (1 - self._request_tokens) * 60.0 / self.rpm
+            token_wait = (est_tokens - self._tokens) * 60.0 / self.tpm
+            await self._sleep(max(request_wait, token_wait, 0.0))
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_tokens = min(self.rpm, self._request_tokens + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Detect a Bedrock throttling response (ThrottlingException / HTTP 429)"""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+
+    code = response.get("Error", {}).get("Code")
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code == "ThrottlingException" or status == 429
+
+
+def is_validation_error(error: Exception) -> bool:
+    """Detect a Bedrock ValidationException (request body the model rejects)"""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+
+    return response.get("Error", {}).get("Code") == "ValidationException"
+
+
+def backoff_delay(error: Any, attempt: int, rand: Callable[[], float] = random.random) -> float:
+    """
+    Seconds to wait before retrying a throttled call
+
+    Honors a Retry-After header when the response carries one, otherwise
+    uses exponential backoff with full jitter, capped at MAX_BACKOFF_SECONDS.
+    """
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return min(MAX_BACKOFF_SECONDS, retry_after)
+    return min(MAX_BACKOFF_SECONDS, 2 ** attempt * rand())
+
+
+def _retry_after(error: Any) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    try:
+        return max(0.0, float(headers["retry-after"]))
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,137 @@
+"""
+Semantic cache for knowledge search results keyed by query embedding
+"""
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from .embeddings_client import quantize_int8
+
+
+class SemanticCache:
+    """
+    Caches search results for near-duplicate queries
+
+    A lookup hits when a stored query with the same key has cosine
+    similarity of at least ``threshold``. Stored embeddings are kept as
+    unit-length rows of one matrix, so a lookup is a single matrix-vector
+    product. The least recently used entry is evicted at ``capacity``.
+    Keys are mapped to integer codes for the per-row key filter; a code is
+    dropped once no row uses it, so the map is bounded by ``capacity`` too.
+
+    With ``quantized`` (the default) rows are stored as int8, a quarter of
+    the fp32 footprint, and similarities come from an int32-accumulated dot
+    product. Pass ``quantized=False`` for the exact fp32 path.
+    """
+
+    def __init__(self, capacity: int = 1024, threshold: float = 0.95, quantized: bool = True):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.quantized = quantized
+
+        self._embeddings: Optional[np.ndarray] = None
+        self._norms = np.ones(capacity, dtype=np.float32)
+        self._key_ids = np.full(capacity, -1, dtype=np.int64)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._results: List[List[Any]] = []
+        self._key_codes: Dict[Hashable, int] = {}
+        # code -> (key, number of rows holding it)
+        self._code_refs: Dict[int, Tuple[Hashable, int]] = {}
+        self._next_code = 0
+        self._clock = 0
+
+    def lookup(self, embedding: List[float], key: Hashable) -> Optional[List[Any]]:
+        """Return cached results for a similar query with the same key"""
+        size = len(self._results)
+        code = self._key_codes.get(key)
+        if size == 0 or code is None:
+            return None
+
+        query = self._normalize(embedding)
+        if query is None or query.shape[0] != self._embeddings.shape[1]:
+            return None
+
+        similarities = self._similarities(query, size)
+        similarities[self._key_ids[:size] != code] = -np.inf
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+
+        self._touch(best)
+        return self._results[best]
+
+    def insert(self, embedding: List[float], key: Hashable, results: List[Any]):
+        """Store results for a query embedding"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        if self._embeddings is None:
+            dtype = np.int8 if self.quantized else np.float32
+            self._embeddings = np.zeros((self.capacity, vector.shape[0]), dtype=dtype)
+        elif vector.shape[0] != self._embeddings.shape[1]:
+            return
+
+        size = len(self._results)
+        if size < self.capacity:
+            slot = size
+            self._results.append(results)
+        else:
+            slot = int(self._last_used.argmin())
+            self._results[slot] = results
+            self._release_code(int(self._key_ids[slot]))
+
+        if self.quantized:
+            values, _ = quantize_int8(vector)
+            self._embeddings[slot] = values
+            self._norms[slot] = np.linalg.norm(values.astype(np.float32))
+        else:
+            self._embeddings[slot] = vector
+        self._key_ids[slot] = self._acquire_code(key)
+        self._touch(slot)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _similarities(self, query: np.ndarray, size: int) -> np.ndarray:
+        """Cosine similarity of the unit query against the first ``size`` rows"""
+        if not self.quantized:
+            return self._embeddings[:size] @ query
+
+        values, _ = quantize_int8(query)
+        # Per-vector scales cancel out of the cosine, leaving the int32
+        # dot product over the product of the int8 vector norms
+        dots = np.einsum("ij,j->i", self._embeddings[:size], values, dtype=np.int32)
+        query_norm = np.linalg.norm(values.astype(np.float32))
+        return dots / (self._norms[:size] * query_norm)
+
+    def _acquire_code(self, key: Hashable) -> int:
+        """Return the code for key, counting one more row that holds it"""
+        code = self._key_codes.get(key)
+        if code is None:
+            code = self._next_code
+            self._next_code += 1
+            self._key_codes[key] = code
+            self._code_refs[code] = (key, 1)
+        else:
+            self._code_refs[code] = (key, self._code_refs[code][1] + 1)
+        return code
+
+    def _release_code(self, code: int):
+        """Count one less row holding code, forgetting the key at zero"""
+        key, rows = self._code_refs[code]
+        if rows > 1:
+            self._code_refs[code] = (key, rows - 1)
+        else:
+            del self._code_refs[code]
+            del self._key_codes[key]
+
+    def _touch(self, slot: int):
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not np.isfinite(norm) or norm == 0.0:
+            return None
+        return vector / norm
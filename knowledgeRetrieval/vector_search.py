@@ -1,8 +1,19 @@
 """
 Vector Search Engine using OpenSearch for RAG knowledge retrieval
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+import time
+import httpx
+import numpy as np
 from models import TaskId, ClassificationResult
+from .embeddings_client import EmbeddingsClient
+from .embedding_cache import CachedEmbeddingsClient
+from .semantic_cache import SemanticCache
+
+
+# Only cache searches that took at least this long; cheaper lookups
+# (e.g. the mock path) are not worth a cache slot
+SEMANTIC_CACHE_MIN_COST_SECONDS = 0.005
 
 
 class VectorSearchResult:
@@ -14,14 +25,90 @@ class VectorSearchResult:
         self.source_uri = source_uri
 
 
+class VectorSearchBatch:
+    """
+    Search results stored column-wise (structure of arrays)
+    
+    Scores are held in one numpy array so ranking is a single argsort;
+    the other fields are parallel lists indexed the same way.
+    """
+    def __init__(
+        self,
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        scores: np.ndarray,
+        uris: List[str]
+    ):
+        self.contents = contents
+        self.metadatas = metadatas
+        self.scores = scores
+        self.uris = uris
+    
+    @classmethod
+    def from_results(cls, results: Sequence[VectorSearchResult]) -> "VectorSearchBatch":
+        return cls(
+            contents=[result.content for result in results],
+            metadatas=[result.metadata for result in results],
+            scores=np.fromiter((result.score for result in results), dtype=np.float64, count=len(results)),
+            uris=[result.source_uri for result in results]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.uris)
+    
+    def top_indices(self, k: int) -> np.ndarray:
+        """Indices of the k highest scores, best first; ties keep input order"""
+        return np.argsort(-self.scores, kind="stable")[:k]
+
+
+# Immutable mock search results per task, shared across requests
+_MOCK_RESULTS: Dict[TaskId, Tuple[VectorSearchResult, ...]] = {
+    TaskId.CANCEL_CASE: (
+        VectorSearchResult(
+            content="Complete cancellation of a case including cleanup of associated workflows...",
+            metadata={"task_id": "CANCEL_CASE", "section": "overview"},
+            score=0.95,
+            source_uri="knowledge/runbooks/cancel-case-runbook.md"
+        ),
+        VectorSearchResult(
+            content="Case must be in cancellable state: pending, in_progress, on_hold...",
+            metadata={"task_id": "CANCEL_CASE", "section": "pre_checks"},
+            score=0.87,
+            source_uri="knowledge/runbooks/cancel-case-runbook.md"
+        )
+    ),
+    TaskId.CHANGE_CASE_STATUS: (
+        VectorSearchResult(
+            content="Change case status with proper validation and state transitions...",
+            metadata={"task_id": "CHANGE_CASE_STATUS", "section": "overview"},
+            score=0.92,
+            source_uri="knowledge/runbooks/change-case-status-runbook.md"
+        ),
+    )
+}
+
+
 class VectorSearchEngine:
     """Handles vector search in OpenSearch for knowledge retrieval"""
     
-    def __init__(self, opensearch_endpoint: str = None):
+    def __init__(
+        self,
+        opensearch_endpoint: str = None,
+        embeddings_client: Optional[Union[EmbeddingsClient, CachedEmbeddingsClient]] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.opensearch_endpoint = opensearch_endpoint
         self.index_name = "opsguide-knowledge"
         # TODO: Initialize OpenSearch client with IAM auth
         self.client = None
+        # Shared keep-alive connection pool for OpenSearch calls, owned by
+        # the caller (the server opens and closes it)
+        self.http_client = http_client
+        # Repeated queries skip the embedding call; vectors are persisted
+        # only when EMBEDDING_CACHE_PATH is set
+        self.embeddings_client = embeddings_client or CachedEmbeddingsClient()
+        self.semantic_cache = semantic_cache or SemanticCache()
     
     async def search_knowledge(
         self, 
@@ -32,42 +119,48 @@ class VectorSearchEngine:
         """
         Search for relevant knowledge chunks using vector similarity
         
-        TODO: Implement actual vector search with:
-        1. Convert query to embedding using Bedrock Titan
-        2. Perform KNN search in OpenSearch
-        3. Filter by task_id, environment, service
-        4. Return ranked results with metadata
+        Near-duplicate queries with the same task, environment, service and
+        top_k are answered from the semantic cache, skipping the KNN
+        roundtrip.
         """
+        query_embedding = await self.embeddings_client.get_embedding(query)
+        # Every search filter is part of the key, so results never cross
+        # environments or services
+        cache_key = (
+            classification.task_id,
+            classification.environment,
+            classification.service,
+            top_k
+        )
         
-        # PLACEHOLDER: Return mock results for now
-        mock_results = []
+        cached = self.semantic_cache.lookup(query_embedding, cache_key)
+        if cached is not None:
+            return list(cached)
         
-        if classification.task_id == TaskId.CANCEL_CASE:
-            mock_results = [
-                VectorSearchResult(
-                    content="Complete cancellation of a case including cleanup of associated workflows...",
-                    metadata={"task_id": "CANCEL_CASE", "section": "overview"},
-                    score=0.95,
-                    source_uri="knowledge/runbooks/cancel-case-runbook.md"
-                ),
-                VectorSearchResult(
-                    content="Case must be in cancellable state: pending, in_progress, on_hold...",
-                    metadata={"task_id": "CANCEL_CASE", "section": "pre_checks"},
-                    score=0.87,
-                    source_uri="knowledge/runbooks/cancel-case-runbook.md"
-                )
-            ]
-        elif classification.task_id == TaskId.CHANGE_CASE_STATUS:
-            mock_results = [
-                VectorSearchResult(
-                    content="Change case status with proper validation and state transitions...",
-                    metadata={"task_id": "CHANGE_CASE_STATUS", "section": "overview"},
-                    score=0.92,
-                    source_uri="knowledge/runbooks/change-case-status-runbook.md"
-                )
-            ]
+        started = time.perf_counter()
+        results = await self._search_index(query_embedding, classification, top_k)
+        if time.perf_counter() - started >= SEMANTIC_CACHE_MIN_COST_SECONDS:
+            self.semantic_cache.insert(query_embedding, cache_key, list(results))
         
-        return mock_results
+        return results
+    
+    async def _search_index(
+        self,
+        query_embedding: List[float],
+        classification: ClassificationResult,
+        top_k: int
+    ) -> List[VectorSearchResult]:
+        """
+        Run the KNN search against the knowledge index
+        
+        TODO: Implement actual vector search with:
+        1. Perform KNN search in OpenSearch (see _build_search_query)
+        2. Filter by task_id, environment, service
+        3. Return ranked results with metadata
+        """
+        
+        # PLACEHOLDER: Return mock results for now
+        return list(_MOCK_RESULTS.get(classification.task_id, ())[:top_k])
     
     def _build_search_query(
         self, 
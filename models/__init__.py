@@ -5,8 +5,10 @@ from .core_models import (
     UseCase, TaskId, RequestStatus,
     OperationalRequest, ClassificationResult
 )
+from .timestamps import utc_timestamp
 
 __all__ = [
     'UseCase', 'TaskId', 'RequestStatus',
-    'OperationalRequest', 'ClassificationResult'
+    'OperationalRequest', 'ClassificationResult',
+    'utc_timestamp'
 ]
@@ -25,6 +25,8 @@ class TaskId(str, Enum):
     CANCEL_ORDER = "CANCEL_ORDER"
     CHANGE_ORDER_STATUS = "CHANGE_ORDER_STATUS"
     CANCEL_CASE = "CANCEL_CASE"
+    CHANGE_CASE_STATUS = "CHANGE_CASE_STATUS"
+    RECONCILE_CASE_DATA = "RECONCILE_CASE_DATA"
 
 
 class OperationalRequest(BaseModel):
@@ -0,0 +1,26 @@
+"""
+Response timestamps shared by the API servers
+"""
+import time
+from typing import Tuple
+
+
+# (epoch second, formatted timestamp), replaced as a whole so concurrent
+# readers never pair a second with another second's text
+_cached: Tuple[int, str] = (-1, "")
+
+
+def utc_timestamp() -> str:
+    """
+    Current UTC time as ISO 8601 with a trailing Z, e.g. 2024-01-01T12:00:00Z
+    
+    Second resolution; the string is formatted once per second and reused
+    by every response built within it.
+    """
+    global _cached
+    second = int(time.time())
+    cached_second, text = _cached
+    if second != cached_second:
+        text = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        _cached = (second, text)
+    return text
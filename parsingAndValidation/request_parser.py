@@ -1,16 +1,17 @@
 """
 HTTP request parsing functionality
 """
-import json
-import uuid
-from typing import Dict, Any, Optional
+import base64
+import orjson
+import os
+from typing import Dict, Any, Optional, Union
 from datetime import datetime
 
 
 class RequestParser:
     """Handles HTTP request parsing and data extraction"""
     
-    def parse_http_request(self, headers: Dict[str, str], body: str) -> Dict[str, Any]:
+    def parse_http_request(self, headers: Dict[str, str], body: Union[str, bytes]) -> Dict[str, Any]:
         """Parse HTTP request into structured data"""
         
         # Extract headers
@@ -18,10 +19,10 @@ class RequestParser:
         auth_header = headers.get('Authorization', '')
         content_type = headers.get('Content-Type', '')
         
-        # Parse JSON body
+        # Parse JSON body (orjson accepts str or raw bytes)
         try:
-            request_data = json.loads(body) if body else {}
-        except json.JSONDecodeError as e:
+            request_data = orjson.loads(body) if body else {}
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in request body: {e}")
         
         # Extract query and context
@@ -40,8 +41,8 @@ class RequestParser:
         }
     
     def generate_request_id(self) -> str:
-        """Generate unique request ID"""
-        return str(uuid.uuid4())
+        """Generate unique, URL-safe request ID from 128 random bits"""
+        return base64.urlsafe_b64encode(os.urandom(16)).rstrip(b'=').decode('ascii')
     
     def extract_content_length(self, headers: Dict[str, str]) -> int:
         """Extract content length from headers"""
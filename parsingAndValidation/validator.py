@@ -4,35 +4,43 @@ Request validation functionality
 from typing import Dict, Any, Optional, Tuple
 
 
+# (header, predicate, error message) checks applied in order; the first
+# failing predicate determines the error
+_HEADER_CHECKS = (
+    ('Authorization', bool, "Missing Authorization header"),
+    ('Authorization', lambda value: value.startswith('Bearer '),
+     "Invalid Authorization format. Use 'Bearer <token>'"),
+    ('X-User-ID', bool, "Missing X-User-ID header"),
+)
+
+_CONTENT_TYPE_CHECKS = (
+    ('Content-Type', lambda value: value.startswith('application/json'),
+     "Content-Type must be application/json"),
+)
+
+_REQUEST_HEADER_CHECKS = _HEADER_CHECKS + _CONTENT_TYPE_CHECKS
+
+_VALID_ENVIRONMENTS = frozenset(('dev', 'staging', 'prod'))
+
+
+def _run_header_checks(headers: Dict[str, str], checks: tuple) -> Tuple[bool, Optional[str]]:
+    """Run header checks in a single pass, stopping at the first failure"""
+    for key, predicate, error in checks:
+        if not predicate(headers.get(key) or ''):
+            return False, error
+    return True, None
+
+
 class RequestValidator:
     """Handles request validation and security checks"""
     
     def validate_headers(self, headers: Dict[str, str]) -> Tuple[bool, Optional[str]]:
         """Validate required headers"""
-        
-        # Check Authorization header
-        auth_header = headers.get('Authorization')
-        if not auth_header:
-            return False, "Missing Authorization header"
-        
-        if not auth_header.startswith('Bearer '):
-            return False, "Invalid Authorization format. Use 'Bearer <token>'"
-        
-        # Check User ID header
-        user_id = headers.get('X-User-ID')
-        if not user_id:
-            return False, "Missing X-User-ID header"
-        
-        return True, None
+        return _run_header_checks(headers, _HEADER_CHECKS)
     
     def validate_content_type(self, headers: Dict[str, str]) -> Tuple[bool, Optional[str]]:
         """Validate content type"""
-        content_type = headers.get('Content-Type', '')
-        
-        if not content_type.startswith('application/json'):
-            return False, "Content-Type must be application/json"
-        
-        return True, None
+        return _run_header_checks(headers, _CONTENT_TYPE_CHECKS)
     
     def validate_request_data(self, request_data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """Validate request data structure"""
@@ -47,21 +55,22 @@ class RequestValidator:
         
         # Validate environment if provided
         environment = request_data.get('environment')
-        if environment and environment not in ['dev', 'staging', 'prod']:
+        if environment is not None and not isinstance(environment, str):
             return False, "Environment must be one of: dev, staging, prod"
+        if environment and environment not in _VALID_ENVIRONMENTS:
+            return False, "Environment must be one of: dev, staging, prod"
+        
+        # Request objects are built without re-validation, so check types here
+        if not isinstance(request_data.get('context', {}), dict):
+            return False, "Invalid 'context' field, must be an object"
         
         return True, None
     
     def validate_request(self, headers: Dict[str, str], request_data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """Comprehensive request validation"""
         
-        # Validate headers
-        valid, error = self.validate_headers(headers)
-        if not valid:
-            return False, error
-        
-        # Validate content type
-        valid, error = self.validate_content_type(headers)
+        # Validate headers and content type in one pass
+        valid, error = _run_header_checks(headers, _REQUEST_HEADER_CHECKS)
         if not valid:
             return False, error
         
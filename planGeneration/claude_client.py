@@ -1,17 +1,73 @@
 """
 Claude Client for AI-powered plan generation using AWS Bedrock
 """
+import asyncio
 import json
-from typing import Dict, Any, Optional
+import httpx
+import orjson
+from typing import AsyncIterator, Dict, Any, Optional
+
+
+# Size of the chunks the mock stream is cut into, small enough to split
+# events and multi-byte characters across chunk boundaries
+MOCK_STREAM_CHUNK_BYTES = 256
+
+# Characters of plan text carried by each mock content_block_delta event
+MOCK_STREAM_DELTA_CHARS = 64
+
+
+async def _iter_json_objects(stream: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield JSON objects from a newline-delimited (NDJSON or SSE) byte stream
+    
+    Chunks are buffered and split on newlines, so an object split across
+    chunks is parsed once complete and several objects in one chunk are all
+    yielded. SSE ``data:`` prefixes are stripped; blank, non-data and
+    malformed lines are skipped. Any unterminated tail is parsed at the end.
+    """
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            obj = _loads_line(line)
+            if obj is not None:
+                yield obj
+    
+    obj = _loads_line(buffer)
+    if obj is not None:
+        yield obj
+
+
+def _loads_line(line: bytes) -> Optional[Any]:
+    """Parse one stream line, returning None for blank or malformed lines"""
+    line = line.strip()
+    if line.startswith(b"data:"):
+        line = line[5:].lstrip()
+    if not line or line[:1] not in b"{[":
+        return None
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
 
 
 class ClaudeClient:
     """Client for AWS Bedrock Claude model interactions"""
     
-    def __init__(self, model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0"):
+    def __init__(
+        self,
+        model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0",
+        temperature: float = 0.1,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.model_id = model_id
+        self.temperature = temperature
         # TODO: Initialize Bedrock runtime client
         self.bedrock_client = None
+        # Shared keep-alive connection pool for Bedrock calls, owned by the
+        # caller (the server opens and closes it)
+        self.http_client = http_client
     
     async def generate_plan(self, prompt: str, max_tokens: int = 4000) -> str:
         """
@@ -27,6 +83,45 @@ class ClaudeClient:
         # PLACEHOLDER: Return mock plan for now
         return self._generate_mock_plan()
     
+    async def stream_plan(self, prompt: str, max_tokens: int = 4000) -> AsyncIterator[bytes]:
+        """
+        Stream the operational plan as raw UTF-8 byte chunks
+        
+        Chunks may split the JSON anywhere, including inside a string or a
+        multi-byte character; consumers must buffer across chunks.
+        
+        TODO: Implement actual Bedrock streaming call:
+        1. Call invoke_model_with_response_stream with the same body as
+           _invoke_bedrock_claude
+        2. Feed the raw event bytes through _iter_json_objects in place of
+           the mock event stream
+        """
+        
+        # PLACEHOLDER: Replay the mock plan as a chunked event stream
+        async for event in _iter_json_objects(self._mock_event_stream()):
+            if isinstance(event, dict) and event.get("type") == "content_block_delta":
+                yield event["delta"]["text"].encode("utf-8")
+    
+    async def _mock_event_stream(self) -> AsyncIterator[bytes]:
+        """
+        Emit the mock plan as newline-delimited content_block_delta events
+        
+        The event stream is cut into fixed-size slices regardless of event
+        boundaries, as network reads would be.
+        """
+        plan = self._generate_mock_plan()
+        events = b"".join(
+            orjson.dumps({
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": plan[start:start + MOCK_STREAM_DELTA_CHARS]}
+            }) + b"\n"
+            for start in range(0, len(plan), MOCK_STREAM_DELTA_CHARS)
+        )
+        for start in range(0, len(events), MOCK_STREAM_CHUNK_BYTES):
+            yield events[start:start + MOCK_STREAM_CHUNK_BYTES]
+            await asyncio.sleep(0)
+    
     async def _invoke_bedrock_claude(self, prompt: str, max_tokens: int) -> str:
         """
         Call Bedrock Claude API
@@ -55,7 +150,7 @@ class ClaudeClient:
                         "content": prompt
                     }
                 ],
-                "temperature": 0.1,  # Low temperature for consistent responses
+                "temperature": self.temperature,  # Low temperature for consistent responses
                 "top_p": 0.9
             }
             
@@ -1,15 +1,42 @@
 """
 Plan Generator - Orchestrates AI plan generation with context and constraints
 """
-from typing import List, Dict, Any
+import asyncio
+import hashlib
+import httpx
+import msgspec
+import orjson
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from models import OperationalRequest, ClassificationResult, TaskId
-from knowledgeRetrieval.vector_search import VectorSearchResult
+from knowledgeRetrieval.vector_search import VectorSearchBatch, VectorSearchResult
 from .claude_client import ClaudeClient
 from .prompt_templates import PromptTemplateManager
+from .plan_stream_parser import PlanStreamParser
+from .plan_schema import convert_plan, decode_plan
+
+
+# Default cap on concurrent Claude calls in generate_many
+PLAN_MAX_CONCURRENCY = 20
+
+# Parsed Claude responses remembered per generator, keyed by prompt
+PLAN_CACHE_SIZE = 512
 
 
 class OperationalPlan:
     """Represents a complete operational plan"""
+    __slots__ = (
+        "summary",
+        "risk_level",
+        "requires_approval",
+        "estimated_duration",
+        "pre_checks",
+        "procedure",
+        "post_checks",
+        "rollback",
+        "citations"
+    )
+    
     def __init__(self, plan_data: Dict[str, Any]):
         self.summary = plan_data.get("summary", "")
         self.risk_level = plan_data.get("risk_level", "MEDIUM")
@@ -20,25 +47,34 @@ class OperationalPlan:
         self.post_checks = plan_data.get("post_checks", [])
         self.rollback = plan_data.get("rollback", [])
         self.citations = plan_data.get("citations", [])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return plan fields as a dict (slots leave no __dict__)"""
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class PlanGenerator:
     """Generates operational plans using AI and retrieved knowledge"""
     
-    def __init__(self):
-        self.claude_client = ClaudeClient()
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.claude_client = ClaudeClient(http_client=http_client)
         self.prompt_manager = PromptTemplateManager()
+        self._plan_cache: "OrderedDict[str, bytes]" = OrderedDict()
     
     async def generate_operational_plan(
         self,
         request: OperationalRequest,
         classification: ClassificationResult,
         knowledge_results: List[VectorSearchResult],
-        policy_constraints: Dict[str, Any] = None
+        policy_constraints: Dict[str, Any] = None,
+        on_field: Optional[Callable[[str, Any], None]] = None
     ) -> OperationalPlan:
         """
         Generate complete operational plan using AI
         
+        The response is parsed as it streams in; ``on_field(key, value)`` is
+        called for each top-level plan field as soon as it is complete.
+        
         TODO: Implement full plan generation pipeline:
         1. Build context from knowledge retrieval results
         2. Select appropriate prompt template
@@ -47,52 +83,157 @@ class PlanGenerator:
         5. Add citations and metadata
         """
         
+        # Drop duplicate chunks once, for both the prompt and the citations
+        knowledge = VectorSearchBatch.from_results(self._dedupe_results(knowledge_results))
+        
         # Build context from retrieved knowledge
-        context = self._build_knowledge_context(knowledge_results)
+        context = self._build_knowledge_context(knowledge)
         
         # Get prompt template for task type
+        template = self.prompt_manager.get(classification.task_id)
         prompt = self.prompt_manager.build_prompt(
             request=request,
             classification=classification,
             context=context,
-            constraints=policy_constraints or {}
+            constraints=policy_constraints or {},
+            template=template
         )
         
-        # Generate plan using Claude
-        raw_response = await self.claude_client.generate_plan(prompt)
+        # Generate plan using Claude, parsing fields as they stream in. The
+        # citations are built while the request is in flight.
+        plan_task = asyncio.create_task(self._stream_plan(prompt, knowledge, on_field))
+        await asyncio.sleep(0)
+        citations = self._build_citations(knowledge)
+        plan_data, cited = await plan_task
         
-        # Parse and structure the response
-        plan_data = self._parse_plan_response(raw_response, knowledge_results)
+        if not cited:
+            plan_data["citations"] = citations
         
         return OperationalPlan(plan_data)
     
-    def _build_knowledge_context(self, knowledge_results: List[VectorSearchResult]) -> str:
+    async def generate_many(
+        self,
+        requests: List[Tuple[OperationalRequest, ClassificationResult, List[VectorSearchResult]]],
+        max_concurrency: int = PLAN_MAX_CONCURRENCY
+    ) -> List[OperationalPlan]:
+        """
+        Generate plans for several requests concurrently
+        
+        Takes (request, classification, knowledge_results) tuples and returns
+        plans in the same order, with at most ``max_concurrency`` Claude
+        calls in flight.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def guarded(request, classification, knowledge_results) -> OperationalPlan:
+            async with semaphore:
+                return await self.generate_operational_plan(request, classification, knowledge_results)
+        
+        return await asyncio.gather(*(guarded(*args) for args in requests))
+    
+    async def _stream_plan(
+        self,
+        prompt: str,
+        knowledge: VectorSearchBatch,
+        on_field: Optional[Callable[[str, Any], None]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Stream the plan from Claude, falling back to whole-response parsing
+        
+        Returns (plan_data, cited). Streamed and cached plans come back
+        without citations; only the fallback path attaches its own, which
+        ``cited`` reports.
+        
+        Streamed fields are validated against PlanSchema once the object is
+        complete; a plan that fails validation goes to the fallback. Plans
+        parsed from a well-formed response are cached by prompt, so an
+        identical prompt skips the Claude roundtrip. Fallback text plans are
+        not cached.
+        """
+        cache_key = self._plan_cache_key(prompt)
+        cached = self._plan_cache.get(cache_key)
+        if cached is not None:
+            self._plan_cache.move_to_end(cache_key)
+            plan_data = orjson.loads(cached)
+            if on_field is not None:
+                for key, value in plan_data.items():
+                    on_field(key, value)
+            return plan_data, False
+        
+        parser = PlanStreamParser(on_field)
+        chunks: List[bytes] = []
+        streaming = True
+        
+        async for chunk in self.claude_client.stream_plan(prompt):
+            chunks.append(chunk)
+            if streaming:
+                try:
+                    parser.feed(chunk)
+                except ValueError:
+                    # Not a bare JSON object; keep buffering for the fallback
+                    streaming = False
+        
+        if streaming:
+            try:
+                plan_data = convert_plan(parser.close())
+            except (ValueError, msgspec.ValidationError):
+                pass
+            else:
+                self._cache_plan(cache_key, orjson.dumps(plan_data))
+                return plan_data, False
+        
+        return self._parse_plan_response(b"".join(chunks), knowledge), True
+    
+    def _plan_cache_key(self, prompt: str) -> str:
+        """Hash the prompt together with the sampling settings that shape the response"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.claude_client.model_id}\x00{self.claude_client.temperature}\x00".encode())
+        digest.update(prompt.encode())
+        return digest.hexdigest()
+    
+    def _cache_plan(self, cache_key: str, plan_json: bytes):
+        """Store a serialized plan, evicting the least recently used entry"""
+        self._plan_cache[cache_key] = plan_json
+        self._plan_cache.move_to_end(cache_key)
+        while len(self._plan_cache) > PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+    
+    def _dedupe_results(self, knowledge_results: List[VectorSearchResult]) -> List[VectorSearchResult]:
+        """Keep the first of results sharing a source and leading content"""
+        seen = set()
+        unique = []
+        for result in knowledge_results:
+            key = (result.source_uri, result.content[:256])
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(result)
+        return unique
+    
+    def _build_knowledge_context(self, knowledge: VectorSearchBatch) -> str:
         """
         Build context string from retrieved knowledge chunks
         
+        Results arrive deduplicated; the five highest scoring are included.
+        
         TODO: Implement smart context building:
-        1. Rank results by relevance score
-        2. Deduplicate similar content
-        3. Maintain source attribution
-        4. Optimize for token limits
+        1. Maintain source attribution
+        2. Optimize for token limits
         """
-        if not knowledge_results:
+        if not len(knowledge):
             return "No specific knowledge retrieved for this task."
         
-        context_parts = []
-        for i, result in enumerate(knowledge_results[:5]):  # Limit to top 5 results
-            context_parts.append(f"""
-Source {i+1}: {result.source_uri}
-Relevance: {result.score:.2f}
-Content: {result.content[:500]}...
-""")
-        
-        return "\n".join(context_parts)
+        # Limit to the top 5 results by score
+        uris, scores, contents = knowledge.uris, knowledge.scores.tolist(), knowledge.contents
+        return "\n\n".join([
+            f"Source {rank}: {uris[i]}\nRelevance: {scores[i]:.2f}\nContent: {contents[i][:500]}..."
+            for rank, i in enumerate(knowledge.top_indices(5).tolist(), 1)
+        ])
     
     def _parse_plan_response(
         self, 
-        raw_response: str, 
-        knowledge_results: List[VectorSearchResult]
+        raw_response: Union[str, bytes], 
+        knowledge: VectorSearchBatch
     ) -> Dict[str, Any]:
         """
         Parse Claude response into structured plan data
@@ -104,29 +245,34 @@ Content: {result.content[:500]}...
         4. Add error handling for malformed responses
         """
         try:
-            import json
-            plan_data = json.loads(raw_response)
+            # Parse and validate against PlanSchema in one pass
+            plan_data = decode_plan(raw_response)
             
             # Add citations from knowledge sources
-            citations = []
-            for result in knowledge_results:
-                citations.append({
-                    "source": result.source_uri,
-                    "relevance_score": result.score,
-                    "section": result.metadata.get("section", "unknown")
-                })
-            
-            plan_data["citations"] = citations
+            plan_data["citations"] = self._build_citations(knowledge)
             return plan_data
             
-        except json.JSONDecodeError:
+        except msgspec.MsgspecError:
             # Fallback: try to extract structured data from natural language
-            return self._extract_plan_from_text(raw_response, knowledge_results)
+            if isinstance(raw_response, bytes):
+                raw_response = raw_response.decode("utf-8", errors="replace")
+            return self._extract_plan_from_text(raw_response, knowledge)
+    
+    def _build_citations(self, knowledge: VectorSearchBatch) -> List[Dict[str, Any]]:
+        """Build citations from knowledge sources"""
+        return [
+            {
+                "source": uri,
+                "relevance_score": score,
+                "section": metadata.get("section", "unknown")
+            }
+            for uri, score, metadata in zip(knowledge.uris, knowledge.scores.tolist(), knowledge.metadatas)
+        ]
     
     def _extract_plan_from_text(
         self, 
         text_response: str, 
-        knowledge_results: List[VectorSearchResult]
+        knowledge: VectorSearchBatch
     ) -> Dict[str, Any]:
         """
         Extract plan structure from natural language response
@@ -154,5 +300,5 @@ Content: {result.content[:500]}...
             ],
             "post_checks": [],
             "rollback": [],
-            "citations": [{"source": r.source_uri} for r in knowledge_results]
+            "citations": [{"source": uri} for uri in knowledge.uris]
         }
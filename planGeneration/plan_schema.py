@@ -0,0 +1,34 @@
+"""
+Typed schema for plans returned by Claude
+"""
+from typing import Any, Dict, List
+import msgspec
+
+
+class PlanSchema(msgspec.Struct):
+    """
+    Expected shape of a plan response
+
+    Decoding against this schema validates field types in the same pass as
+    parsing. Missing fields take the same defaults OperationalPlan uses and
+    unknown fields are dropped. Steps stay as dicts since their keys vary by
+    task (api_call, expected_result, ...).
+    """
+    summary: str = ""
+    risk_level: str = "MEDIUM"
+    requires_approval: bool = True
+    estimated_duration: str = "Unknown"
+    pre_checks: List[Dict[str, Any]] = []
+    procedure: List[Dict[str, Any]] = []
+    post_checks: List[Dict[str, Any]] = []
+    rollback: List[Dict[str, Any]] = []
+
+
+def decode_plan(raw_response: bytes) -> Dict[str, Any]:
+    """Parse and validate a whole JSON response, raising msgspec.MsgspecError on failure"""
+    return msgspec.structs.asdict(msgspec.json.decode(raw_response, type=PlanSchema))
+
+
+def convert_plan(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate already decoded fields, raising msgspec.ValidationError on failure"""
+    return msgspec.structs.asdict(msgspec.convert(fields, PlanSchema))
@@ -0,0 +1,180 @@
+"""
+Incremental parser for streamed JSON plan responses
+"""
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Characters that change scanner state inside a string / outside strings
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURE_SPECIAL = re.compile(r'["\[\]{}]')
+
+# A number or literal ends at the first character that cannot continue it
+_SCALAR_END = re.compile(r'[\s,\]}]')
+_SCALAR_START = "-0123456789tfn"
+
+
+class PlanStreamParser:
+    """
+    Decodes a streamed top-level JSON object one field at a time
+
+    Chunks are buffered across boundaries, including characters split
+    mid-sequence, and each top-level field is decoded as soon as it is
+    complete. ``on_field(key, value)`` is called per field, so callers can
+    act on early fields such as ``summary`` and ``risk_level`` before the
+    stream ends.
+
+    Only string, escape and bracket state is tracked while a key or value
+    arrives; it is decoded once, when its closing token is seen, so parsing
+    stays linear in the response size. Structural errors raise ValueError
+    as soon as they are seen, and a malformed key or value raises once its
+    closing token arrives.
+    """
+
+    def __init__(self, on_field: Optional[Callable[[str, Any], None]] = None):
+        self.on_field = on_field
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._state = "start"
+        self._key: Optional[str] = None
+
+        # Pending key or value: text received so far and scanner state
+        self._token: Optional[List[str]] = None
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: bytes):
+        """Add a chunk of the response and decode any completed fields"""
+        if self.complete:
+            return
+        self._advance(self._utf8.decode(chunk))
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the stream and return the decoded object"""
+        if not self.complete:
+            self._advance(self._utf8.decode(b"", final=True))
+        if not self.complete:
+            raise ValueError("Plan stream ended before the JSON object was complete")
+        return self.fields
+
+    def _advance(self, text: str):
+        """Consume text, decoding every key and value it completes"""
+        pos = 0
+        while not self.complete and pos < len(text):
+            if self._token is not None:
+                end = self._scan(text, pos)
+                if end is None:
+                    self._token.append(text[pos:])
+                    return
+                self._token.append(text[pos:end])
+                pos = end
+                self._finish_token()
+                continue
+
+            char = text[pos]
+            if char in " \t\r\n":
+                pos += 1
+            elif self._state == "start":
+                self._expect(char, "{")
+                self._state = "first_key"
+                pos += 1
+            elif self._state in ("first_key", "key"):
+                if char == "}" and self._state == "first_key":
+                    self.complete = True
+                    break
+                self._expect(char, '"')
+                self._start_token(scalar=False)
+            elif self._state == "colon":
+                self._expect(char, ":")
+                self._state = "value"
+                pos += 1
+            elif self._state == "value":
+                if char not in _SCALAR_START:
+                    self._expect(char, '"[{')
+                self._start_token(scalar=char in _SCALAR_START)
+            else:
+                self._expect(char, ",}")
+                pos += 1
+                if char == "}":
+                    self.complete = True
+                else:
+                    self._state = "key"
+
+    def _start_token(self, scalar: bool):
+        self._token = []
+        self._scalar = scalar
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def _scan(self, text: str, pos: int) -> Optional[int]:
+        """
+        Return the index just past the pending token's closing character in
+        text, or None if the token continues into the next chunk
+
+        Numbers and literals have no closing token, so they end before the
+        first character that cannot continue them (``15`` may still grow to
+        ``150`` until that character arrives).
+        """
+        if self._scalar:
+            match = _SCALAR_END.search(text, pos)
+            return match.start() if match else None
+
+        while True:
+            if self._escaped:
+                if pos == len(text):
+                    return None
+                self._escaped = False
+                pos += 1
+            pattern = _STRING_SPECIAL if self._in_string else _STRUCTURE_SPECIAL
+            match = pattern.search(text, pos)
+            if match is None:
+                return None
+            char = match.group()
+            pos = match.end()
+            if self._in_string:
+                if char == "\\":
+                    self._escaped = True
+                else:
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+            if self._depth == 0 and not self._in_string:
+                return pos
+
+    def _finish_token(self):
+        """Decode the completed key or value and move to the next state"""
+        token = "".join(self._token)
+        self._token = None
+        try:
+            value, end = self._decoder.raw_decode(token)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Malformed JSON in plan stream: {e}") from e
+        if end != len(token):
+            raise ValueError(f"Malformed JSON in plan stream: {token!r}")
+
+        if self._state in ("first_key", "key"):
+            self._key = value
+            self._state = "colon"
+            return
+
+        self.fields[self._key] = value
+        if self.on_field is not None:
+            self.on_field(self._key, value)
+        self._state = "separator"
+
+    @staticmethod
+    def _expect(char: str, allowed: str):
+        if char not in allowed:
+            raise ValueError(f"Unexpected character {char!r} in plan stream, expected one of {allowed!r}")
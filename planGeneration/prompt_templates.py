@@ -1,10 +1,70 @@
 """
 Prompt Templates for different operational tasks
 """
-from typing import Dict, Any
+import copy
+import keyword
+import string
+from typing import Dict, Any, Optional
 from models import OperationalRequest, ClassificationResult, TaskId
 
 
+_CONVERSIONS = {"r": repr, "s": str, "a": ascii}
+
+
+def _escape(text: str) -> str:
+    """Escape literal text for str.format / f-string source"""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _field_markup(field: str, spec: str, conversion: str) -> str:
+    """Rebuild the replacement field markup returned by string.Formatter.parse"""
+    return "{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+
+
+class _CompiledTemplate:
+    """
+    Prompt template compiled once into a generated f-string function
+    
+    Rendering matches str.format for plain ``{name}`` fields, including
+    conversions and format specs, and ignores unused keyword arguments.
+    """
+    
+    def __init__(self, template: str):
+        self.template = template
+        
+        pieces = []
+        fields = []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            pieces.append(_escape(literal))
+            if field is None:
+                continue
+            if not field.isidentifier() or keyword.iskeyword(field) or "{" in spec:
+                raise ValueError(f"Unsupported template field: {{{field}}}")
+            if field not in fields:
+                fields.append(field)
+            pieces.append(_field_markup(field, spec, conversion))
+        self.fields = tuple(fields)
+        
+        params = ", ".join(["*", *fields, "**_"]) if fields else "**_"
+        namespace: Dict[str, Any] = {}
+        exec(f"def render({params}):\n    return f{''.join(pieces)!r}\n", namespace)
+        self.render = namespace["render"]
+    
+    def partial(self, **values) -> "_CompiledTemplate":
+        """Return a template with the given fields already substituted"""
+        pieces = []
+        for literal, field, spec, conversion in string.Formatter().parse(self.template):
+            pieces.append(_escape(literal))
+            if field is None:
+                continue
+            if field in values:
+                value = _CONVERSIONS[conversion](values[field]) if conversion else values[field]
+                pieces.append(_escape(format(value, spec)))
+            else:
+                pieces.append(_field_markup(field, spec, conversion))
+        return _CompiledTemplate("".join(pieces))
+
+
 class PromptTemplateManager:
     """Manages prompt templates for different operational tasks"""
     
@@ -14,17 +74,53 @@ class PromptTemplateManager:
             TaskId.CHANGE_CASE_STATUS: self._get_change_status_template(),
             TaskId.RECONCILE_CASE_DATA: self._get_reconcile_data_template()
         }
+        
+        # Templates are parsed once here; build_prompt only substitutes values
+        self._compiled = {
+            task_id: _CompiledTemplate(template) for task_id, template in self.templates.items()
+        }
+        self._generic = _CompiledTemplate(self._get_generic_template())
+        
+        # Constraint values baked in by specialize(), if any
+        self._fixed_constraints = None
+    
+    def specialize(self, constraints: Dict[str, Any]) -> "PromptTemplateManager":
+        """
+        Return a manager with policy constraints substituted ahead of time
+        
+        Constraints are usually fixed per deployment, so the returned
+        manager's build_prompt only fills per-request fields. It still
+        checks the constraints passed to it and raises ValueError if they
+        differ from the ones baked in.
+        """
+        fixed = self._constraint_values(constraints)
+        
+        specialized = copy.copy(self)
+        specialized._compiled = {
+            task_id: template.partial(**fixed) for task_id, template in self._compiled.items()
+        }
+        specialized._generic = self._generic.partial(**fixed)
+        specialized._fixed_constraints = fixed
+        return specialized
+    
+    def get(self, task_id: Optional[TaskId]) -> _CompiledTemplate:
+        """Return the compiled template for a task, or the generic template"""
+        return self._compiled.get(task_id, self._generic)
     
     def build_prompt(
         self,
         request: OperationalRequest,
         classification: ClassificationResult,
         context: str,
-        constraints: Dict[str, Any]
+        constraints: Dict[str, Any],
+        template: Optional[_CompiledTemplate] = None
     ) -> str:
         """
         Build complete prompt for Claude based on task type
         
+        Callers that already resolved the template with get() can pass it
+        to skip the lookup.
+        
         TODO: Implement dynamic prompt building:
         1. Select appropriate template
         2. Inject context and constraints
@@ -32,12 +128,19 @@ class PromptTemplateManager:
         4. Include safety and validation instructions
         """
         
-        template = self.templates.get(
-            classification.task_id, 
-            self._get_generic_template()
-        )
+        if template is None:
+            template = self.get(classification.task_id)
         
-        return template.format(
+        constraint_values = self._constraint_values(constraints)
+        if self._fixed_constraints is not None:
+            if constraint_values != self._fixed_constraints:
+                raise ValueError(
+                    f"Constraints {constraint_values} differ from the specialized ones {self._fixed_constraints}"
+                )
+            # Already substituted into the specialized templates
+            constraint_values = {}
+        
+        return template.render(
             user_id=request.user_id,
             query=request.query,
             task_id=classification.task_id.value if classification.task_id else "UNKNOWN",
@@ -46,12 +149,18 @@ class PromptTemplateManager:
             case_id=classification.extracted_entities.get("case_id", "Unknown"),
             target_status=classification.extracted_entities.get("target_status", "N/A"),
             context=context,
-            api_only=constraints.get("api_only", True),
-            approval_required=constraints.get("approval_required", True),
-            max_risk_level=constraints.get("max_risk_level", "MEDIUM"),
-            rollback_window=constraints.get("rollback_window_hours", 24)
+            **constraint_values
         )
     
+    def _constraint_values(self, constraints: Dict[str, Any]) -> Dict[str, Any]:
+        """Map policy constraints onto template fields, with defaults"""
+        return {
+            "api_only": constraints.get("api_only", True),
+            "approval_required": constraints.get("approval_required", True),
+            "max_risk_level": constraints.get("max_risk_level", "MEDIUM"),
+            "rollback_window": constraints.get("rollback_window_hours", 24)
+        }
+    
     def _get_cancel_case_template(self) -> str:
         """Template for case cancellation operations"""
         return """You are OpsGuide, an expert operational assistant that provides safe, step-by-step procedures for infrastructure and application operations.
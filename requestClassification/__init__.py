@@ -3,5 +3,6 @@ Request classification module using pattern matching
 """
 from .pattern_classifier import PatternClassifier
 from .entity_extractor import EntityExtractor
+from .classification_batcher import ClassificationBatcher
 
-__all__ = ['PatternClassifier', 'EntityExtractor']
+__all__ = ['PatternClassifier', 'EntityExtractor', 'ClassificationBatcher']
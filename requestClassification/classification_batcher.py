@@ -0,0 +1,96 @@
+"""
+Microbatching front end for PatternClassifier in async servers
+"""
+import asyncio
+from typing import List, Optional, Tuple
+from models import OperationalRequest, ClassificationResult
+from .pattern_classifier import PatternClassifier
+
+
+# Most requests classified in one batch
+CLASSIFY_BATCH_SIZE = 256
+
+# Extra time a batch waits for more requests once the first arrives. Zero
+# still collects every request queued before the batcher next runs, without
+# adding latency; raise it to trade latency for larger batches under load.
+CLASSIFY_BATCH_WINDOW_SECONDS = 0.0
+
+
+class ClassificationBatcher:
+    """
+    Collects concurrent classify calls and runs them as one batch
+    
+    ``classify`` queues the request and waits on a future; a single worker
+    task drains the queue and resolves every waiting future from one
+    ``classify_many`` call. ``start`` and ``stop`` must be called from the
+    event loop that serves requests.
+    """
+    
+    def __init__(
+        self,
+        classifier: PatternClassifier,
+        window: float = CLASSIFY_BATCH_WINDOW_SECONDS,
+        max_batch: int = CLASSIFY_BATCH_SIZE
+    ):
+        self.classifier = classifier
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "Optional[asyncio.Queue[Tuple[OperationalRequest, asyncio.Future]]]" = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the batching worker on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the worker, failing any requests still queued"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Classification batcher stopped"))
+    
+    async def classify(self, request: OperationalRequest) -> ClassificationResult:
+        """Classify a request as part of the next batch"""
+        if self._worker is None:
+            # Not started (e.g. outside a server): classify inline
+            return self.classifier.classify(request)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((request, future))
+        return await future
+    
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            
+            # Let requests already scheduled on the loop join this batch
+            await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            self._resolve(batch)
+    
+    def _resolve(self, batch: List[Tuple[OperationalRequest, asyncio.Future]]):
+        """Classify a batch and hand each result to its waiting caller"""
+        try:
+            results = self.classifier.classify_many(request for request, _ in batch)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            # A caller that gave up (cancelled) no longer needs its result
+            if not future.done():
+                future.set_result(result)
@@ -2,85 +2,156 @@
 Entity extraction from natural language queries
 """
 import re
-from typing import Optional
+from typing import Dict, List, Optional
+
+
+def compile_any(patterns: Dict[str, List[str]], flags: int = re.IGNORECASE) -> Dict[str, re.Pattern]:
+    """
+    Compile each label's regex list into a single alternation
+    
+    ``search`` on the result succeeds exactly when one of the label's
+    patterns would, so a label is tested with one regex call. Label order
+    is preserved.
+    """
+    return {
+        label: re.compile("|".join(f"(?:{pattern})" for pattern in label_patterns), flags)
+        for label, label_patterns in patterns.items()
+    }
+
+
+def compile_alternation(patterns: Dict[str, List[str]], flags: int = 0) -> re.Pattern:
+    """
+    Compile a label -> regex list table into one alternation
+    
+    Each label becomes a named group, so ``match.lastgroup`` is the label
+    that matched. Labels must be valid identifiers.
+    """
+    return re.compile(
+        "|".join(f"(?P<{label}>{'|'.join(label_patterns)})" for label, label_patterns in patterns.items()),
+        flags
+    )
+
+
+def first_label(label_re: re.Pattern, label_rank: Dict[str, int], text: str) -> Optional[str]:
+    """
+    Return the earliest-listed label matching anywhere in text
+    
+    Matches from one scan are ranked by their label's table position, so the
+    result is the same as trying each label's patterns in table order.
+    """
+    best = None
+    for match in label_re.finditer(text):
+        label = match.lastgroup
+        if best is None or label_rank[label] < label_rank[best]:
+            best = label
+            if label_rank[label] == 0:
+                break
+    return best
+
+
+# Order ID patterns, tried in order
+_ORDER_ID_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'ORDER[_-](\d{4})[_-][\w-]+',  # ORDER-2024-TEST-001 -> 2024
+    r'\border[_\s-]?(\d+)\b',       # order-12345 -> 12345
+    r'\border[_\s-]?id[_\s-]?(\w+)\b'  # order id ABC123 -> ABC123
+]]
+
+# Full case ID format (e.g., CASE-2024-TEST-001)
+_FULL_CASE_PATTERN = re.compile(r'\bCASE[_-]\d{4}[_-][\w-]+\b', re.IGNORECASE)
+_CASE_ID_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'\bCASE[_-]?([\w-]+)\b',      # CASE-12345 or CASE-TEST-001
+    r'\bcase[_\s-]?(\d+)\b',      # case-12345 -> 12345
+    r'\bcase[_\s-]?id[_\s-]?([\w-]+)\b'  # case id CASE-2024-TEST-001
+]]
+
+# Fallbacks shared by order and case IDs, tried after the keyword patterns
+_UUID_PATTERN = re.compile(
+    r'\b([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})\b', re.IGNORECASE
+)
+_NUMBER_PATTERN = re.compile(r'\b(\d{4,})\b')  # Any 4+ digit number
+
+# Status and priority words are matched against the lowercased query,
+# each table in a single alternation pass
+_STATUS_PATTERNS = {
+    'completed': [r'\bcomplete\b', r'\bfinish\b', r'\bdone\b', r'\bcompleted\b'],
+    'cancelled': [r'\bcancel\b', r'\babort\b', r'\bterminate\b', r'\bcancelled\b'],
+    'on_hold': [r'\bhold\b', r'\bpause\b', r'\bsuspend\b', r'\bon[_\s-]?hold\b'],
+    'in_progress': [r'\bin[_\s-]?progress\b', r'\bactive\b', r'\bstart\b', r'\bstarted\b'],
+    'under_review': [r'\breview\b', r'\bcheck\b', r'\bvalidate\b', r'\bunder[_\s-]?review\b'],
+    'pending': [r'\bpending\b', r'\bwaiting\b', r'\bqueue\b'],
+    'rejected': [r'\breject\b', r'\brejected\b', r'\bdeny\b', r'\bdenied\b']
+}
+_STATUS_RE = compile_alternation(_STATUS_PATTERNS)
+_STATUS_RANK = {status: rank for rank, status in enumerate(_STATUS_PATTERNS)}
+
+_PRIORITY_PATTERNS = {
+    'high': [r'\bhigh\b', r'\burgent\b', r'\bcritical\b', r'\bemergency\b'],
+    'medium': [r'\bmedium\b', r'\bnormal\b', r'\bstandard\b'],
+    'low': [r'\blow\b', r'\bminor\b', r'\broutine\b']
+}
+_PRIORITY_RE = compile_alternation(_PRIORITY_PATTERNS)
+_PRIORITY_RANK = {priority: rank for rank, priority in enumerate(_PRIORITY_PATTERNS)}
 
 
 class EntityExtractor:
     """Extracts structured entities from natural language text"""
     
+    def __init__(self):
+        # Patterns are compiled once at import and shared by every extractor.
+        # Keyword patterns only run when the query contains the keyword.
+        self._order_id_patterns = _ORDER_ID_PATTERNS
+        self._full_case_pattern = _FULL_CASE_PATTERN
+        self._case_id_patterns = _CASE_ID_PATTERNS
+        self._uuid_pattern = _UUID_PATTERN
+        self._number_pattern = _NUMBER_PATTERN
+        self._status_re = _STATUS_RE
+        self._status_rank = _STATUS_RANK
+        self._priority_re = _PRIORITY_RE
+        self._priority_rank = _PRIORITY_RANK
+    
     def extract_order_id(self, query: str) -> Optional[str]:
         """Extract order ID from query using regex patterns"""
-        patterns = [
-            r'ORDER[_-](\d{4})[_-][\w-]+',  # ORDER-2024-TEST-001 -> 2024
-            r'\border[_\s-]?(\d+)\b',       # order-12345 -> 12345
-            r'\border[_\s-]?id[_\s-]?(\w+)\b',  # order id ABC123 -> ABC123
-            r'\b([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})\b',  # UUID
-            r'\b(\d{4,})\b'  # Any 4+ digit number
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        if 'order' in query.lower():
+            for pattern in self._order_id_patterns:
+                match = pattern.search(query)
+                if match:
+                    return match.group(1)
         
-        return None
+        return self._extract_fallback_id(query)
     
     def extract_case_id(self, query: str) -> Optional[str]:
         """Extract case ID from query using regex patterns"""
-        # First try to match full case ID format (e.g., CASE-2024-TEST-001)
-        full_case_pattern = r'\bCASE[_-]\d{4}[_-][\w-]+\b'
-        full_match = re.search(full_case_pattern, query, re.IGNORECASE)
-        if full_match:
-            return full_match.group(0)
+        if 'case' in query.lower():
+            # First try to match full case ID format (e.g., CASE-2024-TEST-001)
+            full_match = self._full_case_pattern.search(query)
+            if full_match:
+                return full_match.group(0)
+            
+            # Try simpler patterns
+            for pattern in self._case_id_patterns:
+                match = pattern.search(query)
+                if match:
+                    return match.group(1)
         
-        # Try simpler patterns
-        patterns = [
-            r'\bCASE[_-]?([\w-]+)\b',      # CASE-12345 or CASE-TEST-001
-            r'\bcase[_\s-]?(\d+)\b',      # case-12345 -> 12345
-            r'\bcase[_\s-]?id[_\s-]?([\w-]+)\b',  # case id CASE-2024-TEST-001
-            r'\b([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})\b',  # UUID
-            r'\b(\d{4,})\b'  # Any 4+ digit number as fallback
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        return self._extract_fallback_id(query)
+    
+    def _extract_fallback_id(self, query: str) -> Optional[str]:
+        """Match a UUID, then any 4+ digit number"""
+        # A UUID needs 36 characters including four hyphens
+        if len(query) >= 36 and query.count('-') >= 4:
+            match = self._uuid_pattern.search(query)
             if match:
                 return match.group(1)
         
-        return None
+        match = self._number_pattern.search(query)
+        return match.group(1) if match else None
     
-    def extract_target_status(self, query: str) -> Optional[str]:
+    def extract_target_status(self, query: str, query_lower: Optional[str] = None) -> Optional[str]:
         """Extract target status for status change operations"""
-        status_patterns = {
-            'completed': [r'\bcomplete\b', r'\bfinish\b', r'\bdone\b', r'\bcompleted\b'],
-            'cancelled': [r'\bcancel\b', r'\babort\b', r'\bterminate\b', r'\bcancelled\b'],
-            'on_hold': [r'\bhold\b', r'\bpause\b', r'\bsuspend\b', r'\bon[_\s-]?hold\b'],
-            'in_progress': [r'\bin[_\s-]?progress\b', r'\bactive\b', r'\bstart\b', r'\bstarted\b'],
-            'under_review': [r'\breview\b', r'\bcheck\b', r'\bvalidate\b', r'\bunder[_\s-]?review\b'],
-            'pending': [r'\bpending\b', r'\bwaiting\b', r'\bqueue\b'],
-            'rejected': [r'\breject\b', r'\brejected\b', r'\bdeny\b', r'\bdenied\b']
-        }
-        
-        query_lower = query.lower()
-        for status, patterns in status_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower):
-                    return status
-        
-        return None
+        if query_lower is None:
+            query_lower = query.lower()
+        return first_label(self._status_re, self._status_rank, query_lower)
     
     def extract_priority(self, query: str) -> Optional[str]:
         """Extract priority level from query"""
-        priority_patterns = {
-            'high': [r'\bhigh\b', r'\burgent\b', r'\bcritical\b', r'\bemergency\b'],
-            'medium': [r'\bmedium\b', r'\bnormal\b', r'\bstandard\b'],
-            'low': [r'\blow\b', r'\bminor\b', r'\broutine\b']
-        }
-        
-        query_lower = query.lower()
-        for priority, patterns in priority_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower):
-                    return priority
-        
-        return None
+        return first_label(self._priority_re, self._priority_rank, query.lower())
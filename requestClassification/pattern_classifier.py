@@ -2,63 +2,155 @@
 Pattern-based request classification using regex
 """
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 from models import OperationalRequest, ClassificationResult, UseCase, TaskId
-from .entity_extractor import EntityExtractor
+from .entity_extractor import EntityExtractor, compile_any
+
+
+# Distinct (query, environment) pairs remembered per classifier
+CLASSIFY_CACHE_SIZE = 4096
+
+# Patterns are lowercase and only ever searched in the lowercased query, so
+# they skip IGNORECASE and Unicode case folding and match in ASCII mode
+_PATTERN_FLAGS = re.ASCII
+
+# Substrings that every pattern of a label needs at least one of. When none
+# is present in the lowercased query, the label's regex is skipped.
+_TASK_GATES = {
+    TaskId.CANCEL_ORDER: ('order',),
+    TaskId.CANCEL_CASE: ('case',),
+    TaskId.CHANGE_ORDER_STATUS: ('status', 'order')
+}
+_ENV_GATES = {
+    'dev': ('dev',),
+    'staging': ('stag', 'stg'),
+    'prod': ('prod', 'prd')
+}
+_SERVICE_GATES = {
+    'Order': ('order',),
+    'Case': ('case',),
+    'Fulfillment': ('fulfillment', 'shipping', 'delivery'),
+    'Billing': ('billing', 'invoice', 'payment')
+}
+
+# Keywords for the task fallback rules
+_ORDER_ACTION_WORDS = ('change', 'update', 'fix', 'cancel', 'modify')
+_CANCEL_WORDS = ('cancel', 'terminate', 'abort', 'stop')
+_STATUS_WORDS = ('status', 'state', 'transition')
+_CASE_CANCEL_WORDS = ('cancel', 'terminate', 'abort', 'stop', 'close')
+
+# Task identification patterns, compiled at import into one alternation
+# per task and shared by every classifier
+_TASK_PATTERNS = compile_any({
+    TaskId.CANCEL_ORDER: [
+        r'\bcancel\b.*\border\b',
+        r'\border\b.*\bcancel\b',
+        r'\bterminate\b.*\border\b',
+        r'\babort\b.*\border\b',
+        r'\bstop\b.*\border\b'
+    ],
+    TaskId.CANCEL_CASE: [
+        r'\bcancel\b.*\bcase\b',
+        r'\bcase\b.*\bcancel\b',
+        r'\bterminate\b.*\bcase\b',
+        r'\babort\b.*\bcase\b',
+        r'\bstop\b.*\bcase\b',
+        r'\bclose\b.*\bcase\b',
+        r'\bcase\b.*\bclose\b'
+    ],
+    TaskId.CHANGE_ORDER_STATUS: [
+        r'\bchange\b.*\bstatus\b',
+        r'\bstatus\b.*\bchange\b',
+        r'\bupdate\b.*\bstatus\b',
+        r'\btransition\b.*\border\b',
+        r'\bmove\b.*\border\b.*\bto\b',
+        r'\bset\b.*\bstatus\b'
+    ]
+}, flags=_PATTERN_FLAGS)
+
+# Environment detection patterns
+_ENV_PATTERNS = compile_any({
+    'dev': [r'\bdev\b', r'\bdevelopment\b', r'\bdev-\w+\b'],
+    'staging': [r'\bstaging\b', r'\bstage\b', r'\bstg\b'],
+    'prod': [r'\bprod\b', r'\bproduction\b', r'\bprd\b']
+}, flags=_PATTERN_FLAGS)
+
+# Service detection patterns
+_SERVICE_PATTERNS = compile_any({
+    'Order': [r'\border\b', r'\borders\b', r'\border management\b'],
+    'Case': [r'\bcase\b', r'\bcases\b', r'\bcase management\b'],
+    'Fulfillment': [r'\bfulfillment\b', r'\bshipping\b', r'\bdelivery\b'],
+    'Billing': [r'\bbilling\b', r'\binvoice\b', r'\bpayment\b']
+}, flags=_PATTERN_FLAGS)
+
+
+def _first_gated_match(patterns: Dict, gates: Dict, query: str):
+    """Return the first label whose gate substring is present and whose regex matches"""
+    for label, pattern in patterns.items():
+        for word in gates[label]:
+            if word in query:
+                if pattern.search(query):
+                    return label
+                break
+    return None
+
+
+def _copy_result(result: ClassificationResult) -> ClassificationResult:
+    """
+    Copy a cached result for one caller
+    
+    The cache keeps the original, so a caller changing a field or an
+    extracted entity cannot affect later requests. Entity values are
+    strings or None, so copying the dict is enough.
+    """
+    return result.model_copy(update={"extracted_entities": dict(result.extracted_entities)})
 
 
 class PatternClassifier:
     """Classifies operational requests using regex pattern matching"""
     
     def __init__(self):
-        # Task identification patterns
-        self.task_patterns = {
-            TaskId.CANCEL_ORDER: [
-                r'\bcancel\b.*\border\b',
-                r'\border\b.*\bcancel\b',
-                r'\bterminate\b.*\border\b',
-                r'\babort\b.*\border\b',
-                r'\bstop\b.*\border\b'
-            ],
-            TaskId.CANCEL_CASE: [
-                r'\bcancel\b.*\bcase\b',
-                r'\bcase\b.*\bcancel\b',
-                r'\bterminate\b.*\bcase\b',
-                r'\babort\b.*\bcase\b',
-                r'\bstop\b.*\bcase\b',
-                r'\bclose\b.*\bcase\b',
-                r'\bcase\b.*\bclose\b'
-            ],
-            TaskId.CHANGE_ORDER_STATUS: [
-                r'\bchange\b.*\bstatus\b',
-                r'\bstatus\b.*\bchange\b',
-                r'\bupdate\b.*\bstatus\b',
-                r'\btransition\b.*\border\b',
-                r'\bmove\b.*\border\b.*\bto\b',
-                r'\bset\b.*\bstatus\b'
-            ]
-        }
-        
-        # Environment detection patterns
-        self.env_patterns = {
-            'dev': [r'\bdev\b', r'\bdevelopment\b', r'\bdev-\w+\b'],
-            'staging': [r'\bstaging\b', r'\bstage\b', r'\bstg\b'],
-            'prod': [r'\bprod\b', r'\bproduction\b', r'\bprd\b']
-        }
-        
-        # Service detection patterns
-        self.service_patterns = {
-            'Order': [r'\border\b', r'\borders\b', r'\border management\b'],
-            'Case': [r'\bcase\b', r'\bcases\b', r'\bcase management\b'],
-            'Fulfillment': [r'\bfulfillment\b', r'\bshipping\b', r'\bdelivery\b'],
-            'Billing': [r'\bbilling\b', r'\binvoice\b', r'\bpayment\b']
-        }
+        self.task_patterns = _TASK_PATTERNS
+        self.env_patterns = _ENV_PATTERNS
+        self.service_patterns = _SERVICE_PATTERNS
         
         self.entity_extractor = EntityExtractor()
+        
+        # Classification depends only on query and environment, so repeated
+        # requests are answered from a per-classifier LRU
+        self._classify_cached = lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(self._classify_query)
 
     def classify(self, request: OperationalRequest) -> ClassificationResult:
-        """Classify an operational request using pattern matching"""
-        query_lower = request.query.lower()
+        """
+        Classify an operational request using pattern matching
+        
+        Results are cached per query and environment; each call gets its
+        own copy, so callers may modify what they receive.
+        """
+        return _copy_result(self._classify_cached(request.query, request.environment))
+
+    def classify_many(self, requests: Iterable[OperationalRequest]) -> List[ClassificationResult]:
+        """
+        Classify several requests, in order
+        
+        Requests with the same query and environment are classified once
+        per batch, so a burst of identical asks costs one classification;
+        each request still gets its own copy.
+        """
+        results: Dict[tuple, ClassificationResult] = {}
+        classified = []
+        for request in requests:
+            key = (request.query, request.environment)
+            result = results.get(key)
+            if result is None:
+                result = results[key] = self._classify_cached(*key)
+            classified.append(_copy_result(result))
+        return classified
+
+    def _classify_query(self, query: str, default_env: Optional[str]) -> ClassificationResult:
+        """Classify a query string, falling back to default_env for environment"""
+        query_lower = query.lower()
         
         # For MVP, we only handle U2 (Operational Ask)
         use_case = UseCase.OPERATIONAL_ASK
@@ -67,11 +159,14 @@ class PatternClassifier:
         task_id = self._identify_task(query_lower)
         
         # Extract entities from the query
-        environment = self._extract_environment(query_lower, request.environment)
+        environment = self._extract_environment(query_lower, default_env)
         service = self._extract_service(query_lower)
-        order_id = self.entity_extractor.extract_order_id(request.query) if 'order' in query_lower else None
-        case_id = self.entity_extractor.extract_case_id(request.query) if 'case' in query_lower else None
-        target_status = self.entity_extractor.extract_target_status(request.query) if task_id == TaskId.CHANGE_ORDER_STATUS else None
+        order_id = self.entity_extractor.extract_order_id(query) if 'order' in query_lower else None
+        case_id = self.entity_extractor.extract_case_id(query) if 'case' in query_lower else None
+        target_status = (
+            self.entity_extractor.extract_target_status(query, query_lower)
+            if task_id == TaskId.CHANGE_ORDER_STATUS else None
+        )
         
         # Build extracted entities dict
         extracted_entities = {
@@ -86,7 +181,8 @@ class PatternClassifier:
         # Calculate confidence based on pattern matches
         confidence = 0.9 if task_id else 0.5
         
-        return ClassificationResult(
+        # All fields are built internally, so skip Pydantic validation
+        return ClassificationResult.model_construct(
             use_case=use_case,
             task_id=task_id,
             confidence=confidence,
@@ -97,39 +193,33 @@ class PatternClassifier:
 
     def _identify_task(self, query: str) -> Optional[TaskId]:
         """Identify the specific task type using regex patterns"""
-        for task_id, patterns in self.task_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query, re.IGNORECASE):
-                    return task_id
+        task_id = _first_gated_match(self.task_patterns, _TASK_GATES, query)
+        if task_id is not None:
+            return task_id
         
         # Fallback logic - if contains "order" and operational keywords
-        if 'order' in query and any(word in query for word in ['change', 'update', 'fix', 'cancel', 'modify']):
-            if any(word in query for word in ['cancel', 'terminate', 'abort', 'stop']):
+        if 'order' in query and any(word in query for word in _ORDER_ACTION_WORDS):
+            if any(word in query for word in _CANCEL_WORDS):
                 return TaskId.CANCEL_ORDER
-            elif any(word in query for word in ['status', 'state', 'transition']):
+            elif any(word in query for word in _STATUS_WORDS):
                 return TaskId.CHANGE_ORDER_STATUS
         
         # Fallback logic - if contains "case" and cancel keywords
-        if 'case' in query and any(word in query for word in ['cancel', 'terminate', 'abort', 'stop', 'close']):
+        if 'case' in query and any(word in query for word in _CASE_CANCEL_WORDS):
             return TaskId.CANCEL_CASE
         
         return None
 
     def _extract_environment(self, query: str, default_env: str) -> str:
         """Extract target environment using regex patterns"""
-        for env, patterns in self.env_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query, re.IGNORECASE):
-                    return env
-        return default_env
+        return _first_gated_match(self.env_patterns, _ENV_GATES, query) or default_env
 
     def _extract_service(self, query: str) -> str:
         """Extract target service using regex patterns"""
-        for service, patterns in self.service_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query, re.IGNORECASE):
-                    return service
+        service = _first_gated_match(self.service_patterns, _SERVICE_GATES, query)
+        if service is not None:
+            return service
         # Default based on query content
-        if 'case' in query.lower():
+        if 'case' in query:
             return "Case"
         return "Order"  # Default to Order service
@@ -3,6 +3,7 @@ Risk Assessment Module - Policy-based risk evaluation and approval workflows
 """
 from .risk_engine import RiskEngine
 from .policy_validator import PolicyValidator
-from .approval_manager import ApprovalManager
+from .approval_manager import ApprovalManager, ApprovalCapacityError
+from .approval_store import ApprovalStore
 
-__all__ = ['RiskEngine', 'PolicyValidator', 'ApprovalManager']
+__all__ = ['RiskEngine', 'PolicyValidator', 'ApprovalManager', 'ApprovalCapacityError', 'ApprovalStore']
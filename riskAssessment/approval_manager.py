@@ -1,41 +1,142 @@
 """
 Approval Manager - Handles approval workflows for high-risk operations
 """
-from typing import Dict, Any, List, Optional
-from enum import Enum
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Set, Tuple
+from collections import OrderedDict, defaultdict
+import heapq
+from enum import Enum, auto
 from datetime import datetime, timedelta
+import orjson
+from sortedcontainers import SortedKeyList
+from .approval_store import ApprovalStore
+from .notifier import Notifier, get_default_notifier
 
 
-class ApprovalStatus(str, Enum):
-    """Approval status for operations"""
-    PENDING = "PENDING"
-    APPROVED = "APPROVED"
-    REJECTED = "REJECTED"
-    EXPIRED = "EXPIRED"
-    CANCELLED = "CANCELLED"
+# Pending requests kept in memory, least recently used evicted first
+APPROVAL_CACHE_CAPACITY = 10000
+
+# Decided or expired requests kept in memory for status lookups
+APPROVAL_ARCHIVE_CAPACITY = 1000
+
+
+class ApprovalCapacityError(RuntimeError):
+    """Raised when no more pending approvals fit in memory and there is no store"""
+
+
+class ApprovalStatus(Enum):
+    """
+    Approval status for operations
+    
+    Members are singletons compared by identity; ``.name`` is the string
+    form used when serializing.
+    """
+    PENDING = auto()
+    APPROVED = auto()
+    REJECTED = auto()
+    EXPIRED = auto()
+    CANCELLED = auto()
+    
+    def __str__(self) -> str:
+        return self.name
 
 
 class ApprovalRequest:
     """Represents an approval request"""
+    __slots__ = (
+        "request_id",
+        "operation_summary",
+        "risk_level",
+        "requester",
+        "approvers",
+        "status",
+        "created_at",
+        "expires_at",
+        "approved_by",
+        "approved_at",
+        "rejection_reason"
+    )
+    
     def __init__(self, request_id: str, operation_summary: str, risk_level: str, 
-                 requester: str, approvers: List[str], expires_at: datetime):
+                 requester: str, approvers: Iterable[str], expires_at: datetime,
+                 created_at: Optional[datetime] = None):
         self.request_id = request_id
         self.operation_summary = operation_summary
         self.risk_level = risk_level
         self.requester = requester
-        self.approvers = approvers
+        self.approvers: FrozenSet[str] = frozenset(approvers)
         self.status = ApprovalStatus.PENDING
-        self.created_at = datetime.utcnow()
+        self.created_at = created_at or datetime.utcnow()
         self.expires_at = expires_at
         self.approved_by = None
         self.approved_at = None
         self.rejection_reason = None
+    
+    def to_json(self) -> bytes:
+        """Serialize for an ApprovalStore"""
+        return orjson.dumps({
+            "request_id": self.request_id,
+            "operation_summary": self.operation_summary,
+            "risk_level": self.risk_level,
+            "requester": self.requester,
+            "approvers": sorted(self.approvers),
+            "status": self.status.name,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "approved_by": self.approved_by,
+            "approved_at": self.approved_at,
+            "rejection_reason": self.rejection_reason
+        })
+    
+    @classmethod
+    def from_json(cls, data: bytes) -> "ApprovalRequest":
+        """Rebuild a request serialized by to_json"""
+        fields = orjson.loads(data)
+        approval_request = cls(
+            request_id=fields["request_id"],
+            operation_summary=fields["operation_summary"],
+            risk_level=fields["risk_level"],
+            requester=fields["requester"],
+            approvers=fields["approvers"],
+            expires_at=datetime.fromisoformat(fields["expires_at"]),
+            created_at=datetime.fromisoformat(fields["created_at"])
+        )
+        approval_request.status = ApprovalStatus[fields["status"]]
+        approval_request.approved_by = fields["approved_by"]
+        if fields["approved_at"] is not None:
+            approval_request.approved_at = datetime.fromisoformat(fields["approved_at"])
+        approval_request.rejection_reason = fields["rejection_reason"]
+        return approval_request
 
 
 class ApprovalManager:
-    """Manages approval workflows for operational requests"""
+    """
+    Manages approval workflows for operational requests
+    
+    With a ``store``, every state change is also queued for persistence and
+    lookups by request ID fall back to the store on a cache miss, so
+    requests survive restarts and are visible to other managers sharing the
+    store. Without one, requests live only in this manager. Pending lists
+    only cover requests this manager has created or loaded.
+    
+    Notifications go through ``notifier`` (the shared process-wide one by
+    default) and are delivered off the calling thread.
     
-    def __init__(self):
+    Memory is bounded by two LRU caches: pending requests in
+    ``approval_requests`` (``capacity``) and decided or expired ones in a
+    smaller archive (``archive_capacity``). With a store, a pending request
+    evicted from memory leaves the approver index too and is reloaded on
+    its next lookup by ID. Without one, pending requests are never evicted:
+    create_approval_request raises ApprovalCapacityError once ``capacity``
+    requests are pending.
+    """
+    
+    def __init__(
+        self,
+        store: Optional[ApprovalStore] = None,
+        notifier: Optional[Notifier] = None,
+        capacity: int = APPROVAL_CACHE_CAPACITY,
+        archive_capacity: int = APPROVAL_ARCHIVE_CAPACITY
+    ):
         # Approval policies by risk level
         self.approval_policies = {
             "LOW": {
@@ -63,8 +164,32 @@ class ApprovalManager:
             }
         }
         
-        # In-memory storage for demo (TODO: use persistent storage)
-        self.approval_requests = {}
+        # Hot cache of pending requests and archive of finished ones; the
+        # store, if any, is the durable copy
+        self.approval_requests: "OrderedDict[str, ApprovalRequest]" = OrderedDict()
+        self._archive: "OrderedDict[str, ApprovalRequest]" = OrderedDict()
+        self.capacity = capacity
+        # Capacity warning is printed once each time memory fills up
+        self._capacity_warned = False
+        self.archive_capacity = archive_capacity
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.store = store
+        self.notifier = notifier or get_default_notifier()
+        
+        # Pending requests per approver, ordered by expiry
+        self._pending_by_approver: Dict[str, SortedKeyList] = defaultdict(
+            lambda: SortedKeyList(key=lambda request: request.expires_at)
+        )
+        
+        # (expires_at, request_id) min-heap swept before reads; entries for
+        # requests already decided or replaced are skipped when popped
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+        
+        # Serialized status responses: request_id -> ((status, approved_at), body).
+        # An entry is only served while the request is still in that state.
+        self._status_bodies: "OrderedDict[str, Tuple[Tuple[ApprovalStatus, Optional[datetime]], bytes]]" = OrderedDict()
     
     def create_approval_request(
         self,
@@ -94,7 +219,8 @@ class ApprovalManager:
         eligible_approvers = self._get_eligible_approvers(risk_level, environment)
         
         # Calculate expiration time
-        expires_at = datetime.utcnow() + timedelta(hours=policy["timeout_hours"])
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=policy["timeout_hours"])
         
         # Create approval request
         approval_request = ApprovalRequest(
@@ -103,11 +229,32 @@ class ApprovalManager:
             risk_level=risk_level,
             requester=requester,
             approvers=eligible_approvers,
-            expires_at=expires_at
+            expires_at=expires_at,
+            created_at=now
         )
         
-        # Store request
-        self.approval_requests[request_id] = approval_request
+        # Without a store an evicted pending request would be lost, so
+        # refuse new work once memory is full of pending requests
+        if self.store is None and request_id not in self.approval_requests:
+            self._sweep_expired(now)
+            if len(self.approval_requests) >= self.capacity:
+                if not self._capacity_warned:
+                    print(
+                        f"WARNING: {self.capacity} approvals pending in memory; refusing new approval "
+                        f"requests. Set APPROVAL_STORE_PATH to persist approvals at this volume."
+                    )
+                    self._capacity_warned = True
+                raise ApprovalCapacityError(
+                    f"Approval capacity reached: {self.capacity} requests pending and no approval store configured"
+                )
+            self._capacity_warned = False
+        
+        # Store request, replacing any earlier request with the same ID
+        previous = self.approval_requests.get(request_id)
+        if previous is not None and previous.status is ApprovalStatus.PENDING:
+            self._remove_from_pending(previous)
+        self._track(approval_request)
+        self._persist(approval_request)
         
         # TODO: Send notifications to approvers
         self._notify_approvers(approval_request)
@@ -124,15 +271,8 @@ class ApprovalManager:
         3. Handle partial approvals
         4. Check for policy changes
         """
-        approval_request = self.approval_requests.get(request_id)
-        
-        if not approval_request:
-            return None
-        
-        # Check for expiration
-        if datetime.utcnow() > approval_request.expires_at and approval_request.status == ApprovalStatus.PENDING:
-            approval_request.status = ApprovalStatus.EXPIRED
-        
+        approval_request = self._get_request(request_id)
+        self._sweep_expired()
         return approval_request
     
     def approve_request(self, request_id: str, approver: str, comments: str = "") -> bool:
@@ -146,24 +286,23 @@ class ApprovalManager:
         4. Send notifications
         5. Trigger execution if fully approved
         """
-        approval_request = self.approval_requests.get(request_id)
+        now = datetime.utcnow()
+        approval_request = self._get_request(request_id)
+        self._sweep_expired(now)
         
-        if not approval_request or approval_request.status != ApprovalStatus.PENDING:
+        if not approval_request or approval_request.status is not ApprovalStatus.PENDING:
             return False
         
         # Check if approver is eligible
         if approver not in approval_request.approvers:
             return False
         
-        # Check if expired
-        if datetime.utcnow() > approval_request.expires_at:
-            approval_request.status = ApprovalStatus.EXPIRED
-            return False
-        
         # Approve the request
         approval_request.status = ApprovalStatus.APPROVED
+        self._retire(approval_request)
         approval_request.approved_by = approver
-        approval_request.approved_at = datetime.utcnow()
+        approval_request.approved_at = now
+        self._persist(approval_request)
         
         # TODO: Send approval notifications
         self._notify_approval_decision(approval_request, "APPROVED", comments)
@@ -180,9 +319,10 @@ class ApprovalManager:
         3. Send notifications
         4. Handle appeals process
         """
-        approval_request = self.approval_requests.get(request_id)
+        approval_request = self._get_request(request_id)
+        self._sweep_expired()
         
-        if not approval_request or approval_request.status != ApprovalStatus.PENDING:
+        if not approval_request or approval_request.status is not ApprovalStatus.PENDING:
             return False
         
         # Check if approver is eligible
@@ -191,14 +331,134 @@ class ApprovalManager:
         
         # Reject the request
         approval_request.status = ApprovalStatus.REJECTED
+        self._retire(approval_request)
         approval_request.rejection_reason = reason
+        self._persist(approval_request)
         
         # TODO: Send rejection notifications
         self._notify_approval_decision(approval_request, "REJECTED", reason)
         
         return True
     
-    def _get_eligible_approvers(self, risk_level: str, environment: str) -> List[str]:
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Return hit/miss/eviction counters for the in-memory caches"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "size": len(self.approval_requests),
+            "capacity": self.capacity,
+            "archive_size": len(self._archive),
+            "archive_capacity": self.archive_capacity
+        }
+    
+    def get_status_body(self, approval_request: ApprovalRequest) -> Optional[bytes]:
+        """Return the status response cached for the request's current state, if any"""
+        entry = self._status_bodies.get(approval_request.request_id)
+        if entry is None or entry[0] != (approval_request.status, approval_request.approved_at):
+            return None
+        self._status_bodies.move_to_end(approval_request.request_id)
+        return entry[1]
+    
+    def cache_status_body(self, approval_request: ApprovalRequest, body: bytes):
+        """Remember a serialized status response until the request changes state"""
+        self._status_bodies[approval_request.request_id] = (
+            (approval_request.status, approval_request.approved_at),
+            body
+        )
+        self._status_bodies.move_to_end(approval_request.request_id)
+        while len(self._status_bodies) > self.capacity + self.archive_capacity:
+            self._status_bodies.popitem(last=False)
+    
+    def _get_request(self, request_id: str) -> Optional[ApprovalRequest]:
+        """Look up a request in the caches, then in the store"""
+        approval_request = self.approval_requests.get(request_id)
+        if approval_request is not None:
+            self.approval_requests.move_to_end(request_id)
+            self._hits += 1
+            return approval_request
+        
+        approval_request = self._archive.get(request_id)
+        if approval_request is not None:
+            self._archive.move_to_end(request_id)
+            self._hits += 1
+            return approval_request
+        
+        self._misses += 1
+        if self.store is None:
+            return None
+        
+        data = self.store.get(request_id)
+        if data is None:
+            return None
+        
+        approval_request = ApprovalRequest.from_json(data)
+        self._track(approval_request)
+        return approval_request
+    
+    def _track(self, approval_request: ApprovalRequest):
+        """Cache a request, indexing it if still pending"""
+        if approval_request.status is not ApprovalStatus.PENDING:
+            self._archive_request(approval_request)
+            return
+        
+        request_id = approval_request.request_id
+        self._archive.pop(request_id, None)
+        self.approval_requests[request_id] = approval_request
+        self.approval_requests.move_to_end(request_id)
+        for approver in approval_request.approvers:
+            self._pending_by_approver[approver].add(approval_request)
+        heapq.heappush(self._expiry_heap, (approval_request.expires_at, request_id))
+        
+        # Only requests the store can reload are evicted
+        while self.store is not None and len(self.approval_requests) > self.capacity:
+            _, evicted = self.approval_requests.popitem(last=False)
+            self._evictions += 1
+            self._remove_from_pending(evicted)
+    
+    def _retire(self, approval_request: ApprovalRequest):
+        """Move a request that is no longer pending out of the hot cache"""
+        self._remove_from_pending(approval_request)
+        self.approval_requests.pop(approval_request.request_id, None)
+        self._archive_request(approval_request)
+    
+    def _archive_request(self, approval_request: ApprovalRequest):
+        self._archive[approval_request.request_id] = approval_request
+        self._archive.move_to_end(approval_request.request_id)
+        while len(self._archive) > self.archive_capacity:
+            self._archive.popitem(last=False)
+            self._evictions += 1
+    
+    def _persist(self, approval_request: ApprovalRequest):
+        """Queue the request's current state for the store"""
+        if self.store is not None:
+            self.store.put(approval_request.request_id, approval_request.to_json())
+    
+    def _sweep_expired(self, now: Optional[datetime] = None):
+        """Expire every pending request whose deadline has passed by ``now``"""
+        if now is None:
+            now = datetime.utcnow()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, request_id = heapq.heappop(heap)
+            approval_request = self.approval_requests.get(request_id)
+            if (approval_request is not None and
+                approval_request.status is ApprovalStatus.PENDING and
+                approval_request.expires_at < now):
+                approval_request.status = ApprovalStatus.EXPIRED
+                self._retire(approval_request)
+                self._persist(approval_request)
+    
+    def _remove_from_pending(self, approval_request: ApprovalRequest):
+        """Remove a request from every approver's pending index"""
+        for approver in approval_request.approvers:
+            bucket = self._pending_by_approver.get(approver)
+            if bucket is not None:
+                bucket.discard(approval_request)
+    
+    def _get_eligible_approvers(self, risk_level: str, environment: str) -> Set[str]:
         """
         Determine eligible approvers based on risk and environment
         
@@ -209,15 +469,16 @@ class ApprovalManager:
         4. Consider timezone and working hours
         """
         policy = self.approval_policies.get(risk_level, self.approval_policies["HIGH"])
-        base_approvers = policy.get("eligible_approvers", ["ops_manager"])
+        # Copy into a fresh set so the policy's own list is never mutated
+        approvers = set(policy.get("eligible_approvers", ("ops_manager",)))
         
         # Environment-specific approvers
         if environment == "prod":
             # Production requires higher-level approval
-            if risk_level in ["HIGH", "CRITICAL"]:
-                base_approvers.extend(["cto", "vp_engineering"])
+            if risk_level in ("HIGH", "CRITICAL"):
+                approvers.update(("cto", "vp_engineering"))
         
-        return list(set(base_approvers))  # Remove duplicates
+        return approvers
     
     def _notify_approvers(self, approval_request: ApprovalRequest):
         """
@@ -230,12 +491,14 @@ class ApprovalManager:
         4. Set up mobile push notifications
         5. Handle notification preferences
         """
-        print(f"🔔 Approval needed for request {approval_request.request_id}")
-        print(f"   Operation: {approval_request.operation_summary}")
-        print(f"   Risk Level: {approval_request.risk_level}")
-        print(f"   Requester: {approval_request.requester}")
-        print(f"   Approvers: {', '.join(approval_request.approvers)}")
-        print(f"   Expires: {approval_request.expires_at}")
+        self.notifier.send("approval_needed", {
+            "request_id": approval_request.request_id,
+            "operation_summary": approval_request.operation_summary,
+            "risk_level": approval_request.risk_level,
+            "requester": approval_request.requester,
+            "approvers": sorted(approval_request.approvers),
+            "expires_at": approval_request.expires_at
+        })
     
     def _notify_approval_decision(self, approval_request: ApprovalRequest, decision: str, comments: str):
         """
@@ -247,9 +510,12 @@ class ApprovalManager:
         3. Trigger next steps if approved
         4. Log decision for audit trail
         """
-        print(f"✅ Request {approval_request.request_id} {decision}")
-        print(f"   Decision by: {approval_request.approved_by}")
-        print(f"   Comments: {comments}")
+        self.notifier.send("decision", {
+            "request_id": approval_request.request_id,
+            "decision": decision,
+            "decided_by": approval_request.approved_by,
+            "comments": comments
+        })
     
     def get_pending_approvals(self, approver: str) -> List[ApprovalRequest]:
         """
@@ -260,12 +526,20 @@ class ApprovalManager:
         2. Sort by priority and expiration
         3. Include operation context
         4. Show approval history
+        
+        Reads the approver's index, which is already ordered by expiry.
+        """
+        self._sweep_expired()
+        return list(self._pending_by_approver.get(approver, ()))
+    
+    def get_pending_approvals_bulk(self, approvers: Iterable[str]) -> Dict[str, List[ApprovalRequest]]:
+        """
+        Get pending approval requests for several approvers at once
+        
+        Expiry is swept once for the whole batch, then each approver's list
+        is read from the index, ordered by expiration as in
+        get_pending_approvals.
         """
-        pending = []
-        for request in self.approval_requests.values():
-            if (request.status == ApprovalStatus.PENDING and 
-                approver in request.approvers and
-                datetime.utcnow() <= request.expires_at):
-                pending.append(request)
-        
-        return sorted(pending, key=lambda x: x.expires_at)
+        self._sweep_expired()
+        pending = self._pending_by_approver
+        return {approver: list(pending.get(approver, ())) for approver in approvers}
@@ -0,0 +1,121 @@
+"""
+Approval Store - Write-behind SQLite persistence for approval requests
+"""
+import atexit
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# How long the writer waits after the first queued write to gather a batch
+APPROVAL_FLUSH_INTERVAL_SECONDS = 0.05
+
+
+class ApprovalStore:
+    """
+    Persists serialized approval requests by request ID
+    
+    ``put`` only records the row in memory and wakes a background writer,
+    so callers never wait on disk. The writer flushes everything queued
+    since its last pass in one transaction; repeated writes to the same ID
+    before a flush collapse into the latest. ``get`` serves rows that are
+    still queued before reading the database, so a write is visible as soon
+    as ``put`` returns. ``close`` (also run at interpreter exit) stops the
+    writer and flushes whatever is still queued.
+    
+    TODO: Swap SQLite for a shared store (Redis, DynamoDB) when running
+    more than one server process
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = APPROVAL_FLUSH_INTERVAL_SECONDS
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the writer thread and readers, guarded by _db_lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS approvals ("
+            "request_id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+        )
+        self._db.commit()
+        self._db_lock = threading.Lock()
+        
+        # Rows not yet written, guarded by _pending_lock
+        self._pending: Dict[str, bytes] = {}
+        self._pending_lock = threading.Lock()
+        
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="approval-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+    
+    def put(self, request_id: str, data: bytes):
+        """Queue a row for writing"""
+        with self._pending_lock:
+            self._pending[request_id] = data
+        self._wake.set()
+    
+    def get(self, request_id: str) -> Optional[bytes]:
+        """Return the latest row for a request ID, queued or written"""
+        with self._pending_lock:
+            data = self._pending.get(request_id)
+        if data is not None:
+            return data
+        
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT data FROM approvals WHERE request_id = ?", (request_id,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def flush(self):
+        """Write every queued row in a single transaction"""
+        with self._db_lock:
+            with self._pending_lock:
+                batch = list(self._pending.items())
+            if not batch:
+                return
+            
+            self._db.executemany(
+                "INSERT OR REPLACE INTO approvals (request_id, data) VALUES (?, ?)", batch
+            )
+            self._db.commit()
+            
+            # Keep rows that were rewritten while this batch was in flight
+            with self._pending_lock:
+                for request_id, data in batch:
+                    if self._pending.get(request_id) is data:
+                        del self._pending[request_id]
+    
+    def close(self):
+        """Stop the writer after a final flush"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        with self._db_lock:
+            self._db.close()
+    
+    def _run(self):
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Let writes arriving right behind this one join the batch
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # Rows stay queued and are retried on the next wake-up
+                print(f"Approval store flush failed: {e}")
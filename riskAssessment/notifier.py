@@ -0,0 +1,112 @@
+"""
+Notifier - Background delivery of approval notifications
+"""
+import atexit
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Most events handed to the transport in one call
+NOTIFY_BATCH_SIZE = 100
+
+
+class NotifyEvent:
+    """A notification waiting to be delivered"""
+    __slots__ = ("kind", "payload")
+    
+    def __init__(self, kind: str, payload: Dict[str, Any]):
+        self.kind = kind  # "approval_needed" or "decision"
+        self.payload = payload
+
+
+def format_event(event: NotifyEvent) -> str:
+    """Render an event as console text"""
+    p = event.payload
+    if event.kind == "approval_needed":
+        return (
+            f"🔔 Approval needed for request {p['request_id']}\n"
+            f"   Operation: {p['operation_summary']}\n"
+            f"   Risk Level: {p['risk_level']}\n"
+            f"   Requester: {p['requester']}\n"
+            f"   Approvers: {', '.join(p['approvers'])}\n"
+            f"   Expires: {p['expires_at']}"
+        )
+    return (
+        f"✅ Request {p['request_id']} {p['decision']}\n"
+        f"   Decision by: {p['decided_by']}\n"
+        f"   Comments: {p['comments']}"
+    )
+
+
+def print_transport(events: List[NotifyEvent]):
+    """Default transport: write the whole batch to stdout at once"""
+    print("\n".join(format_event(event) for event in events))
+
+
+class Notifier:
+    """
+    Delivers notification events from a background thread
+    
+    ``send`` only enqueues, so approval calls never wait on delivery. The
+    worker hands everything queued since its last pass to ``transport`` in
+    one call, so a burst of approvals costs one write.
+    
+    TODO: Add Slack / email transports
+    """
+    
+    def __init__(self, transport: Callable[[List[NotifyEvent]], None] = print_transport):
+        self.transport = transport
+        self._queue: "queue.SimpleQueue[Optional[NotifyEvent]]" = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._run, name="approval-notifier", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+    
+    def send(self, kind: str, payload: Dict[str, Any]):
+        """Queue an event for delivery"""
+        self._queue.put(NotifyEvent(kind, payload))
+    
+    def close(self):
+        """Deliver queued events and stop the worker"""
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+    
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            
+            batch = [event]
+            stopping = False
+            while len(batch) < NOTIFY_BATCH_SIZE:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+            
+            try:
+                self.transport(batch)
+            except Exception as e:
+                print(f"Notification delivery failed: {e}")
+            
+            if stopping:
+                return
+
+
+_default_notifier: Optional[Notifier] = None
+_default_notifier_lock = threading.Lock()
+
+
+def get_default_notifier() -> Notifier:
+    """Return the process-wide notifier, starting it on first use"""
+    global _default_notifier
+    with _default_notifier_lock:
+        if _default_notifier is None:
+            _default_notifier = Notifier()
+        return _default_notifier
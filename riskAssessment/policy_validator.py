@@ -1,13 +1,33 @@
 """
 Policy Validator - Validates operations against organizational policies
 """
-from typing import Dict, Any, List, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, List, Mapping, Optional, Tuple
+from datetime import datetime
+from types import MappingProxyType
 from models import OperationalRequest, ClassificationResult
 from planGeneration.plan_generator import OperationalPlan
+from .risk_engine import RiskLevel
+
+
+# User ID fragments granting production access
+_PROD_ROLE_RE = re.compile(r"(?:ops|admin|engineer)", re.IGNORECASE)
+
+# Violation severities that block an operation
+_BLOCKING_SEVERITIES = frozenset(("ERROR", "CRITICAL"))
+
+# Request validation results remembered per validator
+POLICY_CACHE_SIZE = 1024
+POLICY_CACHE_TTL_SECONDS = 60.0
 
 
 class PolicyViolation:
     """Represents a policy violation"""
+    __slots__ = ("policy_name", "violation_type", "description", "severity")
+    
     def __init__(self, policy_name: str, violation_type: str, description: str, severity: str):
         self.policy_name = policy_name
         self.violation_type = violation_type
@@ -16,13 +36,25 @@ class PolicyViolation:
 
 
 class PolicyValidationResult:
-    """Result of policy validation"""
+    """
+    Result of policy validation
+    
+    Immutable (tuples and a read-only mapping), so cached results can be
+    handed to several callers.
+    """
+    __slots__ = ("allowed", "violations", "constraints", "warnings")
+    
     def __init__(self, allowed: bool, violations: List[PolicyViolation], 
-                 constraints: Dict[str, Any], warnings: List[str]):
-        self.allowed = allowed
-        self.violations = violations
-        self.constraints = constraints
-        self.warnings = warnings
+                 constraints: Mapping[str, Any], warnings: List[str]):
+        if not isinstance(constraints, MappingProxyType):
+            constraints = MappingProxyType(dict(constraints))
+        object.__setattr__(self, "allowed", allowed)
+        object.__setattr__(self, "violations", tuple(violations))
+        object.__setattr__(self, "constraints", constraints)
+        object.__setattr__(self, "warnings", tuple(warnings))
+    
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("PolicyValidationResult is immutable")
 
 
 class PolicyValidator:
@@ -77,6 +109,17 @@ class PolicyValidator:
                 "notification_required": False
             }
         }
+        
+        # Constraints depend only on the environment, so build each once
+        self._constraint_templates = {
+            environment: self._build_constraint_template(env_policy)
+            for environment, env_policy in self.environment_policies.items()
+        }
+        
+        # validate_request results: key -> (expires at, result)
+        self._result_cache: "OrderedDict[Tuple[Hashable, ...], Tuple[float, PolicyValidationResult]]" = OrderedDict()
+        # validate_request may run on worker threads (asyncio.to_thread)
+        self._cache_lock = threading.Lock()
     
     def validate_request(
         self,
@@ -93,38 +136,80 @@ class PolicyValidator:
         3. Verify change management process
         4. Check maintenance windows and blackout periods
         5. Validate business justification
+        
+        Results are cached for POLICY_CACHE_TTL_SECONDS per user,
+        environment, task, whether a business justification was given and
+        wall-clock hour (the time policies only look at hour and weekday);
+        call invalidate(user_id) when a user's permissions change.
         """
+        requested_at = datetime.now()
+        key = (
+            request.user_id,
+            request.environment,
+            classification.task_id,
+            bool(request.context.get("business_justification")),
+            requested_at.replace(minute=0, second=0, microsecond=0)
+        )
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None and cached[0] > now:
+                self._result_cache.move_to_end(key)
+                return cached[1]
+        
+        result = self._validate_request_uncached(request, classification, requested_at)
+        with self._cache_lock:
+            self._result_cache[key] = (now + POLICY_CACHE_TTL_SECONDS, result)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > POLICY_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return result
+    
+    def invalidate(self, user_id: str):
+        """Drop cached validation results for a user"""
+        with self._cache_lock:
+            for key in [key for key in self._result_cache if key[0] == user_id]:
+                del self._result_cache[key]
+    
+    def _validate_request_uncached(
+        self,
+        request: OperationalRequest,
+        classification: ClassificationResult,
+        requested_at: Optional[datetime] = None
+    ) -> PolicyValidationResult:
+        """Run every request policy check"""
         violations = []
         warnings = []
-        constraints = {}
-        
-        # Get environment policy
-        env_policy = self.environment_policies.get(request.environment, self.environment_policies["prod"])
         
-        # Validate environment-specific requirements
-        if request.environment == "prod":
-            # Production requires special handling
-            if not self._has_production_access(request.user_id):
-                violations.append(PolicyViolation(
+        # Validate environment-specific requirements. Without production
+        # access the operation is ruled out, so the remaining checks are
+        # skipped and only this violation is reported.
+        if request.environment == "prod" and not self._has_production_access(request.user_id):
+            return PolicyValidationResult(
+                allowed=False,
+                violations=[PolicyViolation(
                     policy_name="production_access",
                     violation_type="AUTHORIZATION",
                     description=f"User {request.user_id} does not have production access",
                     severity="ERROR"
-                ))
+                )],
+                constraints={},
+                warnings=[]
+            )
         
         # Validate task-specific policies
         task_violations = self._validate_task_policies(classification, request)
         violations.extend(task_violations)
         
         # Check time-based policies
-        time_warnings = self._validate_time_policies(request)
+        time_warnings = self._validate_time_policies(request, requested_at)
         warnings.extend(time_warnings)
         
         # Build constraints from policies
-        constraints = self._build_policy_constraints(env_policy, classification)
+        constraints = self._build_policy_constraints(request.environment)
         
         # Determine if operation is allowed
-        allowed = len([v for v in violations if v.severity in ["ERROR", "CRITICAL"]]) == 0
+        allowed = not any(v.severity in _BLOCKING_SEVERITIES for v in violations)
         
         return PolicyValidationResult(
             allowed=allowed,
@@ -172,7 +257,7 @@ class PolicyValidator:
                 severity="ERROR"
             ))
         
-        allowed = len([v for v in violations if v.severity in ["ERROR", "CRITICAL"]]) == 0
+        allowed = not any(v.severity in _BLOCKING_SEVERITIES for v in violations)
         
         return PolicyValidationResult(
             allowed=allowed,
@@ -192,7 +277,7 @@ class PolicyValidator:
         4. Check for temporary access grants
         """
         # Placeholder: allow ops and admin users
-        return any(role in user_id.lower() for role in ["ops", "admin", "engineer"])
+        return _PROD_ROLE_RE.search(user_id) is not None
     
     def _validate_task_policies(
         self, 
@@ -214,16 +299,20 @@ class PolicyValidator:
         
         return violations
     
-    def _validate_time_policies(self, request: OperationalRequest) -> List[str]:
+    def _validate_time_policies(
+        self,
+        request: OperationalRequest,
+        now: Optional[datetime] = None
+    ) -> List[str]:
         """Validate time-based policies"""
         warnings = []
         
-        from datetime import datetime
-        now = datetime.now()
-        hour = now.hour
+        # One clock read serves both the hour and weekday checks
+        if now is None:
+            now = datetime.now()
         
         # Check business hours
-        if request.environment == "prod" and not (9 <= hour <= 17):
+        if request.environment == "prod" and not (9 <= now.hour <= 17):
             warnings.append("Production operation requested outside business hours")
         
         # Check weekend operations
@@ -246,14 +335,21 @@ class PolicyValidator:
     
     def _risk_exceeds_limit(self, plan_risk: str, max_risk: str) -> bool:
         """Check if plan risk exceeds environment limit"""
-        risk_levels = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
-        return risk_levels.get(plan_risk, 4) > risk_levels.get(max_risk, 3)
+        # Unknown plan levels count as CRITICAL, unknown limits as HIGH
+        levels = RiskLevel.__members__
+        return levels.get(plan_risk, RiskLevel.CRITICAL) > levels.get(max_risk, RiskLevel.HIGH)
     
-    def _build_policy_constraints(
-        self, 
-        env_policy: Dict[str, Any], 
-        classification: ClassificationResult
-    ) -> Dict[str, Any]:
+    def _build_policy_constraints(self, environment: str) -> Mapping[str, Any]:
+        """
+        Return the read-only constraints for an environment
+        
+        Unknown environments get the prod constraints, matching the
+        environment policy fallback.
+        """
+        return self._constraint_templates.get(environment, self._constraint_templates["prod"])
+    
+    @staticmethod
+    def _build_constraint_template(env_policy: Dict[str, Any]) -> Mapping[str, Any]:
         """Build constraints from policy requirements"""
         constraints = {
             "api_only": True,
@@ -264,4 +360,4 @@ class PolicyValidator:
             "max_risk_level": env_policy.get("max_risk_level", "HIGH")
         }
         
-        return constraints
+        return MappingProxyType(constraints)
@@ -1,21 +1,49 @@
 """
 Risk Engine - Calculates operational risk based on multiple factors
 """
-from typing import Dict, Any, List
-from enum import Enum
+import re
+from bisect import bisect_left
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple, Union
+from enum import IntEnum
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 from models import OperationalRequest, ClassificationResult, TaskId
+from planGeneration.plan_generator import OperationalPlan
 
 
-class RiskLevel(str, Enum):
-    """Risk levels for operations"""
-    LOW = "LOW"
-    MEDIUM = "MEDIUM"
-    HIGH = "HIGH"
-    CRITICAL = "CRITICAL"
+# Timing risk by hour of day: night 0-5 and 23, extended hours 6-8 and
+# 18-22, business hours 9-17 (inclusive)
+_HOUR_RISK = (0.8,) * 6 + (0.5,) * 3 + (0.2,) * 9 + (0.5,) * 5 + (0.8,) * 1
+
+# User risk by role fragment in the user ID; the lowest matching risk wins
+# and IDs without a known role score _UNKNOWN_USER_RISK
+_USER_TIER_RE = re.compile(r"(admin|ops|engineer)", re.IGNORECASE)
+_USER_TIER_RISK = {"admin": 0.2, "ops": 0.2, "engineer": 0.4}
+_UNKNOWN_USER_RISK = 0.7
+
+# Weights of the factors that vary per request
+_TIME_RISK_WEIGHT = 0.5
+_USER_RISK_WEIGHT = 1.0
+
+
+class RiskLevel(IntEnum):
+    """
+    Risk levels for operations
+    
+    Integer-backed so levels compare by severity; use ``.name`` for the
+    string form ("LOW", "MEDIUM", ...).
+    """
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
 
 
 class RiskFactor:
     """Represents a risk factor with weight and score"""
+    __slots__ = ("name", "score", "weight", "description")
+    
     def __init__(self, name: str, score: float, weight: float, description: str):
         self.name = name
         self.score = score  # 0.0 to 1.0
@@ -23,15 +51,99 @@ class RiskFactor:
         self.description = description
 
 
+# (name, score, weight, description), the arguments of RiskFactor
+FactorEntry = Tuple[str, float, float, str]
+
+
 class RiskAssessment:
-    """Complete risk assessment result"""
-    def __init__(self, risk_level: RiskLevel, score: float, factors: List[RiskFactor], 
-                 requires_approval: bool, constraints: Dict[str, Any]):
+    """
+    Complete risk assessment result
+    
+    ``factors`` may be given as RiskFactor objects or as plain
+    (name, score, weight, description) tuples; tuples are only turned into
+    RiskFactor objects when ``factors`` is first read.
+    """
+    __slots__ = (
+        "risk_level",
+        "score",
+        "_factor_entries",
+        "_factors",
+        "requires_approval",
+        "constraints"
+    )
+    
+    def __init__(self, risk_level: RiskLevel, score: float,
+                 factors: Iterable[Union[RiskFactor, FactorEntry]],
+                 requires_approval: bool, constraints: Mapping[str, Any]):
         self.risk_level = risk_level
         self.score = score
-        self.factors = factors
+        self._factor_entries = factors
+        self._factors: Optional[List[RiskFactor]] = None
         self.requires_approval = requires_approval
         self.constraints = constraints
+    
+    @property
+    def factors(self) -> List[RiskFactor]:
+        if self._factors is None:
+            self._factors = [
+                entry if isinstance(entry, RiskFactor) else RiskFactor(*entry)
+                for entry in self._factor_entries
+            ]
+        return self._factors
+
+
+@lru_cache(maxsize=128)
+def _requires_approval_cached(risk_level: RiskLevel, environment: str, task_id: TaskId) -> bool:
+    """Approval requirement for a (risk level, environment, task) combination"""
+    # Production always requires approval for medium+ risk
+    if environment == "prod" and risk_level >= RiskLevel.MEDIUM:
+        return True
+    
+    # High and critical risk always require approval
+    if risk_level >= RiskLevel.HIGH:
+        return True
+    
+    # Specific task requirements
+    if task_id == TaskId.CANCEL_CASE and environment in ["staging", "prod"]:
+        return True
+    
+    return False
+
+
+@lru_cache(maxsize=128)
+def _build_constraints_cached(risk_level: RiskLevel, environment: str, task_id: TaskId) -> Mapping[str, Any]:
+    """
+    Constraints for a (risk level, environment, task) combination
+    
+    The inputs come from small fixed sets, so each combination is built
+    once and shared as a read-only mapping.
+    """
+    constraints = {
+        "api_only": True,  # Always use APIs, never direct DB access
+        "max_retries": 3,
+        "timeout_minutes": 30,
+        "rollback_required": risk_level >= RiskLevel.HIGH,
+        "monitoring_required": risk_level > RiskLevel.LOW,
+        "notification_required": risk_level >= RiskLevel.HIGH
+    }
+    
+    # Environment-specific constraints
+    if environment == "prod":
+        constraints.update({
+            "max_retries": 1,  # Be more careful in prod
+            "timeout_minutes": 15,  # Shorter timeout in prod
+            "backup_required": True,
+            "approval_timeout_hours": 24
+        })
+    
+    # Task-specific constraints
+    if task_id == TaskId.CANCEL_CASE:
+        constraints.update({
+            "confirmation_required": True,
+            "audit_trail_required": True
+        })
+    
+    return MappingProxyType(constraints)
 
 
 class RiskEngine:
@@ -62,12 +174,21 @@ class RiskEngine:
             RiskLevel.HIGH: 0.8,
             RiskLevel.CRITICAL: 1.0
         }
+        
+        # Upper bounds (inclusive) of every level below CRITICAL, for bisect
+        self._threshold_levels = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+        self._threshold_bounds = tuple(self.risk_thresholds[level] for level in self._threshold_levels[:-1])
+        
+        # Environment and task factor entries per (environment, task_id),
+        # with their weighted score and weight sums; both come from small
+        # validated sets, so this stays tiny
+        self._static_factors: Dict[Tuple[str, TaskId], Tuple[FactorEntry, FactorEntry, float, float]] = {}
     
     def assess_risk(
         self,
         request: OperationalRequest,
         classification: ClassificationResult,
-        plan_data: Dict[str, Any] = None
+        plan: Optional[OperationalPlan] = None
     ) -> RiskAssessment:
         """
         Perform comprehensive risk assessment
@@ -80,48 +201,38 @@ class RiskEngine:
         5. Assess data sensitivity and compliance requirements
         """
         
-        risk_factors = []
-        
-        # Environment risk factor
-        env_risk = self.environment_risk.get(request.environment, 0.5)
-        risk_factors.append(RiskFactor(
-            name="Environment Risk",
-            score=env_risk,
-            weight=2.0,
-            description=f"Risk associated with {request.environment} environment"
-        ))
-        
-        # Task type risk factor
-        task_risk = self.task_risk.get(classification.task_id, 0.5)
-        risk_factors.append(RiskFactor(
-            name="Task Complexity",
-            score=task_risk,
-            weight=1.5,
-            description=f"Risk associated with {classification.task_id} operation"
-        ))
-        
-        # Time-based risk factor
+        # Environment and task factors depend only on (environment, task_id)
+        key = (request.environment, classification.task_id)
+        static_factors = self._static_factors.get(key)
+        if static_factors is None:
+            static_factors = self._static_factors[key] = self._build_static_factors(*key)
+        env_factor, task_factor, static_weighted_score, static_weight = static_factors
+        
         time_risk = self._calculate_time_risk()
-        risk_factors.append(RiskFactor(
-            name="Timing Risk",
-            score=time_risk,
-            weight=0.5,
-            description="Risk based on current time and business hours"
-        ))
-        
-        # User experience risk factor
         user_risk = self._calculate_user_risk(request.user_id)
-        risk_factors.append(RiskFactor(
-            name="User Experience",
-            score=user_risk,
-            weight=1.0,
-            description="Risk based on user's operational experience"
-        ))
-        
-        # Calculate overall risk score
-        total_weighted_score = sum(factor.score * factor.weight for factor in risk_factors)
-        total_weight = sum(factor.weight for factor in risk_factors)
-        overall_score = total_weighted_score / total_weight
+        
+        # Factors are kept as (name, score, weight, description) tuples;
+        # RiskAssessment only builds RiskFactor objects if they are read
+        risk_factors: List[FactorEntry] = [
+            env_factor,
+            task_factor,
+            # Time-based risk factor
+            ("Timing Risk",
+             time_risk,
+             _TIME_RISK_WEIGHT,
+             "Risk based on current time and business hours"),
+            # User experience risk factor
+            ("User Experience",
+             user_risk,
+             _USER_RISK_WEIGHT,
+             "Risk based on user's operational experience"),
+        ]
+        
+        # Overall score is the weighted mean of the factors; the static
+        # factors' share is precomputed, so only two terms are added here
+        overall_score = (
+            static_weighted_score + time_risk * _TIME_RISK_WEIGHT + user_risk * _USER_RISK_WEIGHT
+        ) / (static_weight + _TIME_RISK_WEIGHT + _USER_RISK_WEIGHT)
         
         # Determine risk level
         risk_level = self._score_to_risk_level(overall_score)
@@ -140,6 +251,28 @@ class RiskEngine:
             constraints=constraints
         )
     
+    def _build_static_factors(
+        self,
+        environment: str,
+        task_id: TaskId
+    ) -> Tuple[FactorEntry, FactorEntry, float, float]:
+        """Build the environment and task factor entries and their weighted sums"""
+        env_factor = (
+            "Environment Risk",
+            self.environment_risk.get(environment, 0.5),
+            2.0,
+            f"Risk associated with {environment} environment"
+        )
+        task_factor = (
+            "Task Complexity",
+            self.task_risk.get(task_id, 0.5),
+            1.5,
+            f"Risk associated with {task_id} operation"
+        )
+        weighted_score = env_factor[1] * env_factor[2] + task_factor[1] * task_factor[2]
+        weight = env_factor[2] + task_factor[2]
+        return env_factor, task_factor, weighted_score, weight
+    
     def _calculate_time_risk(self) -> float:
         """
         Calculate risk based on current time
@@ -150,18 +283,8 @@ class RiskEngine:
         3. Evaluate weekend/holiday risk
         4. Check system load patterns
         """
-        from datetime import datetime
-        
-        now = datetime.now()
-        hour = now.hour
-        
         # Higher risk outside business hours (9 AM - 5 PM)
-        if 9 <= hour <= 17:
-            return 0.2  # Low risk during business hours
-        elif 6 <= hour <= 9 or 17 <= hour <= 22:
-            return 0.5  # Medium risk during extended hours
-        else:
-            return 0.8  # High risk during night hours
+        return _HOUR_RISK[datetime.now().hour]
     
     def _calculate_user_risk(self, user_id: str) -> float:
         """
@@ -173,24 +296,17 @@ class RiskEngine:
         3. Verify current permissions
         4. Consider training and certifications
         """
-        # Placeholder: assume medium risk for unknown users
-        if "admin" in user_id.lower() or "ops" in user_id.lower():
-            return 0.2  # Low risk for ops users
-        elif "engineer" in user_id.lower():
-            return 0.4  # Medium risk for engineers
-        else:
-            return 0.7  # Higher risk for unknown users
+        # Placeholder: low risk for ops/admin users, medium for engineers,
+        # higher for unknown users
+        return min(
+            (_USER_TIER_RISK[role.lower()] for role in _USER_TIER_RE.findall(user_id)),
+            default=_UNKNOWN_USER_RISK
+        )
     
     def _score_to_risk_level(self, score: float) -> RiskLevel:
         """Convert numeric score to risk level"""
-        if score <= self.risk_thresholds[RiskLevel.LOW]:
-            return RiskLevel.LOW
-        elif score <= self.risk_thresholds[RiskLevel.MEDIUM]:
-            return RiskLevel.MEDIUM
-        elif score <= self.risk_thresholds[RiskLevel.HIGH]:
-            return RiskLevel.HIGH
-        else:
-            return RiskLevel.CRITICAL
+        # bisect_left keeps a score equal to a bound in the lower level
+        return self._threshold_levels[bisect_left(self._threshold_bounds, score)]
     
     def _requires_approval(self, risk_level: RiskLevel, environment: str, task_id: TaskId) -> bool:
         """
@@ -202,53 +318,19 @@ class RiskEngine:
         3. Evaluate delegation rules
         4. Check emergency procedures
         """
-        # Production always requires approval for medium+ risk
-        if environment == "prod" and risk_level in [RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL]:
-            return True
-        
-        # High and critical risk always require approval
-        if risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
-            return True
-        
-        # Specific task requirements
-        if task_id == TaskId.CANCEL_CASE and environment in ["staging", "prod"]:
-            return True
-        
-        return False
+        return _requires_approval_cached(risk_level, environment, task_id)
     
-    def _build_constraints(self, risk_level: RiskLevel, environment: str, task_id: TaskId) -> Dict[str, Any]:
+    def _build_constraints(self, risk_level: RiskLevel, environment: str, task_id: TaskId) -> Mapping[str, Any]:
         """
         Build operational constraints based on risk assessment
         
+        Returns a shared read-only mapping; copy it with dict() before
+        modifying or serializing.
+        
         TODO: Implement comprehensive constraint building:
         1. Set execution timeouts
         2. Define rollback requirements
         3. Specify monitoring needs
         4. Add notification requirements
         """
-        constraints = {
-            "api_only": True,  # Always use APIs, never direct DB access
-            "max_retries": 3,
-            "timeout_minutes": 30,
-            "rollback_required": risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL],
-            "monitoring_required": risk_level != RiskLevel.LOW,
-            "notification_required": risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]
-        }
-        
-        # Environment-specific constraints
-        if environment == "prod":
-            constraints.update({
-                "max_retries": 1,  # Be more careful in prod
-                "timeout_minutes": 15,  # Shorter timeout in prod
-                "backup_required": True,
-                "approval_timeout_hours": 24
-            })
-        
-        # Task-specific constraints
-        if task_id == TaskId.CANCEL_CASE:
-            constraints.update({
-                "confirmation_required": True,
-                "audit_trail_required": True
-            })
-        
-        return constraints
+        return _build_constraints_cached(risk_level, environment, task_id)
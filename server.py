@@ -3,36 +3,122 @@
 OpsGuide MVP Server
 Simple HTTP server demonstrating request parsing, validation, and pattern-based classification
 """
-import json
+import orjson
+import signal
+import socket
 import sys
 import os
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add modules to path
 sys.path.append(os.path.dirname(__file__))
 
-from models import OperationalRequest, TaskId
+from models import OperationalRequest, TaskId, utc_timestamp
 from parsingAndValidation import RequestParser, RequestValidator
 from requestClassification import PatternClassifier
 
 
+# Next-step guidance per classified task, shared by every response
+_NEXT_STEPS = {
+    TaskId.CANCEL_ORDER: {
+        "description": "Order cancellation request identified",
+        "runbook": "knowledge/runbooks/cancel-order-runbook.md",
+        "api_spec": "knowledge/api-specs/order-management-api.md",
+        "typical_steps": [
+            "Validate order exists and is cancellable",
+            "Check user permissions",
+            "Execute cancellation via API",
+            "Verify cancellation completed"
+        ]
+    },
+    TaskId.CANCEL_CASE: {
+        "description": "Case cancellation request identified",
+        "runbook": "knowledge/runbooks/cancel-case-runbook.md",
+        "api_spec": "knowledge/api-specs/order-management-api.md",
+        "typical_steps": [
+            "Validate case exists and is cancellable",
+            "Check user permissions",
+            "Execute cancellation via API",
+            "Verify cancellation completed"
+        ]
+    },
+    TaskId.CHANGE_ORDER_STATUS: {
+        "description": "Order status change request identified",
+        "runbook": "knowledge/runbooks/change-order-status-runbook.md",
+        "api_spec": "knowledge/api-specs/order-management-api.md",
+        "typical_steps": [
+            "Validate order exists",
+            "Check status transition is valid",
+            "Update order status via API",
+            "Verify status change completed"
+        ]
+    }
+}
+
+
+# GET / and /health bodies are serialized once; only the health
+# timestamp changes between requests
+_ROOT_INFO = {
+    "service": "OpsGuide MVP",
+    "version": "1.0.0",
+    "description": "Minimal operational request processing with pattern matching",
+    "endpoints": {
+        "POST /v1/request": "Submit operational request",
+        "GET /health": "Health check"
+    },
+    "supported_tasks": [
+        "CANCEL_ORDER: cancel order ORDER-123",
+        "CANCEL_CASE: cancel case CASE-123",
+        "CHANGE_ORDER_STATUS: change order status to completed"
+    ],
+    "architecture": [
+        "1. HTTP Parsing & Validation",
+        "2. Pattern-based Classification", 
+        "3. Entity Extraction",
+        "4. Structured Response"
+    ]
+}
+_ROOT_BODY = orjson.dumps(_ROOT_INFO, option=orjson.OPT_INDENT_2)
+
+_HEALTH_INFO = {
+    "status": "healthy",
+    "service": "opsguide-mvp",
+    "timestamp": "__TS__",
+    "version": "1.0.0",
+    "components": {
+        "parsing_validation": "active",
+        "pattern_classification": "active",
+        "entity_extraction": "active"
+    }
+}
+_HEALTH_TEMPLATE = orjson.dumps(_HEALTH_INFO, option=orjson.OPT_INDENT_2)
+
+
+def _health_body() -> bytes:
+    """Fill the current time into the serialized health response"""
+    return _HEALTH_TEMPLATE.replace(b"__TS__", utc_timestamp().encode())
+
+
 class OpsGuideMVPHandler(BaseHTTPRequestHandler):
     
-    def __init__(self, *args, **kwargs):
-        # Initialize components
-        self.parser = RequestParser()
-        self.validator = RequestValidator()
-        self.classifier = PatternClassifier()
-        super().__init__(*args, **kwargs)
+    # Components are built once at import and shared by every request;
+    # the handler itself is re-created for each connection
+    parser = RequestParser()
+    validator = RequestValidator()
+    classifier = PatternClassifier()
+    
+    # (method, path) -> handler method name
+    _ROUTES = {
+        ('POST', '/v1/request'): 'handle_operational_request',
+        ('GET', '/health'): 'handle_health_check',
+        ('GET', '/'): 'handle_root'
+    }
     
     def do_POST(self):
         """Handle POST requests"""
-        
-        if self.path == '/v1/request':
-            self.handle_operational_request()
-        else:
-            self.send_error_response(404, "Endpoint not found")
+        self._dispatch('POST')
     
     def do_OPTIONS(self):
         """Handle OPTIONS requests for CORS preflight"""
@@ -42,13 +128,15 @@ class OpsGuideMVPHandler(BaseHTTPRequestHandler):
     
     def do_GET(self):
         """Handle GET requests"""
-        
-        if self.path == '/health':
-            self.handle_health_check()
-        elif self.path == '/':
-            self.handle_root()
-        else:
+        self._dispatch('GET')
+    
+    def _dispatch(self, method: str):
+        """Route a request to its handler with one table lookup"""
+        handler_name = self._ROUTES.get((method, self.path))
+        if handler_name is None:
             self.send_error_response(404, "Endpoint not found")
+            return
+        getattr(self, handler_name)()
     
     def _set_cors_headers(self):
         """Set CORS headers"""
@@ -59,56 +147,27 @@ class OpsGuideMVPHandler(BaseHTTPRequestHandler):
     
     def handle_root(self):
         """Handle GET / - show API info"""
-        response_data = {
-            "service": "OpsGuide MVP",
-            "version": "1.0.0",
-            "description": "Minimal operational request processing with pattern matching",
-            "endpoints": {
-                "POST /v1/request": "Submit operational request",
-                "GET /health": "Health check"
-            },
-            "supported_tasks": [
-                "CANCEL_ORDER: cancel order ORDER-123",
-                "CANCEL_CASE: cancel case CASE-123",
-                "CHANGE_ORDER_STATUS: change order status to completed"
-            ],
-            "architecture": [
-                "1. HTTP Parsing & Validation",
-                "2. Pattern-based Classification", 
-                "3. Entity Extraction",
-                "4. Structured Response"
-            ]
-        }
-        self.send_json_response(200, response_data)
+        self.send_json_body(200, _ROOT_BODY)
     
     def handle_health_check(self):
         """Handle GET /health"""
-        response_data = {
-            "status": "healthy",
-            "service": "opsguide-mvp",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "version": "1.0.0",
-            "components": {
-                "parsing_validation": "active",
-                "pattern_classification": "active",
-                "entity_extraction": "active"
-            }
-        }
-        self.send_json_response(200, response_data)
+        self.send_json_body(200, _health_body())
     
     def handle_operational_request(self):
         """Handle POST /v1/request"""
         
         try:
-            # Step 1: Parse HTTP request
-            content_length = self.parser.extract_content_length(dict(self.headers))
-            body = self.rfile.read(content_length).decode('utf-8')
+            # Step 1: Parse HTTP request. Headers are copied once and the
+            # raw body bytes go straight to the JSON parser.
+            headers = dict(self.headers)
+            content_length = self.parser.extract_content_length(headers)
+            body = self.rfile.read(content_length)
             
-            parsed_data = self.parser.parse_http_request(dict(self.headers), body)
+            parsed_data = self.parser.parse_http_request(headers, body)
             
             # Step 2: Validate request
             valid, error_message = self.validator.validate_request(
-                dict(self.headers), 
+                headers, 
                 parsed_data['request_data']
             )
             
@@ -116,15 +175,17 @@ class OpsGuideMVPHandler(BaseHTTPRequestHandler):
                 self.send_error_response(400, error_message)
                 return
             
-            # Step 3: Create operational request object
+            # Step 3: Create operational request object. Inputs were
+            # validated above, so skip Pydantic re-validation.
             request_id = self.parser.generate_request_id()
             
-            operational_request = OperationalRequest(
+            operational_request = OperationalRequest.model_construct(
                 request_id=request_id,
                 user_id=parsed_data['user_id'],
                 query=parsed_data['query'],
                 context=parsed_data['context'],
-                environment=parsed_data['environment']
+                environment=parsed_data['environment'],
+                timestamp=datetime.utcnow()
             )
             
             # Step 4: Classify request using pattern matching
@@ -134,7 +195,7 @@ class OpsGuideMVPHandler(BaseHTTPRequestHandler):
             response_data = {
                 "request_id": request_id,
                 "status": "processed",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": operational_request.timestamp.isoformat() + "Z",
                 "input": {
                     "query": parsed_data['query'],
                     "environment": parsed_data['environment'],
@@ -156,70 +217,70 @@ class OpsGuideMVPHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self.send_error_response(500, f"Internal server error: {str(e)}")
     
-    def _get_next_steps(self, task_id: TaskId) -> dict:
+    def _get_next_steps(self, task_id: TaskId) -> Optional[dict]:
         """Get next steps based on classified task"""
-        if task_id == TaskId.CANCEL_ORDER:
-            return {
-                "description": "Order cancellation request identified",
-                "runbook": "knowledge/runbooks/cancel-order-runbook.md",
-                "api_spec": "knowledge/api-specs/order-management-api.md",
-                "typical_steps": [
-                    "Validate order exists and is cancellable",
-                    "Check user permissions",
-                    "Execute cancellation via API",
-                    "Verify cancellation completed"
-                ]
-            }
-        elif task_id == TaskId.CANCEL_CASE:
-            return {
-                "description": "Case cancellation request identified",
-                "runbook": "knowledge/runbooks/cancel-case-runbook.md",
-                "api_spec": "knowledge/api-specs/order-management-api.md",
-                "typical_steps": [
-                    "Validate case exists and is cancellable",
-                    "Check user permissions",
-                    "Execute cancellation via API",
-                    "Verify cancellation completed"
-                ]
-            }
-        elif task_id == TaskId.CHANGE_ORDER_STATUS:
-            return {
-                "description": "Order status change request identified",
-                "runbook": "knowledge/runbooks/change-order-status-runbook.md",
-                "api_spec": "knowledge/api-specs/order-management-api.md",
-                "typical_steps": [
-                    "Validate order exists",
-                    "Check status transition is valid",
-                    "Update order status via API",
-                    "Verify status change completed"
-                ]
-            }
-        return None
+        return _NEXT_STEPS.get(task_id)
     
     def send_json_response(self, status_code: int, data: dict):
         """Send JSON response with CORS headers"""
+        self.send_json_body(status_code, orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2))
+    
+    def send_json_body(self, status_code: int, body: bytes):
+        """Send an already serialized JSON body with CORS headers"""
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self._set_cors_headers()
         self.end_headers()
         
-        response_json = json.dumps(data, indent=2, default=str)
-        self.wfile.write(response_json.encode('utf-8'))
+        self.wfile.write(body)
     
     def send_error_response(self, status_code: int, message: str):
         """Send error response"""
         error_data = {
             "error": message,
             "status_code": status_code,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "timestamp": utc_timestamp()
         }
         self.send_json_response(status_code, error_data)
 
 
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    """
+    Thread-per-connection HTTP server whose port can be shared
+    
+    With SO_REUSEPORT several worker processes each bind their own socket
+    to the same port and the kernel spreads incoming connections across
+    them.
+    """
+    daemon_threads = True
+    
+    def server_bind(self):
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def worker_count() -> int:
+    """
+    Number of server processes from OPSGUIDE_WORKERS (default 1)
+    
+    More than one worker needs fork and SO_REUSEPORT (Linux, BSD, macOS);
+    elsewhere the server runs a single process.
+    """
+    try:
+        workers = max(1, int(os.environ.get("OPSGUIDE_WORKERS", "1")))
+    except ValueError:
+        workers = 1
+    if workers > 1 and not (hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")):
+        print("⚠️ Multiple workers need fork and SO_REUSEPORT, running a single process")
+        workers = 1
+    return workers
+
+
 def run_server(port=8093):
     """Run the HTTP server"""
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, OpsGuideMVPHandler)
+    workers = worker_count()
     
     print(f"🚀 OpsGuide MVP Server starting on port {port}")
     print(f"📍 Health check: http://localhost:{port}/health")
@@ -234,13 +295,38 @@ def run_server(port=8093):
     print("   • CANCEL_ORDER: 'cancel order ORDER-123'")
     print("   • CANCEL_CASE: 'cancel case CASE-123'")
     print("   • CHANGE_ORDER_STATUS: 'change order status to completed'")
-    print(f"\n🌐 Server ready at http://localhost:{port}")
+    print(f"\n🌐 Server ready at http://localhost:{port} ({workers} worker{'s' if workers > 1 else ''})")
+    
+    # Fork after the handler's components are built at import, so every
+    # worker shares them copy-on-write
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            children = []
+            break
+        children.append(pid)
+    if children:
+        # Take the workers down with the parent on SIGTERM (e.g. docker stop)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     
+    # Only share the port between our own workers; a single process keeps
+    # the usual "address in use" error if the port is already taken
+    server_class = ReusePortHTTPServer if workers > 1 else ThreadingHTTPServer
+    httpd = server_class(('', port), OpsGuideMVPHandler)
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
-        print("\n🛑 Server shutting down...")
+        if children or workers == 1:
+            print("\n🛑 Server shutting down...")
+    finally:
         httpd.server_close()
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
 
 
 if __name__ == '__main__':
@@ -2,199 +2,314 @@
 """
 OpsGuide Full AI Server
 Complete operational intelligence with knowledge retrieval, AI plan generation, and risk assessment
+
+ASGI app served by uvicorn; every request shares one event loop and one set
+of pipeline components:
+
+    uvicorn server_full:app --port 8094
+
+``python server_full.py`` starts the same app on port 8094.
 """
-import json
+import asyncio
+import orjson
 import sys
 import os
-import asyncio
-from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Add modules to path
 sys.path.append(os.path.dirname(__file__))
 
-from models import OperationalRequest, TaskId
+from models import OperationalRequest, TaskId, utc_timestamp
 from parsingAndValidation import RequestParser, RequestValidator
-from requestClassification import PatternClassifier
+from requestClassification import PatternClassifier, ClassificationBatcher
 from knowledgeRetrieval import VectorSearchEngine
 from planGeneration import PlanGenerator
-from riskAssessment import RiskEngine, PolicyValidator, ApprovalManager
+from riskAssessment import RiskEngine, PolicyValidator, ApprovalManager, ApprovalCapacityError, ApprovalStore
 
 
-class OpsGuideFullHandler(BaseHTTPRequestHandler):
-    
-    def __init__(self, *args, **kwargs):
-        # Initialize all components
-        self.parser = RequestParser()
-        self.validator = RequestValidator()
-        self.classifier = PatternClassifier()
-        self.knowledge_engine = VectorSearchEngine()
-        self.plan_generator = PlanGenerator()
-        self.risk_engine = RiskEngine()
-        self.policy_validator = PolicyValidator()
-        self.approval_manager = ApprovalManager()
-        super().__init__(*args, **kwargs)
+# Pipeline components, built once per process and shared by all requests
+parser = RequestParser()
+validator = RequestValidator()
+classifier = PatternClassifier()
+classification_batcher = ClassificationBatcher(classifier)
+knowledge_engine = VectorSearchEngine()
+plan_generator = PlanGenerator()
+risk_engine = RiskEngine()
+policy_validator = PolicyValidator()
+approval_manager = ApprovalManager()
+
+# Connection pool limits for the shared downstream HTTP client
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the keep-alive client shared by all OpenSearch and Bedrock calls
     
-    def do_POST(self):
-        """Handle POST requests"""
-        
-        if self.path == '/v1/request':
-            self.handle_full_operational_request()
-        elif self.path.startswith('/v1/approve/'):
-            self.handle_approval_decision()
-        else:
-            self.send_error_response(404, "Endpoint not found")
+    HTTP/2 is enabled when the h2 package is installed (httpx[http2]);
+    otherwise pooled HTTP/1.1 connections are still reused.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the downstream HTTP client, and the approval store if configured,
+    for the lifetime of the server
     
-    def do_GET(self):
-        """Handle GET requests"""
-        
-        if self.path == '/health':
-            self.handle_health_check()
-        elif self.path == '/':
-            self.handle_root()
-        elif self.path.startswith('/v1/status/'):
-            self.handle_status_check()
-        else:
-            self.send_error_response(404, "Endpoint not found")
+    Approvals are persisted only when APPROVAL_STORE_PATH names a SQLite
+    file; otherwise they live in memory.
+    """
+    store_path = os.environ.get("APPROVAL_STORE_PATH")
+    if store_path:
+        approval_manager.store = ApprovalStore(store_path)
+    app.state.http = create_http_client()
+    knowledge_engine.http_client = app.state.http
+    plan_generator.claude_client.http_client = app.state.http
+    classification_batcher.start()
+    try:
+        yield
+    finally:
+        await classification_batcher.stop()
+        knowledge_engine.http_client = None
+        plan_generator.claude_client.http_client = None
+        await app.state.http.aclose()
+        if approval_manager.store is not None:
+            # Flushes rows the writer has not written yet
+            approval_manager.store.close()
+            approval_manager.store = None
+
+
+app = FastAPI(title="OpsGuide Full AI System", version="2.0.0", lifespan=lifespan)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+
+
+def json_response(status_code: int, data: dict) -> Response:
+    """Build JSON response"""
+    return Response(
+        content=orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+async def _iter_json_sections(data: dict) -> AsyncIterator[bytes]:
+    """
+    Serialize a dict one top-level entry at a time
     
-    def handle_root(self):
-        """Handle GET / - show full API info"""
-        response_data = {
-            "service": "OpsGuide Full AI System",
-            "version": "2.0.0",
-            "description": "Complete operational intelligence with AI-powered plan generation",
-            "endpoints": {
-                "POST /v1/request": "Submit operational request for full AI processing",
-                "GET /v1/status/{request_id}": "Check request status and approval",
-                "POST /v1/approve/{request_id}": "Approve/reject operational request",
-                "GET /health": "Health check"
-            },
-            "capabilities": [
-                "🧠 Pattern-based Classification",
-                "🔍 Vector Knowledge Retrieval (RAG)",
-                "🤖 AI Plan Generation (Claude)",
-                "⚖️ Risk Assessment Engine",
-                "📋 Policy Validation",
-                "✅ Approval Workflows"
-            ],
-            "architecture": [
-                "1. HTTP Parsing & Validation",
-                "2. Pattern-based Classification", 
-                "3. Vector Knowledge Search (OpenSearch)",
-                "4. AI Plan Generation (Bedrock Claude)",
-                "5. Risk Assessment & Policy Validation",
-                "6. Approval Workflow Management"
-            ],
-            "supported_tasks": [
-                "CANCEL_CASE: 'cancel case CASE-123'",
-                "CHANGE_CASE_STATUS: 'change case status to completed'"
-            ]
-        }
-        self.send_json_response(200, response_data)
+    The concatenated chunks are byte-for-byte what orjson.dumps(data,
+    OPT_INDENT_2) produces: each value is indented one more level by
+    shifting its structural newlines (newlines inside strings are escaped).
+    """
+    if not data:
+        yield b"{}"
+        return
     
-    def handle_health_check(self):
-        """Handle GET /health"""
-        response_data = {
-            "status": "healthy",
-            "service": "opsguide-full-ai",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "version": "2.0.0",
-            "components": {
-                "parsing_validation": "active",
-                "pattern_classification": "active",
-                "knowledge_retrieval": "simulated",  # TODO: Connect to OpenSearch
-                "ai_plan_generation": "simulated",   # TODO: Connect to Bedrock
-                "risk_assessment": "active",
-                "policy_validation": "active",
-                "approval_management": "active"
-            }
-        }
-        self.send_json_response(200, response_data)
+    separator = b"{\n  "
+    for key, value in data.items():
+        encoded = orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2)
+        yield separator + orjson.dumps(key) + b": " + encoded.replace(b"\n", b"\n  ")
+        separator = b",\n  "
+    yield b"\n}"
+
+
+def json_stream_response(status_code: int, data: dict) -> StreamingResponse:
+    """Build JSON response sent in chunks, one per top-level section"""
+    return StreamingResponse(
+        _iter_json_sections(data),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+def error_response(status_code: int, message: str) -> Response:
+    """Build error response"""
+    error_data = {
+        "error": message,
+        "status_code": status_code,
+        "timestamp": utc_timestamp()
+    }
+    return json_response(status_code, error_data)
+
+
+# GET / and /health bodies are serialized once; only the health
+# timestamp changes between requests
+_ROOT_INFO = {
+    "service": "OpsGuide Full AI System",
+    "version": "2.0.0",
+    "description": "Complete operational intelligence with AI-powered plan generation",
+    "endpoints": {
+        "POST /v1/request": "Submit operational request for full AI processing",
+        "GET /v1/status/{request_id}": "Check request status and approval",
+        "POST /v1/approve/{request_id}": "Approve/reject operational request",
+        "GET /health": "Health check"
+    },
+    "capabilities": [
+        "🧠 Pattern-based Classification",
+        "🔍 Vector Knowledge Retrieval (RAG)",
+        "🤖 AI Plan Generation (Claude)",
+        "⚖️ Risk Assessment Engine",
+        "📋 Policy Validation",
+        "✅ Approval Workflows"
+    ],
+    "architecture": [
+        "1. HTTP Parsing & Validation",
+        "2. Pattern-based Classification", 
+        "3. Vector Knowledge Search (OpenSearch)",
+        "4. AI Plan Generation (Bedrock Claude)",
+        "5. Risk Assessment & Policy Validation",
+        "6. Approval Workflow Management"
+    ],
+    "supported_tasks": [
+        "CANCEL_CASE: 'cancel case CASE-123'",
+        "CHANGE_CASE_STATUS: 'change case status to completed'"
+    ]
+}
+_ROOT_BODY = orjson.dumps(_ROOT_INFO, option=orjson.OPT_INDENT_2)
+
+_HEALTH_INFO = {
+    "status": "healthy",
+    "service": "opsguide-full-ai",
+    "timestamp": "__TS__",
+    "version": "2.0.0",
+    "components": {
+        "parsing_validation": "active",
+        "pattern_classification": "active",
+        "knowledge_retrieval": "simulated",  # TODO: Connect to OpenSearch
+        "ai_plan_generation": "simulated",   # TODO: Connect to Bedrock
+        "risk_assessment": "active",
+        "policy_validation": "active",
+        "approval_management": "active"
+    }
+}
+_HEALTH_TEMPLATE = orjson.dumps(_HEALTH_INFO, option=orjson.OPT_INDENT_2)
+
+
+def _health_body() -> bytes:
+    """Fill the current time into the serialized health response"""
+    return _HEALTH_TEMPLATE.replace(b"__TS__", utc_timestamp().encode())
+
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    """Report unknown routes and methods in the usual error format"""
+    if exc.status_code in (404, 405):
+        return error_response(404, "Endpoint not found")
+    return error_response(exc.status_code, str(exc.detail))
+
+
+@app.get("/")
+async def handle_root() -> Response:
+    """Handle GET / - show full API info"""
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+@app.get("/health")
+async def handle_health_check() -> Response:
+    """Handle GET /health"""
+    return Response(content=_health_body(), media_type="application/json")
+
+
+@app.post("/v1/request")
+async def handle_full_operational_request(request: Request) -> Response:
+    """Handle POST /v1/request with complete AI pipeline"""
     
-    def handle_full_operational_request(self):
-        """Handle POST /v1/request with complete AI pipeline"""
+    try:
+        # Step 1: Parse HTTP request (headers are matched case-insensitively)
+        headers = request.headers
+        body = await request.body()
         
-        try:
-            # Step 1: Parse HTTP request
-            content_length = self.parser.extract_content_length(dict(self.headers))
-            body = self.rfile.read(content_length).decode('utf-8')
-            
-            parsed_data = self.parser.parse_http_request(dict(self.headers), body)
-            
-            # Step 2: Validate request
-            valid, error_message = self.validator.validate_request(
-                dict(self.headers), 
-                parsed_data['request_data']
-            )
-            
-            if not valid:
-                self.send_error_response(400, error_message)
-                return
-            
-            # Step 3: Create operational request object
-            request_id = self.parser.generate_request_id()
-            
-            operational_request = OperationalRequest(
-                request_id=request_id,
-                user_id=parsed_data['user_id'],
-                query=parsed_data['query'],
-                context=parsed_data['context'],
-                environment=parsed_data['environment']
-            )
-            
-            # Process the full AI pipeline asynchronously
-            result = asyncio.run(self._process_full_pipeline(operational_request))
-            
-            self.send_json_response(result["status_code"], result["data"])
-            
-        except Exception as e:
-            self.send_error_response(500, f"Internal server error: {str(e)}")
+        parsed_data = parser.parse_http_request(headers, body)
+        
+        # Step 2: Validate request
+        valid, error_message = validator.validate_request(
+            headers, 
+            parsed_data['request_data']
+        )
+        
+        if not valid:
+            return error_response(400, error_message)
+        
+        # Step 3: Create operational request object. Inputs were
+        # validated above, so skip Pydantic re-validation.
+        request_id = parser.generate_request_id()
+        
+        operational_request = OperationalRequest.model_construct(
+            request_id=request_id,
+            user_id=parsed_data['user_id'],
+            query=parsed_data['query'],
+            context=parsed_data['context'],
+            environment=parsed_data['environment']
+        )
+        
+        # Process the full AI pipeline on the shared event loop
+        result = await _process_full_pipeline(operational_request)
+        
+        # Pipeline responses carry the whole plan, so start sending them
+        # before every section is serialized
+        return json_stream_response(result["status_code"], result["data"])
+        
+    except Exception as e:
+        return error_response(500, f"Internal server error: {str(e)}")
+
+
+async def _process_full_pipeline(request: OperationalRequest) -> dict:
+    """Process request through complete AI pipeline"""
     
-    async def _process_full_pipeline(self, request: OperationalRequest) -> dict:
-        """Process request through complete AI pipeline"""
+    try:
+        # Step 1: Classify request using pattern matching, batched with
+        # other requests arriving at the same time
+        classification = await classification_batcher.classify(request)
         
-        try:
-            # Step 1: Classify request using pattern matching
-            classification = self.classifier.classify(request)
-            
-            if not classification.task_id:
-                return {
-                    "status_code": 400,
-                    "data": {
-                        "error": "Could not identify operational task",
-                        "classification": {
-                            "confidence": classification.confidence,
-                            "extracted_entities": classification.extracted_entities
-                        }
+        if not classification.task_id:
+            return {
+                "status_code": 400,
+                "data": {
+                    "error": "Could not identify operational task",
+                    "classification": {
+                        "confidence": classification.confidence,
+                        "extracted_entities": classification.extracted_entities
                     }
                 }
-            
-            # Step 2: Retrieve relevant knowledge using vector search
-            knowledge_results = await self.knowledge_engine.search_knowledge(
-                query=request.query,
-                classification=classification
-            )
-            
-            # Step 3: Generate operational plan using AI
-            operational_plan = await self.plan_generator.generate_operational_plan(
-                request=request,
-                classification=classification,
-                knowledge_results=knowledge_results
-            )
-            
-            # Step 4: Assess risk
-            risk_assessment = self.risk_engine.assess_risk(
-                request=request,
-                classification=classification,
-                plan_data=operational_plan.__dict__
-            )
-            
-            # Step 5: Validate against policies
-            policy_validation = self.policy_validator.validate_request(
-                request=request,
-                classification=classification,
-                risk_assessment=risk_assessment
-            )
+            }
+        
+        # Steps 2 and 3 overlap: policy checks need only the request and
+        # classification, so they run on a worker thread while knowledge
+        # is retrieved
+        knowledge_task = asyncio.create_task(knowledge_engine.search_knowledge(
+            query=request.query,
+            classification=classification
+        ))
+        policy_task = asyncio.create_task(asyncio.to_thread(
+            policy_validator.validate_request,
+            request,
+            classification
+        ))
+        
+        try:
+            # Step 2: Validate against policies, failing fast before plan generation
+            policy_validation = await policy_task
             
             if not policy_validation.allowed:
                 return {
@@ -212,162 +327,199 @@ class OpsGuideFullHandler(BaseHTTPRequestHandler):
                     }
                 }
             
-            # Step 6: Check if approval is needed
-            approval_request = None
-            if risk_assessment.requires_approval:
-                approval_request = self.approval_manager.create_approval_request(
+            # Step 3: Retrieve relevant knowledge using vector search
+            knowledge_results = await knowledge_task
+        finally:
+            # Every early exit (policy denial or a policy check that raised)
+            # stops retrieval; a finished task's exception is marked as
+            # retrieved so it is not reported as never retrieved
+            if not knowledge_task.done():
+                knowledge_task.cancel()
+            elif not knowledge_task.cancelled():
+                knowledge_task.exception()
+        
+        # Step 4: Generate operational plan using AI
+        operational_plan = await plan_generator.generate_operational_plan(
+            request=request,
+            classification=classification,
+            knowledge_results=knowledge_results
+        )
+        
+        # Step 5: Assess risk off the event loop
+        risk_assessment = await asyncio.to_thread(
+            risk_engine.assess_risk,
+            request=request,
+            classification=classification,
+            plan=operational_plan
+        )
+        
+        # Step 6: Check if approval is needed
+        approval_request = None
+        if risk_assessment.requires_approval:
+            try:
+                approval_request = approval_manager.create_approval_request(
                     request_id=request.request_id,
                     operation_summary=operational_plan.summary,
-                    risk_level=risk_assessment.risk_level.value,
+                    risk_level=risk_assessment.risk_level.name,
                     requester=request.user_id,
                     environment=request.environment
                 )
-            
-            # Step 7: Build comprehensive response
-            response_data = {
-                "request_id": request.request_id,
-                "status": "awaiting_approval" if approval_request else "ready_for_execution",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "input": {
-                    "query": request.query,
-                    "environment": request.environment,
-                    "user_id": request.user_id
-                },
-                "classification": {
-                    "use_case": classification.use_case.value,
-                    "task_id": classification.task_id.value,
-                    "confidence": classification.confidence,
-                    "service": classification.service,
-                    "environment": classification.environment,
-                    "extracted_entities": classification.extracted_entities
-                },
-                "knowledge_retrieval": {
-                    "sources_found": len(knowledge_results),
-                    "sources": [
-                        {
-                            "uri": result.source_uri,
-                            "relevance_score": result.score,
-                            "metadata": result.metadata
-                        } for result in knowledge_results
-                    ]
-                },
-                "operational_plan": {
-                    "summary": operational_plan.summary,
-                    "risk_level": operational_plan.risk_level,
-                    "estimated_duration": operational_plan.estimated_duration,
-                    "requires_approval": operational_plan.requires_approval,
-                    "pre_checks": operational_plan.pre_checks,
-                    "procedure": operational_plan.procedure,
-                    "post_checks": operational_plan.post_checks,
-                    "rollback": operational_plan.rollback,
-                    "citations": operational_plan.citations
-                },
-                "risk_assessment": {
-                    "risk_level": risk_assessment.risk_level.value,
-                    "overall_score": risk_assessment.score,
-                    "requires_approval": risk_assessment.requires_approval,
-                    "factors": [
-                        {
-                            "name": factor.name,
-                            "score": factor.score,
-                            "weight": factor.weight,
-                            "description": factor.description
-                        } for factor in risk_assessment.factors
-                    ],
-                    "constraints": risk_assessment.constraints
-                },
-                "policy_validation": {
-                    "allowed": policy_validation.allowed,
-                    "violations": [
-                        {
-                            "policy": v.policy_name,
-                            "type": v.violation_type,
-                            "description": v.description,
-                            "severity": v.severity
-                        } for v in policy_validation.violations
-                    ],
-                    "warnings": policy_validation.warnings
-                },
-                "approval": {
-                    "required": approval_request is not None,
-                    "request_id": approval_request.request_id if approval_request else None,
-                    "status": approval_request.status.value if approval_request else None,
-                    "expires_at": approval_request.expires_at.isoformat() + "Z" if approval_request else None,
-                    "approvers": approval_request.approvers if approval_request else []
-                } if approval_request else {"required": False}
-            }
-            
-            return {
-                "status_code": 202,  # Accepted for processing
-                "data": response_data
-            }
-            
-        except Exception as e:
-            return {
-                "status_code": 500,
-                "data": {"error": f"Pipeline processing failed: {str(e)}"}
-            }
-    
-    def handle_status_check(self):
-        """Handle GET /v1/status/{request_id}"""
-        path_parts = self.path.split('/')
-        if len(path_parts) < 4:
-            self.send_error_response(400, "Invalid status request")
-            return
-        
-        request_id = path_parts[3]
-        approval_request = self.approval_manager.check_approval_status(request_id)
-        
-        if not approval_request:
-            self.send_error_response(404, "Request not found")
-            return
+            except ApprovalCapacityError:
+                return {
+                    "status_code": 503,
+                    "data": {
+                        "error": "Approval queue is full; retry once pending approvals are decided or expire"
+                    }
+                }
         
+        # Step 7: Build comprehensive response
         response_data = {
-            "request_id": request_id,
-            "status": approval_request.status.value,
-            "created_at": approval_request.created_at.isoformat() + "Z",
-            "expires_at": approval_request.expires_at.isoformat() + "Z",
-            "operation_summary": approval_request.operation_summary,
-            "risk_level": approval_request.risk_level,
-            "requester": approval_request.requester,
-            "approvers": approval_request.approvers,
-            "approved_by": approval_request.approved_by,
-            "approved_at": approval_request.approved_at.isoformat() + "Z" if approval_request.approved_at else None,
-            "rejection_reason": approval_request.rejection_reason
+            "request_id": request.request_id,
+            "status": "awaiting_approval" if approval_request else "ready_for_execution",
+            "timestamp": utc_timestamp(),
+            "input": {
+                "query": request.query,
+                "environment": request.environment,
+                "user_id": request.user_id
+            },
+            "classification": {
+                "use_case": classification.use_case.value,
+                "task_id": classification.task_id.value,
+                "confidence": classification.confidence,
+                "service": classification.service,
+                "environment": classification.environment,
+                "extracted_entities": classification.extracted_entities
+            },
+            "knowledge_retrieval": {
+                "sources_found": len(knowledge_results),
+                "sources": [
+                    {
+                        "uri": result.source_uri,
+                        "relevance_score": result.score,
+                        "metadata": result.metadata
+                    } for result in knowledge_results
+                ]
+            },
+            "operational_plan": {
+                "summary": operational_plan.summary,
+                "risk_level": operational_plan.risk_level,
+                "estimated_duration": operational_plan.estimated_duration,
+                "requires_approval": operational_plan.requires_approval,
+                "pre_checks": operational_plan.pre_checks,
+                "procedure": operational_plan.procedure,
+                "post_checks": operational_plan.post_checks,
+                "rollback": operational_plan.rollback,
+                "citations": operational_plan.citations
+            },
+            "risk_assessment": {
+                "risk_level": risk_assessment.risk_level.name,
+                "overall_score": risk_assessment.score,
+                "requires_approval": risk_assessment.requires_approval,
+                "factors": [
+                    {
+                        "name": factor.name,
+                        "score": factor.score,
+                        "weight": factor.weight,
+                        "description": factor.description
+                    } for factor in risk_assessment.factors
+                ],
+                "constraints": dict(risk_assessment.constraints)
+            },
+            "policy_validation": {
+                "allowed": policy_validation.allowed,
+                "violations": [
+                    {
+                        "policy": v.policy_name,
+                        "type": v.violation_type,
+                        "description": v.description,
+                        "severity": v.severity
+                    } for v in policy_validation.violations
+                ],
+                "warnings": policy_validation.warnings
+            },
+            "approval": {
+                "required": approval_request is not None,
+                "request_id": approval_request.request_id if approval_request else None,
+                "status": approval_request.status.name if approval_request else None,
+                "expires_at": approval_request.expires_at.isoformat() + "Z" if approval_request else None,
+                "approvers": sorted(approval_request.approvers) if approval_request else []
+            } if approval_request else {"required": False}
         }
         
-        self.send_json_response(200, response_data)
+        return {
+            "status_code": 202,  # Accepted for processing
+            "data": response_data
+        }
+        
+    except Exception as e:
+        return {
+            "status_code": 500,
+            "data": {"error": f"Pipeline processing failed: {str(e)}"}
+        }
+
+
+@app.get("/v1/status/{request_id}")
+async def handle_status_check(request_id: str) -> Response:
+    """Handle GET /v1/status/{request_id}"""
+    approval_request = approval_manager.check_approval_status(request_id)
     
-    def handle_approval_decision(self):
-        """Handle POST /v1/approve/{request_id}"""
-        # TODO: Implement approval decision handling
-        self.send_error_response(501, "Approval decisions not yet implemented")
+    if not approval_request:
+        return error_response(404, "Request not found")
     
-    def send_json_response(self, status_code: int, data: dict):
-        """Send JSON response"""
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        
-        response_json = json.dumps(data, indent=2, default=str)
-        self.wfile.write(response_json.encode('utf-8'))
+    # Polls between state changes reuse the last serialized response
+    body = approval_manager.get_status_body(approval_request)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
     
-    def send_error_response(self, status_code: int, message: str):
-        """Send error response"""
-        error_data = {
-            "error": message,
-            "status_code": status_code,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
-        self.send_json_response(status_code, error_data)
+    response_data = {
+        "request_id": request_id,
+        "status": approval_request.status.name,
+        "created_at": approval_request.created_at.isoformat() + "Z",
+        "expires_at": approval_request.expires_at.isoformat() + "Z",
+        "operation_summary": approval_request.operation_summary,
+        "risk_level": approval_request.risk_level,
+        "requester": approval_request.requester,
+        "approvers": sorted(approval_request.approvers),
+        "approved_by": approval_request.approved_by,
+        "approved_at": approval_request.approved_at.isoformat() + "Z" if approval_request.approved_at else None,
+        "rejection_reason": approval_request.rejection_reason
+    }
+    
+    body = orjson.dumps(response_data, default=str, option=orjson.OPT_INDENT_2)
+    approval_manager.cache_status_body(approval_request, body)
+    return Response(content=body, media_type="application/json")
 
 
-def run_full_server(port=8094):
-    """Run the full AI HTTP server"""
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, OpsGuideFullHandler)
+@app.post("/v1/approve/{request_id}")
+async def handle_approval_decision(request_id: str) -> Response:
+    """Handle POST /v1/approve/{request_id}"""
+    # TODO: Implement approval decision handling
+    return error_response(501, "Approval decisions not yet implemented")
+
+
+def select_event_loop() -> str:
+    """
+    Pick the uvicorn event loop from OPSGUIDE_EVENT_LOOP
     
+    "auto" (the default) uses uvloop when it is installed and the stdlib
+    selector loop otherwise; "uvloop" and "asyncio" force one or the other.
+    uvloop is not available on Windows, where "auto" always falls back.
+    """
+    requested = os.environ.get("OPSGUIDE_EVENT_LOOP", "auto")
+    if requested == "asyncio":
+        return "asyncio"
+    
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        if requested == "uvloop":
+            print("⚠️ uvloop is not installed, falling back to the asyncio event loop")
+        return "asyncio"
+    return "uvloop"
+
+
+def run_full_server(port=8094):
+    """Run the full AI server"""
     print(f"🚀 OpsGuide Full AI Server starting on port {port}")
     print(f"📍 Health check: http://localhost:{port}/health")
     print(f"📍 API info: http://localhost:{port}/")
@@ -385,13 +537,12 @@ def run_full_server(port=8094):
     print("   • ⚖️ Risk Assessment Engine")
     print("   • 📋 Policy Validation")
     print("   • ✅ Approval Workflows")
-    print(f"\n🌐 Full AI Server ready at http://localhost:{port}")
     
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\n🛑 Server shutting down...")
-        httpd.server_close()
+    loop = select_event_loop()
+    print(f"\n🌐 Full AI Server ready at http://localhost:{port} ({loop} event loop)")
+    
+    uvicorn.run(app, host="0.0.0.0", port=port, loop=loop)
+    print("\n🛑 Server shutting down...")
 
 
 if __name__ == '__main__':
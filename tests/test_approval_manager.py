@@ -0,0 +1,71 @@
+"""
+Tests for ApprovalManager capacity handling
+"""
+import pytest
+
+from riskAssessment.approval_manager import ApprovalCapacityError, ApprovalManager, ApprovalStatus
+from riskAssessment.approval_store import ApprovalStore
+
+
+class NullNotifier:
+    """Notifier that drops every event"""
+
+    def send(self, kind, payload):
+        pass
+
+
+def _create(manager, request_id):
+    return manager.create_approval_request(
+        request_id=request_id,
+        operation_summary="Cancel case CASE-1",
+        risk_level="MEDIUM",
+        requester="engineer@example.com",
+        environment="staging"
+    )
+
+
+def test_without_store_pending_requests_are_never_evicted():
+    manager = ApprovalManager(notifier=NullNotifier(), capacity=2)
+    _create(manager, "r1")
+    _create(manager, "r2")
+
+    with pytest.raises(ApprovalCapacityError):
+        _create(manager, "r3")
+
+    assert manager.check_approval_status("r1").status is ApprovalStatus.PENDING
+    assert manager.approve_request("r1", "ops_lead")
+    assert len(manager.get_pending_approvals("ops_lead")) == 1
+
+
+def test_capacity_warning_names_the_store_setting_once(capsys):
+    manager = ApprovalManager(notifier=NullNotifier(), capacity=1)
+    _create(manager, "r1")
+    for request_id in ("r2", "r3"):
+        with pytest.raises(ApprovalCapacityError):
+            _create(manager, request_id)
+
+    assert capsys.readouterr().out.count("APPROVAL_STORE_PATH") == 1
+
+
+def test_without_store_decided_requests_free_capacity():
+    manager = ApprovalManager(notifier=NullNotifier(), capacity=2)
+    _create(manager, "r1")
+    _create(manager, "r2")
+    manager.reject_request("r1", "ops_lead", "not needed")
+
+    assert _create(manager, "r3") is not None
+    assert manager.check_approval_status("r1").status is ApprovalStatus.REJECTED
+
+
+def test_with_store_evicted_requests_are_reloaded(tmp_path):
+    store = ApprovalStore(str(tmp_path / "approvals.sqlite"))
+    try:
+        manager = ApprovalManager(store=store, notifier=NullNotifier(), capacity=2)
+        for request_id in ("r1", "r2", "r3"):
+            _create(manager, request_id)
+
+        assert "r1" not in manager.approval_requests
+        assert manager.approve_request("r1", "ops_lead")
+        assert manager.check_approval_status("r1").status is ApprovalStatus.APPROVED
+    finally:
+        store.close()
@@ -0,0 +1,36 @@
+"""
+Tests for ApprovalStore write-behind persistence
+"""
+from riskAssessment.approval_store import ApprovalStore
+
+
+def test_close_flushes_queued_rows(tmp_path):
+    path = str(tmp_path / "approvals.sqlite")
+    # A long interval keeps the writer from flushing on its own
+    store = ApprovalStore(path, flush_interval=60.0)
+    for i in range(100):
+        store.put(f"r{i}", f"row-{i}".encode())
+    store.close()
+
+    reopened = ApprovalStore(path)
+    try:
+        assert all(reopened.get(f"r{i}") == f"row-{i}".encode() for i in range(100))
+    finally:
+        reopened.close()
+
+
+def test_queued_rows_are_readable_before_flush(tmp_path):
+    store = ApprovalStore(str(tmp_path / "approvals.sqlite"), flush_interval=60.0)
+    try:
+        store.put("r1", b"first")
+        store.put("r1", b"second")
+        assert store.get("r1") == b"second"
+        assert store.get("missing") is None
+    finally:
+        store.close()
+
+
+def test_close_is_idempotent(tmp_path):
+    store = ApprovalStore(str(tmp_path / "approvals.sqlite"))
+    store.close()
+    store.close()
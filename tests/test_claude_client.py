@@ -0,0 +1,61 @@
+"""
+Tests for the NDJSON/SSE event splitter used by ClaudeClient
+"""
+import asyncio
+
+from planGeneration.claude_client import _iter_json_objects
+
+
+def _collect(chunks):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        return [obj async for obj in _iter_json_objects(stream())]
+
+    return asyncio.run(run())
+
+
+def test_several_events_in_one_read():
+    chunks = [b'{"type": "a"}\n{"type": "b"}\n{"type": "c"}\n']
+
+    assert _collect(chunks) == [{"type": "a"}, {"type": "b"}, {"type": "c"}]
+
+
+def test_event_split_across_reads():
+    chunks = [b'{"type": "content_block_del', b'ta", "delta": {"te', b'xt": "hi"}}\n{"ty', b'pe": "stop"}\n']
+
+    assert _collect(chunks) == [
+        {"type": "content_block_delta", "delta": {"text": "hi"}},
+        {"type": "stop"},
+    ]
+
+
+def test_utf8_character_split_across_reads():
+    line = '{"text": "café — 🚨"}\n'.encode("utf-8")
+    for split in range(1, len(line)):
+        assert _collect([line[:split], line[split:]]) == [{"text": "café — 🚨"}], split
+
+
+def test_sse_prefixes_and_non_data_lines():
+    chunks = [
+        b'event: content_block_delta\r\n',
+        b'data: {"type": "delta", "text": "a"}\r\n\r\n',
+        b': keep-alive\n',
+        b'data:{"type": "stop"}\n\n',
+    ]
+
+    assert _collect(chunks) == [{"type": "delta", "text": "a"}, {"type": "stop"}]
+
+
+def test_blank_and_malformed_lines_are_skipped():
+    chunks = [b'\n\n{"type": "a"}\n{"type": \n', b'not json\n[1, 2]\n{"type": "b"}\n']
+
+    assert _collect(chunks) == [{"type": "a"}, [1, 2], {"type": "b"}]
+
+
+def test_unterminated_tail_is_parsed_at_end():
+    assert _collect([b'{"type": "a"}\n{"type": ', b'"b"}']) == [{"type": "a"}, {"type": "b"}]
+    assert _collect([b'{"type": "a"}\n{"type": ']) == [{"type": "a"}]
+    assert _collect([]) == []
@@ -0,0 +1,103 @@
+"""
+Tests for the two-tier embedding cache and its use by VectorSearchEngine
+"""
+import asyncio
+
+from knowledgeRetrieval.embedding_cache import CachedEmbeddingsClient
+from knowledgeRetrieval.embeddings_client import EmbeddingsClient
+from knowledgeRetrieval.vector_search import VectorSearchEngine
+from models import ClassificationResult, TaskId, UseCase
+
+
+class CountingEmbeddingsClient(EmbeddingsClient):
+    """Mock-embedding client that records every text it embeds"""
+
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+
+    async def get_embedding(self, text):
+        self.texts.append(text)
+        return await super().get_embedding(text)
+
+
+def _classification():
+    return ClassificationResult.model_construct(
+        use_case=UseCase.OPERATIONAL_ASK,
+        task_id=TaskId.CANCEL_CASE,
+        confidence=0.9,
+        extracted_entities={},
+        environment="dev",
+        service="Case"
+    )
+
+
+def test_no_sqlite_file_without_cache_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("EMBEDDING_CACHE_PATH", raising=False)
+
+    client = CachedEmbeddingsClient(CountingEmbeddingsClient())
+    asyncio.run(client.get_embedding("restart the api"))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_path_from_environment_persists_vectors(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "embeddings.sqlite"
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(path))
+
+    first = CachedEmbeddingsClient(CountingEmbeddingsClient())
+    embedding = asyncio.run(first.get_embedding("restart the api"))
+    assert path.exists()
+
+    inner = CountingEmbeddingsClient()
+    second = CachedEmbeddingsClient(inner)
+    assert asyncio.run(second.get_embedding("restart the api")) == embedding
+    assert inner.texts == []
+
+
+def test_batch_sends_only_misses_once():
+    inner = CountingEmbeddingsClient()
+    client = CachedEmbeddingsClient(inner, cache_path="")
+
+    asyncio.run(client.get_embedding("a"))
+    asyncio.run(client.get_embeddings_batch(["a", "b", "b", "c"]))
+
+    assert sorted(inner.texts) == ["a", "b", "c"]
+    assert client.get_cache_stats()["hits"] == 2
+
+
+def test_search_engine_caches_query_embeddings(monkeypatch):
+    monkeypatch.delenv("EMBEDDING_CACHE_PATH", raising=False)
+    engine = VectorSearchEngine()
+    assert isinstance(engine.embeddings_client, CachedEmbeddingsClient)
+
+    inner = CountingEmbeddingsClient()
+    engine.embeddings_client = CachedEmbeddingsClient(inner)
+    for _ in range(3):
+        asyncio.run(engine.search_knowledge("cancel case 123", _classification()))
+
+    assert inner.texts == ["cancel case 123"]
+
+
+def test_mutating_a_returned_embedding_does_not_change_the_cache(tmp_path):
+    client = CachedEmbeddingsClient(CountingEmbeddingsClient(), cache_path=str(tmp_path / "embeddings.sqlite"))
+
+    first = asyncio.run(client.get_embedding("restart the api"))
+    expected = list(first)
+    first[:] = [0.0] * len(first)
+
+    second = asyncio.run(client.get_embedding("restart the api"))
+    assert second == expected
+    second[0] = 42.0
+
+    batch = asyncio.run(client.get_embeddings_batch(["restart the api", "b", "b"]))
+    assert batch[0] == expected
+    assert batch[1] is not batch[2]
+    batch[1][0] = 42.0
+    assert batch[2][0] != 42.0
+
+    reopened = CachedEmbeddingsClient(CountingEmbeddingsClient(), cache_path=str(tmp_path / "embeddings.sqlite"))
+    warm = asyncio.run(reopened.get_embedding("restart the api"))
+    warm[0] = 42.0
+    assert asyncio.run(reopened.get_embedding("restart the api"))[0] != 42.0
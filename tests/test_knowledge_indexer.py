@@ -0,0 +1,53 @@
+"""
+Tests for header-tree chunking of the shipped knowledge files
+"""
+import glob
+import os
+
+import pytest
+
+from knowledgeRetrieval.knowledge_indexer import CHUNK_MIN_WORDS, KnowledgeIndexer
+
+
+KNOWLEDGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "knowledge")
+
+
+def _chunks(relative_path):
+    return KnowledgeIndexer(KNOWLEDGE_DIR)._process_file(os.path.join(KNOWLEDGE_DIR, relative_path))
+
+
+def test_runbook_preamble_survives():
+    chunks = _chunks(os.path.join("runbooks", "cancel-case-runbook.md"))
+
+    first = chunks[0].content
+    assert "**Task ID**: CANCEL_CASE" in first
+    assert "**Service**: Case Management" in first
+    assert all(chunk.metadata["task_id"] == "CANCEL_CASE" for chunk in chunks)
+
+
+def test_short_section_intro_is_folded_into_its_first_subsection():
+    chunks = _chunks(os.path.join("api-specs", "order-management-api.md"))
+
+    intro = [chunk for chunk in chunks if "## Order Status Operations" in chunk.content]
+    assert len(intro) == 1
+    assert "### GET /orders/{order_id}/status" in intro[0].content
+
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(KNOWLEDGE_DIR, "*", "*.md"))))
+def test_no_text_is_dropped(path):
+    chunks = KnowledgeIndexer(KNOWLEDGE_DIR)._process_file(path)
+    indexed = "\n".join(chunk.content for chunk in chunks)
+
+    with open(path, encoding="utf-8") as f:
+        missing = [line for line in f.read().splitlines() if line.strip() and line.strip() not in indexed]
+    assert missing == []
+
+
+def test_short_chunk_without_following_subtree_is_kept():
+    indexer = KnowledgeIndexer(KNOWLEDGE_DIR)
+    long_text = " ".join(["word"] * CHUNK_MIN_WORDS)
+    content = f"# Doc\n\n## A\n\n{long_text}\n\n### A1\n\nshort tail\n\n## B\n\n{long_text}\n"
+
+    texts = [text for _, text in indexer._split_by_headers(content)]
+
+    assert any("short tail" in text for text in texts)
@@ -0,0 +1,45 @@
+"""
+Tests for PatternClassifier result caching
+"""
+from models import OperationalRequest, TaskId
+from requestClassification import PatternClassifier
+
+
+def _request(query="cancel case CASE-2024-001", environment="prod"):
+    return OperationalRequest.model_construct(
+        request_id="r1",
+        user_id="engineer@example.com",
+        query=query,
+        context={},
+        environment=environment
+    )
+
+
+def test_cached_results_are_not_shared_between_callers():
+    classifier = PatternClassifier()
+    first = classifier.classify(_request())
+    first.task_id = None
+    first.extracted_entities["case_id"] = "TAMPERED"
+
+    second = classifier.classify(_request())
+
+    assert second.task_id == TaskId.CANCEL_CASE
+    assert second.extracted_entities["case_id"] == "CASE-2024-001"
+
+
+def test_classify_many_returns_independent_copies():
+    classifier = PatternClassifier()
+    first, second = classifier.classify_many([_request(), _request()])
+    first.extracted_entities["case_id"] = "TAMPERED"
+
+    assert first is not second
+    assert second.extracted_entities["case_id"] == "CASE-2024-001"
+    assert classifier.classify(_request()).extracted_entities["case_id"] == "CASE-2024-001"
+
+
+def test_copies_match_uncached_classification():
+    classifier = PatternClassifier()
+    for query in ("cancel case CASE-2024-001", "change order ORD-123 status to shipped", "hello"):
+        cached = classifier.classify(_request(query))
+        fresh = classifier._classify_query(query, "prod")
+        assert cached.model_dump() == fresh.model_dump()
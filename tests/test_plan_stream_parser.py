@@ -0,0 +1,141 @@
+"""
+Tests for PlanStreamParser incremental decoding
+"""
+import json
+
+import pytest
+
+from planGeneration.plan_stream_parser import PlanStreamParser
+
+
+PLAN = {
+    "summary": "Cancel case CASE-123 — notify the café team 🚨",
+    "risk_level": "MEDIUM",
+    "estimated_duration": 15,
+    "pre_checks": ["Verify case exists", "Check ówner"],
+    "procedure": [{"step": 1, "action": "POST /cases/CASE-123/cancel", "body": {"reason": "dup"}}],
+    "requires_approval": True,
+    "rollback": None,
+}
+PLAN_BYTES = json.dumps(PLAN, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _parse(chunks):
+    seen = []
+    parser = PlanStreamParser(on_field=lambda key, value: seen.append((key, value)))
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser, seen
+
+
+def test_single_chunk():
+    parser, seen = _parse([PLAN_BYTES])
+
+    assert parser.complete
+    assert parser.close() == PLAN
+    assert seen == list(PLAN.items())
+
+
+def test_every_split_point_including_mid_utf8():
+    # Covers splits inside multi-byte characters, keys, numbers and literals
+    for split in range(1, len(PLAN_BYTES)):
+        parser, seen = _parse([PLAN_BYTES[:split], PLAN_BYTES[split:]])
+        assert parser.close() == PLAN, split
+        assert seen == list(PLAN.items()), split
+
+
+def test_byte_at_a_time():
+    parser, seen = _parse(PLAN_BYTES[i:i + 1] for i in range(len(PLAN_BYTES)))
+
+    assert parser.close() == PLAN
+    assert seen == list(PLAN.items())
+
+
+def test_fields_are_reported_before_the_stream_ends():
+    cut = PLAN_BYTES.index(b'"estimated_duration"')
+    parser, seen = _parse([PLAN_BYTES[:cut]])
+
+    assert not parser.complete
+    assert seen == [("summary", PLAN["summary"]), ("risk_level", "MEDIUM")]
+
+
+def test_number_is_not_accepted_until_terminated():
+    parser, seen = _parse([b'{"estimated_duration": 15'])
+    assert seen == []
+
+    parser.feed(b'0}')
+    assert parser.close() == {"estimated_duration": 150}
+
+
+def test_empty_object_and_trailing_input():
+    parser, _ = _parse([b' {} trailing'])
+
+    assert parser.close() == {}
+
+
+@pytest.mark.parametrize("chunk", [
+    b'[1, 2]',
+    b'{"summary" "x"}',
+    b'{"summary": "x" "risk_level": "LOW"}',
+    b'{summary: "x"}',
+    b'{"summary": tru}',
+    b'{"summary": 1x5,',
+    b'{"summary": @}',
+    b'{"procedure": [1,, 2]}',
+    b'{"procedure": [1, 2}',
+])
+def test_structural_errors_raise_immediately(chunk):
+    with pytest.raises(ValueError):
+        PlanStreamParser().feed(chunk)
+
+
+@pytest.mark.parametrize("chunk", [
+    b'{"summary": "x", "risk_level": "LOW"',
+    b'{"summary": "unterminated',
+    b'{"estimated_duration": 15',
+    b'{"summary": "caf\xc3',
+])
+def test_incomplete_or_malformed_stream_fails_on_close(chunk):
+    parser = PlanStreamParser()
+    parser.feed(chunk)
+
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_malformed_value_mid_stream_fails_before_the_stream_ends():
+    seen = []
+    parser = PlanStreamParser(on_field=lambda key, value: seen.append((key, value)))
+    parser.feed(b'{"summary": "Cancel case", "risk_level": nul')
+    parser.feed(b'l, "estimated_duration": tru')
+
+    with pytest.raises(ValueError):
+        parser.feed(b'e5, "procedure": []')
+    assert seen == [("summary", "Cancel case"), ("risk_level", None)]
+
+
+class CountingDecoder:
+    """Wraps JSONDecoder.raw_decode and records the length of every input"""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self.inputs = []
+
+    def raw_decode(self, text, idx=0):
+        self.inputs.append(len(text) - idx)
+        return self._decoder.raw_decode(text, idx)
+
+
+def test_large_field_is_decoded_once():
+    steps = [{"step": i, "action": f"POST /cases/{i}/cancel", "note": 'quote \" {brace} [x]'} for i in range(5000)]
+    data = json.dumps({"summary": "s", "procedure": steps, "risk_level": "LOW"}).encode()
+    parser = PlanStreamParser()
+    parser._decoder = CountingDecoder()
+
+    for start in range(0, len(data), 64):
+        parser.feed(data[start:start + 64])
+
+    assert parser.close()["procedure"] == steps
+    # One decode per key and per value, each over that token only
+    assert len(parser._decoder.inputs) == 6
+    assert sum(parser._decoder.inputs) < len(data)
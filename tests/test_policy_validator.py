@@ -0,0 +1,74 @@
+"""
+Tests for PolicyValidator request validation
+"""
+from datetime import datetime
+
+from models import ClassificationResult, OperationalRequest, TaskId, UseCase
+from riskAssessment import PolicyValidator
+from riskAssessment import policy_validator
+
+
+def _request(user_id="engineer@example.com", environment="prod", context=None):
+    return OperationalRequest.model_construct(
+        request_id="r1",
+        user_id=user_id,
+        query="cancel case CASE-1",
+        context=context or {},
+        environment=environment
+    )
+
+
+def _classification(environment="prod"):
+    return ClassificationResult.model_construct(
+        use_case=UseCase.OPERATIONAL_ASK,
+        task_id=TaskId.CANCEL_CASE,
+        confidence=0.9,
+        extracted_entities={},
+        environment=environment,
+        service="Case"
+    )
+
+
+def test_missing_production_access_is_an_error_violation():
+    result = PolicyValidator().validate_request(_request(user_id="bob"), _classification())
+
+    assert not result.allowed
+    assert [(v.policy_name, v.severity) for v in result.violations] == [("production_access", "ERROR")]
+
+
+def test_production_access_granted_by_role():
+    result = PolicyValidator().validate_request(_request(user_id="ops-alice"), _classification())
+
+    assert all(v.policy_name != "production_access" for v in result.violations)
+
+
+class FakeDatetime(datetime):
+    """datetime whose now() is set by the test"""
+    current = datetime(2024, 1, 3, 12, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def test_time_warnings_follow_the_clock_despite_cache(monkeypatch):
+    monkeypatch.setattr(policy_validator, "datetime", FakeDatetime)
+    validator = PolicyValidator()
+    request = _request(user_id="ops-alice")
+
+    # Wednesday noon, then 20:00 the same day, then Saturday noon
+    FakeDatetime.current = datetime(2024, 1, 3, 12, 0)
+    assert validator.validate_request(request, _classification()).warnings == ()
+
+    FakeDatetime.current = datetime(2024, 1, 3, 12, 59)
+    assert validator.validate_request(request, _classification()).warnings == ()
+
+    FakeDatetime.current = datetime(2024, 1, 3, 20, 0)
+    assert validator.validate_request(request, _classification()).warnings == (
+        "Production operation requested outside business hours",
+    )
+
+    FakeDatetime.current = datetime(2024, 1, 6, 12, 0)
+    assert validator.validate_request(request, _classification()).warnings == (
+        "Operation requested during weekend",
+    )
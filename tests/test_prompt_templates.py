@@ -0,0 +1,118 @@
+"""
+Tests for compiled prompt templates against str.format
+"""
+import pytest
+
+from models import ClassificationResult, OperationalRequest, TaskId, UseCase
+from planGeneration.prompt_templates import PromptTemplateManager, _CompiledTemplate
+
+
+# Values with braces, quotes, backslashes and newlines must pass through as-is
+FIELDS = {
+    "user_id": "engineer@example.com",
+    "query": 'cancel case {CASE-1} "now" \\ \'\'\' f"{x}"',
+    "task_id": "CANCEL_CASE",
+    "environment": "prod",
+    "service": "Case",
+    "case_id": "CASE-1",
+    "target_status": "N/A",
+    "context": "line one\nline {two}\n}}{{",
+    "api_only": True,
+    "approval_required": False,
+    "max_risk_level": "MEDIUM",
+    "rollback_window": 24,
+}
+
+CONSTRAINTS = {"api_only": False, "approval_required": True, "max_risk_level": "LOW", "rollback_window_hours": 6}
+
+
+def _all_templates():
+    manager = PromptTemplateManager()
+    return [*manager.templates.values(), manager._get_generic_template()]
+
+
+def _request():
+    return OperationalRequest.model_construct(
+        request_id="r1",
+        user_id=FIELDS["user_id"],
+        query=FIELDS["query"],
+        context={},
+        environment="prod"
+    )
+
+
+def _classification(task_id):
+    return ClassificationResult.model_construct(
+        use_case=UseCase.OPERATIONAL_ASK,
+        task_id=task_id,
+        confidence=0.9,
+        extracted_entities={"case_id": "CASE-1", "target_status": "CLOSED"},
+        environment="prod",
+        service="Case"
+    )
+
+
+@pytest.mark.parametrize("template", _all_templates())
+def test_every_template_renders_like_format(template):
+    assert _CompiledTemplate(template).render(**FIELDS) == template.format(**FIELDS)
+
+
+@pytest.mark.parametrize("template", _all_templates())
+def test_partial_renders_like_format(template):
+    fixed = {key: FIELDS[key] for key in ("api_only", "approval_required", "max_risk_level", "rollback_window", "query")}
+    rest = {key: value for key, value in FIELDS.items() if key not in fixed}
+
+    partial = _CompiledTemplate(template).partial(**fixed)
+
+    assert partial.render(**rest) == template.format(**FIELDS)
+    assert not set(fixed) & set(partial.fields)
+
+
+@pytest.mark.parametrize("template", [
+    "{a!r:>30} {b:.2f} {{literal}} {a} {c!s:*^9}",
+    "{a!a}-{b:08.3f}-{c:>6}",
+    "no fields {{at all}}",
+])
+def test_conversions_and_specs_render_like_format(template):
+    values = {"a": "héllo {x}", "b": 3.14159, "c": "mid"}
+    compiled = _CompiledTemplate(template)
+
+    assert compiled.render(**values) == template.format(**values)
+    assert compiled.partial(a=values["a"]).render(b=values["b"], c=values["c"]) == template.format(**values)
+    assert compiled.partial(**values).render() == template.format(**values)
+
+
+@pytest.mark.parametrize("template", ["{0}", "{}", "{a.b}", "{a[0]}", "{class}", "{a:{b}}"])
+def test_unsupported_fields_are_rejected(template):
+    with pytest.raises(ValueError):
+        _CompiledTemplate(template)
+
+
+@pytest.mark.parametrize("task_id", [TaskId.CANCEL_CASE, TaskId.CHANGE_CASE_STATUS, TaskId.RECONCILE_CASE_DATA, None])
+def test_specialize_matches_unspecialized_prompt(task_id):
+    manager = PromptTemplateManager()
+    specialized = manager.specialize(CONSTRAINTS)
+    classification = _classification(task_id)
+
+    expected = manager.build_prompt(_request(), classification, FIELDS["context"], CONSTRAINTS)
+
+    assert specialized.build_prompt(_request(), classification, FIELDS["context"], CONSTRAINTS) == expected
+
+
+@pytest.mark.parametrize("constraints", [{}, {**CONSTRAINTS, "max_risk_level": "HIGH"}, {**CONSTRAINTS, "approval_required": False}])
+def test_specialize_rejects_different_constraints(constraints):
+    specialized = PromptTemplateManager().specialize(CONSTRAINTS)
+
+    with pytest.raises(ValueError):
+        specialized.build_prompt(_request(), _classification(TaskId.CANCEL_CASE), FIELDS["context"], constraints)
+
+
+def test_specialize_leaves_original_manager_unchanged():
+    manager = PromptTemplateManager()
+    manager.specialize(CONSTRAINTS)
+    classification = _classification(TaskId.CANCEL_CASE)
+
+    prompt = manager.build_prompt(_request(), classification, FIELDS["context"], {})
+
+    assert "- API-only operations: True" in prompt
+    assert "- Rollback window: 24 hours" in prompt
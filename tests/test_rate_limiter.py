@@ -0,0 +1,184 @@
+"""
+Tests for the Bedrock token bucket, throttling backoff and the embeddings retry loop
+"""
+import asyncio
+import io
+
+import orjson
+import pytest
+
+from knowledgeRetrieval.embeddings_client import EMBEDDING_MAX_RETRIES, EmbeddingsClient
+from knowledgeRetrieval.rate_limiter import MAX_BACKOFF_SECONDS, TokenBucket, backoff_delay, is_validation_error
+
+
+class FakeClock:
+    """Monotonic clock that only advances when the bucket sleeps"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ThrottlingError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("ThrottlingException")
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        self.response = {
+            "Error": {"Code": "ThrottlingException"},
+            "ResponseMetadata": {"HTTPStatusCode": 429, "HTTPHeaders": headers},
+        }
+
+
+class ValidationError(Exception):
+    def __init__(self):
+        super().__init__("ValidationException")
+        self.response = {
+            "Error": {"Code": "ValidationException"},
+            "ResponseMetadata": {"HTTPStatusCode": 400, "HTTPHeaders": {}},
+        }
+
+
+class FakeBedrockClient:
+    """
+    invoke_model stub that throttles the first ``throttles`` calls and, like
+    Titan v1, rejects list input
+    """
+
+    def __init__(self, throttles: int = 0):
+        self.throttles = throttles
+        self.calls = 0
+        self.batch_calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.throttles:
+            raise ThrottlingError(retry_after=0)
+        body = orjson.loads(kwargs["body"])
+        if isinstance(body["inputText"], list):
+            self.batch_calls += 1
+            raise ValidationError()
+        return {"body": io.BytesIO(orjson.dumps({"embedding": [float(len(body["inputText"]))]}))}
+
+
+def _bucket(rpm: int, tpm: int):
+    clock = FakeClock()
+    return TokenBucket(rpm, tpm, clock=clock, sleep=clock.sleep), clock
+
+
+def test_acquire_within_quota_does_not_sleep():
+    bucket, clock = _bucket(rpm=60, tpm=6000)
+
+    async def run():
+        for _ in range(60):
+            await bucket.acquire(100)
+
+    asyncio.run(run())
+    assert clock.sleeps == []
+
+
+def test_acquire_waits_for_request_refill():
+    # 60 rpm refills one request per second
+    bucket, clock = _bucket(rpm=60, tpm=1_000_000)
+
+    async def run():
+        for _ in range(61):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    assert clock.now == 1.0
+
+
+def test_acquire_waits_for_token_refill():
+    # 600 tpm refills 10 tokens per second
+    bucket, clock = _bucket(rpm=1000, tpm=600)
+
+    async def run():
+        await bucket.acquire(600)
+        await bucket.acquire(50)
+
+    asyncio.run(run())
+    assert clock.now == 5.0
+
+
+def test_acquire_caps_oversized_requests_at_quota():
+    bucket, clock = _bucket(rpm=1000, tpm=600)
+    asyncio.run(bucket.acquire(10_000))
+    assert clock.sleeps == []
+
+
+def test_backoff_honors_retry_after():
+    assert backoff_delay(ThrottlingError(retry_after=3), attempt=0, rand=lambda: 0.0) == 3.0
+    assert backoff_delay(ThrottlingError(retry_after=600), attempt=0) == MAX_BACKOFF_SECONDS
+
+
+def test_backoff_uses_capped_full_jitter():
+    error = ThrottlingError()
+    assert backoff_delay(error, attempt=3, rand=lambda: 0.5) == 4.0
+    assert backoff_delay(error, attempt=3, rand=lambda: 0.0) == 0.0
+    assert backoff_delay(error, attempt=10, rand=lambda: 0.999) == MAX_BACKOFF_SECONDS
+
+
+def test_throttled_embedding_is_retried():
+    bedrock = FakeBedrockClient(throttles=2)
+    bucket, _ = _bucket(rpm=60, tpm=6000)
+    client = EmbeddingsClient(rate_limiter=bucket, bedrock_client=bedrock)
+
+    assert asyncio.run(client.get_embedding("abcd")) == [4.0]
+    assert bedrock.calls == 3
+
+
+def test_throttling_past_max_retries_raises():
+    bedrock = FakeBedrockClient(throttles=EMBEDDING_MAX_RETRIES + 1)
+    bucket, _ = _bucket(rpm=60, tpm=6000)
+    client = EmbeddingsClient(rate_limiter=bucket, bedrock_client=bedrock)
+
+    with pytest.raises(ThrottlingError):
+        asyncio.run(client.get_embedding("abcd"))
+    assert bedrock.calls == EMBEDDING_MAX_RETRIES + 1
+
+
+def test_rejected_batch_falls_back_to_single_requests():
+    bedrock = FakeBedrockClient()
+    bucket, _ = _bucket(rpm=60, tpm=6000)
+    client = EmbeddingsClient(rate_limiter=bucket, bedrock_client=bedrock)
+
+    assert asyncio.run(client.get_embeddings_batch(["a", "bb", "ccc"])) == [[1.0], [2.0], [3.0]]
+
+
+def test_batching_is_not_retried_after_the_model_rejects_it():
+    bedrock = FakeBedrockClient()
+    bucket, _ = _bucket(rpm=60, tpm=6000)
+    client = EmbeddingsClient(batch_size=2, rate_limiter=bucket, bedrock_client=bedrock)
+
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+    assert asyncio.run(client.get_embeddings_batch(texts)) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert asyncio.run(client.get_embeddings_batch(texts)) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+
+    assert bedrock.batch_calls == 1
+    assert bedrock.calls == 1 + 2 * len(texts)
+
+
+def test_other_batch_errors_propagate():
+    class BrokenBedrockClient:
+        def invoke_model(self, **kwargs):
+            raise RuntimeError("connection reset")
+
+    bucket, _ = _bucket(rpm=60, tpm=6000)
+    client = EmbeddingsClient(rate_limiter=bucket, bedrock_client=BrokenBedrockClient())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(client.get_embeddings_batch(["a"]))
+    assert client._batch_supported
+
+
+def test_validation_error_detection():
+    assert is_validation_error(ValidationError())
+    assert not is_validation_error(ThrottlingError())
+    assert not is_validation_error(ValueError("ValidationException"))
@@ -0,0 +1,47 @@
+"""
+Tests for SemanticCache key bookkeeping
+"""
+import numpy as np
+
+from knowledgeRetrieval.semantic_cache import SemanticCache
+
+
+def _embedding(seed):
+    return np.random.default_rng(seed).standard_normal(64).tolist()
+
+
+def test_key_codes_are_bounded_by_capacity():
+    cache = SemanticCache(capacity=4)
+    for i in range(100):
+        cache.insert(_embedding(i), ("prod", f"service-{i}", "CANCEL_CASE", 5), [i])
+
+    assert len(cache) == 4
+    assert len(cache._key_codes) == 4
+    assert cache.lookup(_embedding(99), ("prod", "service-99", "CANCEL_CASE", 5)) == [99]
+    assert cache.lookup(_embedding(0), ("prod", "service-0", "CANCEL_CASE", 5)) is None
+
+
+def test_key_shared_by_several_rows_survives_partial_eviction():
+    cache = SemanticCache(capacity=3)
+    shared = ("prod", "Case", "CANCEL_CASE", 5)
+    cache.insert(_embedding(1), shared, ["a"])
+    cache.insert(_embedding(2), shared, ["b"])
+    cache.insert(_embedding(3), ("dev", "Case", "CANCEL_CASE", 5), ["c"])
+
+    # Evicts the least recently used row, the first one under the shared key
+    cache.insert(_embedding(4), ("staging", "Case", "CANCEL_CASE", 5), ["d"])
+
+    assert cache.lookup(_embedding(1), shared) is None
+    assert cache.lookup(_embedding(2), shared) == ["b"]
+    assert set(cache._key_codes) == {shared, ("dev", "Case", "CANCEL_CASE", 5), ("staging", "Case", "CANCEL_CASE", 5)}
+
+
+def test_reinserting_an_evicted_key_gets_a_fresh_code():
+    cache = SemanticCache(capacity=1)
+    cache.insert(_embedding(1), "a", ["a1"])
+    cache.insert(_embedding(2), "b", ["b1"])
+    cache.insert(_embedding(3), "a", ["a2"])
+
+    assert cache.lookup(_embedding(3), "a") == ["a2"]
+    assert cache.lookup(_embedding(3), "b") is None
+    assert list(cache._key_codes) == ["a"]
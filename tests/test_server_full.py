@@ -0,0 +1,171 @@
+"""
+Tests for the full server's lifespan and streamed JSON responses
+"""
+import asyncio
+import time
+from datetime import datetime
+
+import orjson
+from fastapi.testclient import TestClient
+
+import server_full
+from models import OperationalRequest
+from riskAssessment import ApprovalManager
+
+
+async def _run_lifespan():
+    async with server_full.lifespan(server_full.app):
+        store = server_full.approval_manager.store
+        if store is not None:
+            store.put("r1", b"row")
+        return store
+
+
+def test_approvals_stay_in_memory_without_store_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("APPROVAL_STORE_PATH", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    assert asyncio.run(_run_lifespan()) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_store_is_opened_and_flushed_when_configured(monkeypatch, tmp_path):
+    path = tmp_path / "approvals.sqlite"
+    monkeypatch.setenv("APPROVAL_STORE_PATH", str(path))
+
+    store = asyncio.run(_run_lifespan())
+
+    assert store is not None
+    assert server_full.approval_manager.store is None
+    reopened = server_full.ApprovalStore(str(path))
+    try:
+        assert reopened.get("r1") == b"row"
+    finally:
+        reopened.close()
+
+
+async def _join_sections(data):
+    return b"".join([chunk async for chunk in server_full._iter_json_sections(data)])
+
+
+def test_sections_match_orjson_for_edge_values():
+    payload = {
+        "empty_dict": {},
+        "empty_list": [],
+        "text": "line one\nline two",
+        "nested": {"steps": ["a", {"b": [1, 2.5, None]}], "flag": True},
+        "when": datetime(2024, 1, 3, 12, 0),
+    }
+    for data in ({}, {"only": 1}, payload):
+        expected = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+        assert asyncio.run(_join_sections(data)) == expected
+
+
+class NullNotifier:
+    """Notifier that drops every event"""
+
+    def send(self, kind, payload):
+        pass
+
+
+HEADERS = {
+    "Authorization": "Bearer token",
+    "X-User-ID": "engineer@example.com",
+    "Content-Type": "application/json",
+}
+
+
+def test_full_approval_queue_returns_503(monkeypatch):
+    monkeypatch.delenv("APPROVAL_STORE_PATH", raising=False)
+    monkeypatch.setattr(server_full, "approval_manager", ApprovalManager(notifier=NullNotifier(), capacity=0))
+    body = orjson.dumps({"query": "cancel case CASE-123", "environment": "prod"})
+
+    with TestClient(server_full.app) as client:
+        response = client.post("/v1/request", content=body, headers=HEADERS)
+
+    assert response.status_code == 503
+    assert response.json() == {"error": "Approval queue is full; retry once pending approvals are decided or expire"}
+
+
+def test_streamed_202_body_matches_orjson(monkeypatch):
+    monkeypatch.delenv("APPROVAL_STORE_PATH", raising=False)
+    results = []
+    process = server_full._process_full_pipeline
+
+    async def recording_pipeline(request):
+        result = await process(request)
+        results.append(result)
+        return result
+
+    monkeypatch.setattr(server_full, "_process_full_pipeline", recording_pipeline)
+    body = orjson.dumps({"query": "cancel case CASE-123", "environment": "prod"})
+
+    with TestClient(server_full.app) as client:
+        response = client.post("/v1/request", content=body, headers=HEADERS)
+
+    assert response.status_code == 202
+    payload = results[0]["data"]
+    assert response.content == orjson.dumps(payload, option=orjson.OPT_INDENT_2, default=str)
+
+
+def _pipeline_request():
+    return OperationalRequest.model_construct(
+        request_id="r1",
+        user_id="engineer@example.com",
+        query="cancel case CASE-123",
+        context={},
+        environment="staging"
+    )
+
+
+async def _run_pipeline(search_tasks):
+    """Run one request; report which retrieval tasks were cancelled by then"""
+    async with server_full.lifespan(server_full.app):
+        result = await server_full._process_full_pipeline(_pipeline_request())
+        # Let a requested cancellation reach the retrieval task; checked
+        # here because asyncio.run cancels any leftover task on exit
+        await asyncio.sleep(0)
+        return result, [task.cancelled() for task in search_tasks]
+
+
+def test_retrieval_is_cancelled_when_policy_check_raises(monkeypatch):
+    monkeypatch.delenv("APPROVAL_STORE_PATH", raising=False)
+    search_tasks = []
+
+    async def slow_search(**kwargs):
+        search_tasks.append(asyncio.current_task())
+        await asyncio.sleep(10)
+
+    def broken_policy(*args):
+        raise RuntimeError("policy backend down")
+
+    monkeypatch.setattr(server_full.knowledge_engine, "search_knowledge", slow_search)
+    monkeypatch.setattr(server_full.policy_validator, "validate_request", broken_policy)
+
+    result, cancelled = asyncio.run(_run_pipeline(search_tasks))
+
+    assert result["status_code"] == 500
+    assert cancelled == [True]
+
+
+def test_failed_retrieval_is_not_reported_unretrieved(monkeypatch):
+    monkeypatch.delenv("APPROVAL_STORE_PATH", raising=False)
+    search_tasks = []
+
+    async def failing_search(**kwargs):
+        search_tasks.append(asyncio.current_task())
+        raise RuntimeError("opensearch down")
+
+    def slow_broken_policy(*args):
+        time.sleep(0.05)
+        raise RuntimeError("policy backend down")
+
+    monkeypatch.setattr(server_full.knowledge_engine, "search_knowledge", failing_search)
+    monkeypatch.setattr(server_full.policy_validator, "validate_request", slow_broken_policy)
+
+    result, _ = asyncio.run(_run_pipeline(search_tasks))
+
+    assert result["status_code"] == 500
+    # asyncio logs "Task exception was never retrieved" for tasks still
+    # flagged here when they are garbage collected
+    assert not search_tasks[0]._log_traceback
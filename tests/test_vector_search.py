@@ -0,0 +1,87 @@
+"""
+Tests for the semantic cache in front of VectorSearchEngine._search_index
+"""
+import asyncio
+
+from models import ClassificationResult, TaskId, UseCase
+from knowledgeRetrieval.vector_search import (
+    SEMANTIC_CACHE_MIN_COST_SECONDS,
+    VectorSearchEngine,
+    VectorSearchResult,
+)
+
+
+def _classification(environment="prod", service="Case", task_id=TaskId.CANCEL_CASE):
+    return ClassificationResult.model_construct(
+        use_case=UseCase.OPERATIONAL_ASK,
+        task_id=task_id,
+        confidence=0.9,
+        extracted_entities={},
+        environment=environment,
+        service=service
+    )
+
+
+class SlowSearchEngine(VectorSearchEngine):
+    """Engine whose index search is slow enough to be cached"""
+
+    def __init__(self):
+        super().__init__()
+        self.searches = []
+
+    async def _search_index(self, query_embedding, classification, top_k):
+        self.searches.append((classification.environment, classification.service, top_k))
+        await asyncio.sleep(SEMANTIC_CACHE_MIN_COST_SECONDS * 2)
+        return [VectorSearchResult(
+            content=f"{classification.environment}/{classification.service}",
+            metadata={},
+            score=1.0,
+            source_uri="knowledge/test.md"
+        )]
+
+
+def _search(engine, classification, top_k=5, query="cancel case CASE-123"):
+    return asyncio.run(engine.search_knowledge(query, classification, top_k))
+
+
+def test_repeated_search_hits_cache():
+    engine = SlowSearchEngine()
+    first = _search(engine, _classification())
+    second = _search(engine, _classification())
+
+    assert len(engine.searches) == 1
+    assert [r.content for r in second] == [r.content for r in first]
+
+
+def test_environment_is_part_of_cache_key():
+    engine = SlowSearchEngine()
+    _search(engine, _classification(environment="staging"))
+    results = _search(engine, _classification(environment="prod"))
+
+    assert len(engine.searches) == 2
+    assert results[0].content == "prod/Case"
+
+
+def test_service_is_part_of_cache_key():
+    engine = SlowSearchEngine()
+    _search(engine, _classification(service="Order"))
+    results = _search(engine, _classification(service="Case"))
+
+    assert len(engine.searches) == 2
+    assert results[0].content == "prod/Case"
+
+
+def test_task_and_top_k_are_part_of_cache_key():
+    engine = SlowSearchEngine()
+    _search(engine, _classification())
+    _search(engine, _classification(task_id=TaskId.CHANGE_CASE_STATUS))
+    _search(engine, _classification(), top_k=3)
+
+    assert len(engine.searches) == 3
+
+
+def test_fast_search_is_not_cached():
+    engine = VectorSearchEngine()
+    _search(engine, _classification())
+
+    assert len(engine.semantic_cache) == 0